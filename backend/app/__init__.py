@@ -1,7 +1,9 @@
 from flask import Flask, jsonify
-from .extensions import db, jwt, migrate
+from .extensions import db, jwt, migrate, cache, pubsub, storage, search
+from .cli import register_commands
+from .middleware.query_metrics import register_query_metrics
 from .config import development
-from .api.v1 import auth, users, campuses, posts, comments, likes, media, groups, events, notifications
+from .api.v1 import auth, users, campuses, posts, comments, likes, media, groups, events, notifications, chat, search as search_api, follows
 
 def create_app(config_class=development.Config):
     app = Flask(__name__)
@@ -11,6 +13,10 @@ def create_app(config_class=development.Config):
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    pubsub.init_app(app)
+    storage.init_app(app)
+    search.init_app(app)
 
     # Register blueprints 
     app.register_blueprint(auth.auth_bp, url_prefix='/api/v1/auth')
@@ -23,6 +29,15 @@ def create_app(config_class=development.Config):
     app.register_blueprint(groups.groups_bp, url_prefix='/api/v1/groups')
     app.register_blueprint(events.events_bp, url_prefix='/api/v1/events')
     app.register_blueprint(notifications.notifications_bp, url_prefix='/api/v1/notifications')
+    app.register_blueprint(chat.chat_bp, url_prefix='/api/v1/chat')
+    app.register_blueprint(search_api.search_bp, url_prefix='/api/v1/search')
+    app.register_blueprint(follows.follows_bp, url_prefix='/api/v1/follows')
+
+    # Register custom CLI commands (e.g. `flask index-advisor`)
+    register_commands(app)
+
+    # Per-request query counts and DB time (headers in dev, logs in prod)
+    register_query_metrics(app)
 
     # Adding a simple root route
     @app.route('/')
@@ -16,6 +16,8 @@ from .chat import chat_bp
 from .events import events_bp
 from .notifications import notifications_bp
 from .admin import admin_bp
+from .search import search_bp
+from .follows import follows_bp
 
 # Register all blueprints to v1
 blueprints = [
@@ -31,6 +33,8 @@ blueprints = [
     events_bp,
     notifications_bp,
     admin_bp,
+    search_bp,
+    follows_bp,
 ]
 
 for bp in blueprints:
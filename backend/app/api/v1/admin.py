@@ -1,8 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.user_service import get_user_by_id, get_all_users, delete_user
-from app.services.post_service import get_all_posts, delete_post
-from app.extensions import db
+from app.services.post_service import get_all_posts, post_service
 from app.models.user import User
 from app.models.post import Post
 
@@ -56,10 +55,10 @@ def remove_user(user_id):
 def list_posts():
     posts = get_all_posts()
     post_data = [{
-        "id": p.id,
-        "content": p.content,
-        "author_id": p.user_id,
-        "timestamp": p.created_at.isoformat()
+        "id": p["id"],
+        "content": p["content"],
+        "author_id": p["user_id"],
+        "timestamp": p["created_at"]
     } for p in posts]
     return jsonify(post_data), 200
 
@@ -72,8 +71,7 @@ def remove_post(post_id):
     if not post:
         return jsonify({"message": "Post not found"}), 404
 
-    db.session.delete(post)
-    db.session.commit()
+    post_service._remove_post(post)
     return jsonify({"message": f"Post {post_id} deleted."}), 200
 
 
@@ -1,5 +1,9 @@
-from flask import Blueprint, request, jsonify
+import json
+import time
+
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.extensions import db, pubsub
 from app.services.chat_service import ChatService
 from app.services.user_service import get_user_by_id
 
@@ -12,7 +16,7 @@ chat_service = ChatService()
 @chat_bp.route("/send", methods=["POST"])
 @jwt_required()
 def send_chat_message():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     data = request.get_json()
 
     recipient_id = data.get("recipient_id")
@@ -20,6 +24,10 @@ def send_chat_message():
 
     if not recipient_id or not message_text:
         return jsonify({"error": "recipient_id and message are required"}), 400
+    try:
+        recipient_id = int(recipient_id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "recipient_id must be an integer"}), 400
 
     if user_id == recipient_id:
         return jsonify({"error": "You cannot message yourself"}), 400
@@ -40,7 +48,22 @@ def send_chat_message():
 @chat_bp.route("/conversation/<int:recipient_id>", methods=["GET"])
 @jwt_required()
 def get_conversation(recipient_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
+
+    # Keyset pagination through history: ?cursor= (empty for the latest page) and ?limit=
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        limit = request.args.get("limit", 50, type=int)
+        try:
+            result = chat_service.get_conversation(user1_id=user_id, user2_id=recipient_id,
+                                                   limit=limit, cursor=cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "messages": result["items"],
+            "pagination": result["pagination"]
+        }), 200
+
     messages = chat_service.get_conversation(user1_id=user_id, user2_id=recipient_id)
 
     return jsonify([
@@ -55,12 +78,101 @@ def get_conversation(recipient_id):
         for m in messages
     ]), 200
 
-# Get recent conversations (last messages from each chat) - implement as needed
+# Real-time message stream (Server-Sent Events). Each event id is the message
+# id, so a reconnecting client sends Last-Event-ID and receives what it missed
+# (up to CHAT_STREAM_MAX_REPLAY messages, then a "truncated" event).
+# Streams hold a worker for their lifetime: run under gevent/eventlet workers.
+@chat_bp.route("/stream", methods=["GET"])
+@jwt_required()
+def stream_messages():
+    user_id = int(get_jwt_identity())
+    heartbeat = current_app.config.get("CHAT_STREAM_HEARTBEAT_SECONDS", 15)
+    max_seconds = current_app.config.get("CHAT_STREAM_MAX_SECONDS", 300)
+    last_event_id = request.headers.get("Last-Event-ID", request.args.get("last_event_id"))
+
+    # Subscribe before replaying so nothing sent in between is lost
+    subscription = pubsub.subscribe(chat_service.user_channel(user_id))
+    missed, truncated = [], False
+    if last_event_id and last_event_id.isdigit():
+        missed, truncated = chat_service.get_missed_messages(
+            user_id, int(last_event_id), max_messages=current_app.config.get("CHAT_STREAM_MAX_REPLAY", 1000)
+        )
+    # The stream never touches the database again: hand the connection back to
+    # the pool now instead of holding it for the stream's lifetime
+    db.session.remove()
+
+    def format_event(message):
+        return f"id: {message['id']}\nevent: message\ndata: {json.dumps(message)}\n\n"
+
+    def events():
+        yield "retry: 3000\n\n"
+        replayed = set()
+        for message in missed:
+            replayed.add(message["id"])
+            yield format_event(message)
+        if truncated:
+            # Live events will move Last-Event-ID past the gap: the client must
+            # refetch older messages from /conversation/<id> instead
+            yield f"event: truncated\ndata: {json.dumps({'last_replayed_id': missed[-1]['id']})}\n\n"
+
+        deadline = time.monotonic() + max_seconds
+        while time.monotonic() < deadline:
+            event = subscription.get(timeout=heartbeat)
+            if event is None:
+                yield ": keepalive\n\n"
+            elif event.get("type") == "message" and event["message"]["id"] not in replayed:
+                yield format_event(event["message"])
+
+    response = Response(stream_with_context(events()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        # Stop nginx from buffering the stream
+        "X-Accel-Buffering": "no",
+    })
+    # Runs on completion and on client disconnect, even if the stream never started
+    response.call_on_close(subscription.close)
+    return response
+
+# Unread badge counts (total and per conversation); cheap enough to poll
+@chat_bp.route("/unread-count", methods=["GET"])
+@jwt_required()
+def get_unread_count():
+    user_id = int(get_jwt_identity())
+    return jsonify(chat_service.get_unread_counts(user_id)), 200
+
+# Mark a single received message as read
+@chat_bp.route("/messages/<int:message_id>/read", methods=["POST"])
+@jwt_required()
+def read_message(message_id):
+    user_id = int(get_jwt_identity())
+    try:
+        result = chat_service.mark_as_read(message_id, user_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    return jsonify(result), 200
+
+# Mark everything received from another user as read
+@chat_bp.route("/conversation/<int:recipient_id>/read", methods=["POST"])
+@jwt_required()
+def read_conversation(recipient_id):
+    user_id = int(get_jwt_identity())
+    updated = chat_service.mark_conversation_read(reader_id=user_id, other_id=recipient_id)
+    return jsonify({"message": "Conversation marked as read", "updated": updated}), 200
+
+# Get recent conversations (last message of each chat), newest activity first.
+# Paginate with ?cursor= (next_cursor of the previous page) and ?limit=
 @chat_bp.route("/recent", methods=["GET"])
 @jwt_required()
 def get_recent_chats():
-    user_id = get_jwt_identity()
-    # If you have implemented a method `get_recent_conversations` in ChatService, call it here.
-    # For now, just return empty list or implement accordingly.
-    conversations = []  # or chat_service.get_recent_conversations(user_id)
-    return jsonify(conversations), 200
+    user_id = int(get_jwt_identity())
+    cursor = request.args.get("cursor")
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+    try:
+        result = chat_service.get_recent_conversations(user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "conversations": result["items"],
+        "pagination": result["pagination"]
+    }), 200
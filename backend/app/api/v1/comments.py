@@ -27,16 +27,16 @@ def post_comment(post_id):
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
-    comment = comment_service.create_comment(post_id=post_id, user_id=user.id, text=text)
+    comment = comment_service.create_comment(author_id=user.id, post_id=post_id, content=text)
 
     return jsonify({
         "message": "Comment added successfully",
         "comment": {
             "id": comment.id,
-            "text": comment.text,
+            "text": comment.content,
             "user_id": comment.user_id,
             "post_id": comment.post_id,
-            "timestamp": comment.timestamp.isoformat()
+            "timestamp": comment.created_at.isoformat()
         }
     }), 201
 
@@ -49,6 +49,19 @@ def get_comments(post_id):
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
+    # Keyset pagination: ?cursor= (empty for the first page) and ?limit=
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        limit = request.args.get("limit", 20, type=int)
+        try:
+            result = comment_service.get_comments_by_post(post_id, limit=limit, cursor=cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "comments": result["items"],
+            "pagination": result["pagination"]
+        }), 200
+
     comments = comment_service.get_comments_by_post(post_id)
 
     return jsonify([
@@ -0,0 +1,89 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+from app.services.follow_service import follow_service
+
+follows_bp = Blueprint("follows", __name__, url_prefix="/api/v1/follows")
+
+
+def _current_user_id():
+    return int(get_jwt_identity())
+
+
+# Follow users in bulk: {"user_ids": [...]}
+@follows_bp.route("/", methods=["POST"])
+@jwt_required()
+def follow_users():
+    data = request.get_json() or {}
+    try:
+        result = follow_service.follow(_current_user_id(), data.get("user_ids"))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "data": result}), 200
+
+
+# Unfollow users in bulk: {"user_ids": [...]}
+@follows_bp.route("/", methods=["DELETE"])
+@jwt_required()
+def unfollow_users():
+    data = request.get_json() or {}
+    try:
+        result = follow_service.unfollow(_current_user_id(), data.get("user_ids"))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "data": result}), 200
+
+
+# Followers / following, newest first: ?cursor= (next_cursor of the previous page) and ?limit=
+@follows_bp.route("/<int:user_id>/followers", methods=["GET"])
+@jwt_required()
+def list_followers(user_id):
+    return _follow_list(follow_service.get_followers, user_id)
+
+
+@follows_bp.route("/<int:user_id>/following", methods=["GET"])
+@jwt_required()
+def list_following(user_id):
+    return _follow_list(follow_service.get_following, user_id)
+
+
+def _follow_list(fetch, user_id):
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+    try:
+        result = fetch(user_id, cursor=request.args.get("cursor"), limit=limit)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "data": result["items"], "pagination": result["pagination"]}), 200
+
+
+# Whether the current user follows each of ?ids=1,2,3
+@follows_bp.route("/status", methods=["GET"])
+@jwt_required()
+def follow_status():
+    ids = [i for i in request.args.get("ids", "").split(",") if i]
+    try:
+        result = follow_service.is_following(_current_user_id(), ids)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "data": {str(user_id): flag for user_id, flag in result.items()}}), 200
+
+
+# People both the current user and <user_id> follow
+@follows_bp.route("/mutual/<int:user_id>", methods=["GET"])
+@jwt_required()
+def mutual_following(user_id):
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+    try:
+        result = follow_service.get_mutual_following(_current_user_id(), user_id, limit=limit)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    return jsonify({"status": "success", "data": result}), 200
+
+
+# "People you may know", ranked by mutual connections
+@follows_bp.route("/suggestions", methods=["GET"])
+@jwt_required()
+def follow_suggestions():
+    limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+    users = follow_service.suggest_users(_current_user_id(), limit=limit)
+    return jsonify({"status": "success", "data": users}), 200
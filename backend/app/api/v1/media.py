@@ -1,13 +1,14 @@
+import os
+from datetime import timezone
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from werkzeug.utils import secure_filename
-from app.services.media_service import save_media_metadata, get_media_by_id
-from app.utils.file_storage import save_file_to_storage, allowed_file
+from app.services.media_service import (
+    media_service, save_media_metadata, get_media_by_id, UploadOffsetConflict
+)
+from app.utils.file_storage import send_stored_file
 
 media_bp = Blueprint("media", __name__, url_prefix="/api/v1/media")
 
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'mp4', 'mov', 'avi'}
-
 @media_bp.route("/upload", methods=["POST"])
 @jwt_required()
 def upload_media():
@@ -17,45 +18,151 @@ def upload_media():
         return jsonify({"error": "No file part in request"}), 400
 
     file = request.files['file']
-    post_id = request.form.get('post_id')  # Optional
+    post_id = request.form.get('post_id', type=int)  # Optional
 
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
-    if file and allowed_file(file.filename, ALLOWED_EXTENSIONS):
-        filename = secure_filename(file.filename)
-
-        # Save the file, get saved path
-        saved_path = save_file_to_storage(file, filename)
-
-        # Detect media type by file extension
-        ext = filename.rsplit('.', 1)[1].lower()
-        if ext in {'png', 'jpg', 'jpeg', 'gif'}:
-            media_type = 'image'
-        elif ext in {'mp4', 'mov', 'avi'}:
-            media_type = 'video'
-        else:
-            return jsonify({"error": "Unsupported media type"}), 400
-
-        # Create DB record via service
-        media = save_media_metadata(
-            filename=filename,
-            url=saved_path,   # adjust this if you generate full URL elsewhere
-            media_type=media_type,
-            user_id=user_id,
-            post_id=post_id
+    try:
+        media = save_media_metadata(user_id, file, post_id=post_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "message": "Upload successful",
+        "media": {
+            "id": media["id"],
+            "url": media["url"],
+            "type": media["media_type"],
+            "filename": media["filename"],
+            "post_id": media["post_id"]
+        }
+    }), 201
+
+
+# --- Chunked, resumable uploads ---
+# 1. POST   /uploads                 {"filename", "size", "sha256"?, "media_type"?, "post_id"?}
+# 2. PATCH  /uploads/<id>            raw bytes, Upload-Offset header = current offset
+# 3. HEAD   /uploads/<id>            current offset in Upload-Offset (to resume after a disconnect)
+# 4. POST   /uploads/<id>/complete   verifies size/checksum and creates the Media row
+
+def _upload_error(e, value_error_status=400):
+    if isinstance(e, PermissionError):
+        return jsonify({"error": str(e)}), 403
+    return jsonify({"error": str(e)}), value_error_status
+
+def _offset_headers(upload):
+    return {"Upload-Offset": str(upload.received), "Upload-Length": str(upload.total_size)}
+
+@media_bp.route("/uploads", methods=["POST"])
+@jwt_required()
+def init_upload():
+    user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    try:
+        upload = media_service.init_upload(
+            user_id,
+            filename=data.get("filename"),
+            size=data.get("size"),
+            sha256=data.get("sha256"),
+            media_type=data.get("media_type"),
+            post_id=data.get("post_id")
         )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    headers = _offset_headers(upload)
+    headers["Location"] = f"{media_bp.url_prefix}/uploads/{upload.id}"
+    return jsonify({"upload": upload.to_dict()}), 201, headers
+
+@media_bp.route("/uploads/<upload_id>", methods=["PATCH"])
+@jwt_required()
+def append_upload_chunk(upload_id):
+    user_id = int(get_jwt_identity())
+    offset = request.headers.get("Upload-Offset", type=int)
+    if offset is None:
+        return jsonify({"error": "Upload-Offset header is required"}), 400
+
+    try:
+        # request.stream is read directly, so Werkzeug never spools the body to disk
+        upload = media_service.append_chunk(upload_id, user_id, offset, request.stream, request.content_length)
+    except UploadOffsetConflict as e:
+        return jsonify({"error": str(e), "offset": e.expected_offset}), 409, {"Upload-Offset": str(e.expected_offset)}
+    except (ValueError, PermissionError) as e:
+        return _upload_error(e)
+
+    return "", 204, _offset_headers(upload)
+
+@media_bp.route("/uploads/<upload_id>", methods=["GET", "HEAD"])
+@jwt_required()
+def get_upload_status(upload_id):
+    user_id = int(get_jwt_identity())
+    try:
+        upload = media_service.get_upload(upload_id, user_id)
+    except (ValueError, PermissionError) as e:
+        return _upload_error(e, value_error_status=404)
+    return jsonify({"upload": upload.to_dict()}), 200, _offset_headers(upload)
+
+@media_bp.route("/uploads/<upload_id>/complete", methods=["POST"])
+@jwt_required()
+def complete_upload(upload_id):
+    user_id = int(get_jwt_identity())
+    try:
+        media = media_service.complete_upload(upload_id, user_id)
+    except (ValueError, PermissionError) as e:
+        return _upload_error(e)
+    return jsonify({"message": "Upload successful", "media": media}), 201
+
+@media_bp.route("/uploads/<upload_id>", methods=["DELETE"])
+@jwt_required()
+def abort_upload(upload_id):
+    user_id = int(get_jwt_identity())
+    try:
+        media_service.abort_upload(upload_id, user_id)
+    except (ValueError, PermissionError) as e:
+        return _upload_error(e)
+    return jsonify({"message": "Upload aborted"}), 200
+
+
+@media_bp.route("/<int:media_id>/status", methods=["GET"])
+@jwt_required()
+def get_processing_status(media_id):
+    try:
+        status = media_service.get_processing_status(media_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    return jsonify(status), 200
+
+
+# --- Serving ---
+# GET /<id>/file         the media's content; cached briefly and revalidated with its ETag
+# GET /files/<path>      a content-addressed path (a media "url" such as blobs/ab/cd/<hash>.jpg);
+#                        the bytes behind it never change, so it is cacheable forever
+# Both support Range requests. They are not behind JWT so <img>/<video> tags can load them.
+
+@media_bp.route("/<int:media_id>/file", methods=["GET"])
+def download_media(media_id):
+    try:
+        media = media_service.get_media_file(media_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+    response = send_stored_file(
+        media.url,
+        etag=media.sha256,
+        last_modified=media.uploaded_at.replace(tzinfo=timezone.utc) if media.uploaded_at else None
+    )
+    if response is None:
+        return jsonify({"error": "Media file not found"}), 404
+    return response
+
+@media_bp.route("/files/<path:path>", methods=["GET"])
+def download_stored_file(path):
+    if not path.startswith("blobs/") or os.path.normpath(path) != path:
+        return jsonify({"error": "File not found"}), 404
 
-        return jsonify({
-            "message": "Upload successful",
-            "media": {
-                "id": media.id,
-                "url": media.url,
-                "type": media.media_type,
-                "filename": media.filename,
-                "post_id": media.post_id
-            }
-        }), 201
-
-    else:
-        return jsonify({"error": "Invalid file type"}), 400
+    # Blob file names are their content hash
+    response = send_stored_file(path, etag=os.path.splitext(os.path.basename(path))[0], immutable=True)
+    if response is None:
+        return jsonify({"error": "File not found"}), 404
+    return response
@@ -1,10 +1,14 @@
+from datetime import datetime, timedelta
+
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.notification_service import (
     get_user_notifications,
-    mark_notification_as_read,
+    mark_as_read,
     mark_all_notifications_as_read,
-    delete_notification
+    delete_notification,
+    delete_notifications_bulk,
+    get_unread_count
 )
 
 notifications_bp = Blueprint("notifications", __name__, url_prefix="/api/v1/notifications")
@@ -17,46 +21,83 @@ def fetch_notifications():
     user_id = get_jwt_identity()
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("limit", 10, type=int)
+    unread_only = request.args.get("unread", "false").lower() == "true"
+    # ?cursor= (empty for the first page) switches to keyset pagination, which
+    # skips the total count and stays fast on deep pages
+    cursor = request.args.get("cursor")
 
-    notifications, total = get_user_notifications(user_id, page, per_page)
+    try:
+        if cursor is not None:
+            result = get_user_notifications(user_id, unread_only=unread_only, limit=per_page, cursor=cursor)
+        else:
+            result = get_user_notifications(user_id, unread_only=unread_only, limit=per_page, page=page)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({
         "notifications": [
             {
                 "id": n.id,
-                "type": n.type,
+                "type": n.notification_type,
                 "message": n.message,
                 "is_read": n.is_read,
-                "related_id": n.related_id,
+                "sender_id": n.sender_id,
                 "created_at": n.created_at.isoformat()
-            } for n in notifications
+            } for n in result["items"]
         ],
-        "pagination": {
-            "page": page,
-            "per_page": per_page,
-            "total": total
-        }
+        "pagination": result["pagination"]
     }), 200
 
 
+# Unread badge count (maintained counter; cheap enough to poll)
+@notifications_bp.route("/unread-count", methods=["GET"])
+@jwt_required()
+def unread_count():
+    user_id = get_jwt_identity()
+    return jsonify({"unread_count": get_unread_count(user_id)}), 200
+
+
 # Mark a single notification as read
 @notifications_bp.route("/<int:notification_id>/read", methods=["POST"])
 @jwt_required()
 def read_single(notification_id):
     user_id = get_jwt_identity()
-    success = mark_notification_as_read(user_id, notification_id)
-    if not success:
+    try:
+        mark_as_read(notification_id, user_id)
+    except (ValueError, PermissionError):
         return jsonify({"error": "Notification not found or unauthorized"}), 404
     return jsonify({"message": "Notification marked as read"}), 200
 
 
-# Mark all as read
+# Mark all as read, optionally only up to ?up_to_id= or ?cursor= (a next_cursor from the list)
 @notifications_bp.route("/read-all", methods=["POST"])
 @jwt_required()
 def read_all():
     user_id = get_jwt_identity()
-    mark_all_notifications_as_read(user_id)
-    return jsonify({"message": "All notifications marked as read"}), 200
+    up_to_id = request.args.get("up_to_id", type=int)
+    cursor = request.args.get("cursor")
+    try:
+        updated = mark_all_notifications_as_read(user_id, up_to_id=up_to_id, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"message": "Notifications marked as read", "updated": updated}), 200
+
+
+# Bulk delete by age (?older_than_days=) and/or type (?type=)
+@notifications_bp.route("/", methods=["DELETE"])
+@jwt_required()
+def delete_bulk():
+    user_id = get_jwt_identity()
+    older_than_days = request.args.get("older_than_days", type=int)
+    notif_type = request.args.get("type")
+    if older_than_days is None and not notif_type:
+        return jsonify({"error": "Provide older_than_days and/or type"}), 400
+    if older_than_days is not None and older_than_days < 0:
+        return jsonify({"error": "older_than_days must be positive"}), 400
+
+    older_than = datetime.utcnow() - timedelta(days=older_than_days) if older_than_days is not None else None
+    deleted = delete_notifications_bulk(user_id=user_id, older_than=older_than, notif_type=notif_type)
+    return jsonify({"message": "Notifications deleted", "deleted": deleted}), 200
 
 
 # Delete a notification
@@ -64,7 +105,8 @@ def read_all():
 @jwt_required()
 def delete_notif(notification_id):
     user_id = get_jwt_identity()
-    success = delete_notification(user_id, notification_id)
-    if not success:
+    try:
+        delete_notification(notification_id, user_id)
+    except (ValueError, PermissionError):
         return jsonify({"error": "Notification not found or unauthorized"}), 404
     return jsonify({"message": "Notification deleted"}), 200
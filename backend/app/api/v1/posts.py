@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.post_service import PostService
+from app.services.timeline_service import timeline_service
 
 posts_bp = Blueprint("posts", __name__, url_prefix="/api/v1/posts")
 
@@ -11,21 +12,60 @@ post_service = PostService()  # create an instance of PostService
 def list_posts():
     campus_id = request.args.get("campus_id", type=int)
     user_id = request.args.get("user_id", type=int)
+    # Pass ?cursor= (empty for the first page) to use keyset pagination
+    cursor = request.args.get("cursor")
+    per_page = request.args.get("per_page", 20, type=int)
     
     try:
         if campus_id:
-            posts = post_service.get_posts(campus_id=campus_id)
+            posts = post_service.get_posts(per_page=per_page, campus_id=campus_id, cursor=cursor)
         elif user_id:
-            posts = post_service.get_posts(author_id=user_id)
+            posts = post_service.get_posts(per_page=per_page, author_id=user_id, cursor=cursor)
         else:
-            posts = post_service.get_posts()
+            posts = post_service.get_posts(per_page=per_page, cursor=cursor)
         
-        # posts is a pagination dict, get items list
-        posts_list = [post.to_dict() for post in posts['items']]
-        return jsonify({"status": "success", "data": posts_list}), 200
+        # posts is a pagination dict whose items are already serialized in batch
+        return jsonify({
+            "status": "success",
+            "data": posts['items'],
+            "pagination": posts['pagination']
+        }), 200
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@posts_bp.route("/feed", methods=["GET"])
+@jwt_required()
+def home_feed():
+    user_id = get_jwt_identity()
+    # Empty/absent cursor returns the newest page
+    cursor = request.args.get("cursor")
+    per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
+
+    try:
+        feed = timeline_service.get_home_feed(user_id, cursor=cursor, per_page=per_page)
+        return jsonify({
+            "status": "success",
+            "data": feed["items"],
+            "pagination": feed["pagination"]
+        }), 200
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+# Viewer state for a page of posts in one round trip: ?ids=1,2,3 ->
+# {"<post_id>": {"liked", "commented", "author_followed"}}
+@posts_bp.route("/relationships", methods=["GET"])
+@jwt_required()
+def post_relationships():
+    try:
+        post_ids = [int(i) for i in request.args.get("ids", "").split(",") if i]
+        relationships = post_service.get_relationships(int(get_jwt_identity()), post_ids)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({
+        "status": "success",
+        "data": {str(post_id): state for post_id, state in relationships.items()}
+    }), 200
+
 @posts_bp.route("/<int:post_id>", methods=["GET"])
 @jwt_required()
 def get_post(post_id):
@@ -0,0 +1,26 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+
+from app.services.search_service import search_service
+
+search_bp = Blueprint("search", __name__, url_prefix="/api/v1/search")
+
+
+# Ranked search: ?q=, optional ?type=user,post,group,event, ?limit=, ?offset=
+# and ?prefix=true to match the last word as a prefix (search-as-you-type)
+@search_bp.route("/", methods=["GET"])
+@jwt_required()
+def search():
+    query = request.args.get("q", "")
+    types = [t for t in request.args.get("type", "").split(",") if t]
+    limit = request.args.get("limit", 20, type=int)
+    offset = request.args.get("offset", 0, type=int)
+    prefix = request.args.get("prefix", "false").lower() == "true"
+
+    try:
+        result = search_service.search(query, types, limit=limit, offset=offset, prefix=prefix)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    return jsonify({"status": "success", "data": result["results"],
+                    "pagination": {"limit": result["limit"], "offset": result["offset"]}}), 200
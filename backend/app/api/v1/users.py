@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-#from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+#from flask_jwt_extended import jwt_required
 
 from app.services.user_service import UserService
+from app.services.typeahead_service import typeahead_service
 
 users_bp = Blueprint("users", __name__, url_prefix="/api/v1/users")
 
@@ -75,3 +77,16 @@ def search_users():
         "status": "success",
         "data": [user.to_dict() for user in users]
     }), 200
+
+
+# Typeahead for @mentions and user lookup: ?q= prefix, ?limit=. Served from an
+# in-memory index; signed-in viewers get people they follow and their campus first
+@users_bp.route("/suggest", methods=["GET"])
+def suggest_users():
+    verify_jwt_in_request(optional=True)
+    identity = get_jwt_identity()
+    viewer_id = int(identity) if identity is not None else None
+
+    users = typeahead_service.suggest(request.args.get("q", ""), viewer_id=viewer_id,
+                                      limit=request.args.get("limit", 10, type=int))
+    return jsonify({"status": "success", "data": users}), 200
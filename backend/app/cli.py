@@ -0,0 +1,280 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from datetime import datetime
+
+import click
+from flask import Flask, current_app
+from sqlalchemy import and_, or_
+
+from app.extensions import db, storage
+from app.models import (
+    ChatMessage, Comment, Conversation, Event, Follow, GroupMembership, Like, Media, Notification, Post
+)
+
+
+def register_commands(app: Flask):
+    """
+    Register custom `flask` CLI commands.
+    """
+    app.cli.add_command(index_advisor)
+    app.cli.add_command(optimize_images)
+    app.cli.add_command(reindex_search)
+
+
+def _service_query_shapes():
+    """
+    Representative queries for the hot service methods, keyed by the method
+    that issues them. Keep these in sync when a service query changes shape.
+    """
+    sample_id = 1
+    now = datetime.utcnow()
+    page = 20
+
+    return [
+        ("PostService.get_posts",
+         Post.query.order_by(Post.created_at.desc(), Post.id.desc()).limit(page)),
+        ("PostService.get_posts(campus_id)",
+         Post.query.filter(Post.campus_id == sample_id)
+         .order_by(Post.created_at.desc(), Post.id.desc()).limit(page)),
+        ("PostService.get_posts(author_id)",
+         Post.query.filter(Post.user_id == sample_id)
+         .order_by(Post.created_at.desc(), Post.id.desc()).limit(page)),
+        ("PostService.get_posts(group_id)",
+         Post.query.filter(Post.group_id == sample_id)
+         .order_by(Post.created_at.desc(), Post.id.desc()).limit(page)),
+        ("PostService.get_posts(cursor)",
+         Post.query.filter(or_(Post.created_at < now, and_(Post.created_at == now, Post.id < sample_id)))
+         .order_by(Post.created_at.desc(), Post.id.desc()).limit(page)),
+        ("PostService.serialize_posts",
+         Media.query.filter(Media.post_id.in_([sample_id, sample_id + 1])).order_by(Media.id)),
+        ("CommentService.get_comments_by_post",
+         Comment.query.filter_by(post_id=sample_id)
+         .order_by(Comment.created_at.desc(), Comment.id.desc()).limit(page)),
+        ("like_service.has_liked_post",
+         Like.query.filter_by(post_id=sample_id, user_id=sample_id).limit(1)),
+        ("like_service.get_liked_post_ids",
+         db.session.query(Like.post_id).filter(Like.user_id == sample_id,
+                                               Like.post_id.in_([sample_id, sample_id + 1]))),
+        ("PostService.get_commented_post_ids",
+         db.session.query(Comment.post_id).filter(Comment.user_id == sample_id,
+                                                  Comment.post_id.in_([sample_id, sample_id + 1])).distinct()),
+        ("PostService.reconcile_counters",
+         db.session.query(db.func.count(Like.id)).filter(Like.post_id == sample_id)),
+        ("ChatService.get_conversation",
+         ChatMessage.query.filter(or_(
+             and_(ChatMessage.sender_id == sample_id, ChatMessage.receiver_id == sample_id + 1),
+             and_(ChatMessage.sender_id == sample_id + 1, ChatMessage.receiver_id == sample_id)
+         )).order_by(ChatMessage.timestamp.desc()).limit(50)),
+        ("ChatService.get_recent_conversations",
+         Conversation.query.filter(Conversation.user_b_id == sample_id, Conversation.last_message_at.isnot(None))
+         .order_by(Conversation.last_message_at.desc(), Conversation.id.desc()).limit(page)),
+        ("NotificationService.get_user_notifications",
+         Notification.query.filter_by(recipient_id=sample_id)
+         .order_by(Notification.created_at.desc(), Notification.id.desc()).limit(page)),
+        ("NotificationService.get_user_notifications(unread_only)",
+         Notification.query.filter_by(recipient_id=sample_id, is_read=False)
+         .order_by(Notification.created_at.desc()).limit(page)),
+        ("GroupService.get_user_groups",
+         GroupMembership.query.filter_by(user_id=sample_id)),
+        ("Group.members_count",
+         db.session.query(db.func.count(GroupMembership.id)).filter(GroupMembership.group_id == sample_id)),
+        ("EventService.get_all_events(campus_id)",
+         Event.query.filter_by(campus_id=sample_id).order_by(Event.start_time.asc())),
+        ("User.followers",
+         Follow.query.filter_by(followed_id=sample_id)),
+        ("FollowService.get_followers",
+         Follow.query.filter_by(followed_id=sample_id)
+         .order_by(Follow.created_at.desc(), Follow.id.desc()).limit(page)),
+        ("FollowService.get_following",
+         Follow.query.filter_by(follower_id=sample_id)
+         .order_by(Follow.created_at.desc(), Follow.id.desc()).limit(page)),
+        ("FollowService.following_map",
+         db.session.query(Follow.follower_id, Follow.followed_id)
+         .filter(Follow.follower_id.in_([sample_id, sample_id + 1]))),
+    ]
+
+
+def _explain(query):
+    """
+    Run EXPLAIN for a query on the current database.
+
+    Returns:
+        tuple: (plan lines, lines flagged as sequential scans)
+    """
+    dialect = db.engine.dialect
+    compiled = query.statement.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    connection = db.session.connection()
+    if dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+        plan = [row[-1] for row in rows]
+        # "SCAN <table>" without an index is a full table scan; "SEARCH ... USING INDEX" is fine
+        flagged = [line for line in plan if line.startswith("SCAN") and "USING" not in line]
+    elif dialect.name == "postgresql":
+        rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params).fetchall()
+        plan = [row[0] for row in rows]
+        flagged = [line for line in plan if "Seq Scan" in line]
+    else:
+        raise click.ClickException(f"EXPLAIN is not supported for dialect '{dialect.name}'")
+
+    return plan, flagged
+
+
+@click.command("index-advisor")
+@click.option("--verbose", is_flag=True, help="Print the full plan for every query.")
+@click.option("--strict", is_flag=True, help="Exit with status 1 if any sequential scan is found.")
+def index_advisor(verbose, strict):
+    """
+    EXPLAIN the query shapes used by the service layer and flag sequential scans.
+
+    Run against a database with realistic statistics; planners happily seq-scan
+    tiny tables.
+    """
+    shapes = _service_query_shapes()
+    flagged_total = 0
+    for name, query in shapes:
+        plan, flagged = _explain(query)
+        status = "SEQ SCAN" if flagged else "ok"
+        click.echo(f"[{status:>8}] {name}")
+        for line in (plan if verbose else flagged):
+            click.echo(f"           {line}")
+        flagged_total += bool(flagged)
+
+    db.session.rollback()
+    click.echo(f"\n{flagged_total} of {len(shapes)} query shapes use sequential scans.")
+    if strict and flagged_total:
+        raise SystemExit(1)
+
+
+def _read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _write_checkpoint(path, last_id):
+    # Write-and-rename so an interrupted run never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(last_id))
+    os.replace(tmp_path, path)
+
+
+@click.command("optimize-images")
+@click.option("--batch-size", default=200, show_default=True, help="Media rows fetched and committed per batch.")
+@click.option("--workers", default=os.cpu_count(), show_default=True, help="Worker processes.")
+@click.option("--checkpoint", default="optimize-images.checkpoint", show_default=True,
+              help="File recording the last processed media id.")
+@click.option("--restart", is_flag=True, help="Ignore the checkpoint and scan from the first media row.")
+def optimize_images(batch_size, workers, checkpoint, restart):
+    """
+    Backfill responsive variants for images uploaded before the variants
+    pipeline existed.
+
+    Decoding and encoding run in a process pool, so every core is used
+    instead of one GIL-bound worker. Rows with `optimized_at` set are skipped,
+    and the last processed id is checkpointed after each batch, so an
+    interrupted run resumes where it stopped.
+    """
+    from app.models import Media
+    from app.services.media_service import media_service
+    from app.utils.image_optimizer import create_image_variants
+
+    config = current_app.config
+    options = {
+        "widths": config.get("IMAGE_VARIANT_WIDTHS", (320, 640, 1280)),
+        "formats": config.get("IMAGE_VARIANT_FORMATS", ("webp", "jpeg")),
+        "quality": config.get("IMAGE_VARIANT_QUALITY", 75),
+    }
+    last_id = 0 if restart else _read_checkpoint(checkpoint)
+    if last_id:
+        click.echo(f"Resuming after media id {last_id}.")
+
+    processed = failed = bytes_saved = 0
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = Media.query.filter(
+                Media.media_type == "image",
+                Media.optimized_at.is_(None),
+                Media.id > last_id
+            ).order_by(Media.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            with tempfile.TemporaryDirectory() as work_dir, ExitStack() as stack:
+                jobs = {}
+                seen_blobs = set()
+                for media in batch:
+                    # Rows sharing content are all updated when the first one is saved
+                    if media.blob_id is not None:
+                        if media.blob_id in seen_blobs:
+                            continue
+                        seen_blobs.add(media.blob_id)
+                    try:
+                        source = stack.enter_context(storage.local_copy(media.url))
+                        original_size = os.path.getsize(source)
+                    except Exception as e:
+                        failed += 1
+                        click.echo(f"  media {media.id}: {e}", err=True)
+                        continue
+                    out_dir = os.path.join(work_dir, str(media.id))
+                    os.makedirs(out_dir)
+                    future = pool.submit(create_image_variants, source, out_dir, **options)
+                    jobs[future] = (media, original_size)
+
+                for future in as_completed(jobs):
+                    media, original_size = jobs[future]
+                    try:
+                        variants = future.result()
+                        media_service.save_image_variants(media, variants)
+                    except Exception as e:
+                        failed += 1
+                        click.echo(f"  media {media.id}: {e}", err=True)
+                        continue
+                    processed += 1
+                    if variants["images"]:
+                        # Largest variant in the preferred format is what clients now fetch instead
+                        bytes_saved += max(0, original_size - variants["images"][0]["size"])
+
+            db.session.commit()
+            last_id = batch[-1].id
+            _write_checkpoint(checkpoint, last_id)
+
+            elapsed = time.monotonic() - started
+            click.echo(f"up to id {last_id}: {processed} images, {processed / elapsed:.1f} images/s, "
+                       f"{bytes_saved / 1024 ** 2:.1f} MiB saved, {failed} failed")
+
+    elapsed = time.monotonic() - started
+    click.echo(f"\nDone: {processed} images in {elapsed:.1f}s "
+               f"({processed / elapsed if elapsed else 0:.1f} images/s), "
+               f"{bytes_saved / 1024 ** 2:.1f} MiB saved, {failed} failed.")
+
+
+@click.command("reindex-search")
+@click.option("--type", "types", multiple=True, type=click.Choice(["user", "post", "group", "event"]),
+              help="Document type to rebuild (repeatable; default: all).")
+@click.option("--batch-size", default=1000, show_default=True, help="Rows indexed and committed per batch.")
+def reindex_search(types, batch_size):
+    """
+    Rebuild the full-text search index from the source tables.
+
+    Needed once after the search migration, and whenever the index is
+    suspected to have drifted; day-to-day changes are indexed by the services.
+    """
+    from app.services.search_service import search_service
+
+    started = time.monotonic()
+    counts = search_service.reindex(types or None, batch_size=batch_size)
+    for doc_type, count in counts.items():
+        click.echo(f"{doc_type}: {count} documents")
+    click.echo(f"\nDone in {time.monotonic() - started:.1f}s.")
@@ -23,5 +23,94 @@ class Config:
     CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
     CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
+    # Home timeline: authors with more followers than this are merged in at
+    # read time instead of being fanned out to every follower on write
+    FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", 5000))
+    FEED_FANOUT_BATCH_SIZE = int(os.getenv("FEED_FANOUT_BATCH_SIZE", 1000))
+    # Recent posts copied into a timeline when its owner follows someone
+    FEED_FOLLOW_BACKFILL_POSTS = int(os.getenv("FEED_FOLLOW_BACKFILL_POSTS", 20))
+
+    # Follow graph: per-user adjacency lists are cached this long, and at most
+    # this many followees are expanded for "people you may know"
+    FOLLOW_GRAPH_CACHE_TTL = int(os.getenv("FOLLOW_GRAPH_CACHE_TTL", 300))
+    FOLLOW_SUGGESTION_MAX_SOURCES = int(os.getenv("FOLLOW_SUGGESTION_MAX_SOURCES", 200))
+
+    # Entity cache (in-process LRU; set CACHE_BACKEND=redis to share across workers)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "lru")
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 300))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", CELERY_BROKER_URL)
+
+    # Real-time chat push (in-process; set PUBSUB_BACKEND=redis when running several workers)
+    PUBSUB_BACKEND = os.getenv("PUBSUB_BACKEND", "memory")
+    PUBSUB_REDIS_URL = os.getenv("PUBSUB_REDIS_URL", CELERY_BROKER_URL)
+    # SSE streams send a keepalive comment this often and end after the max
+    # duration; clients reconnect with Last-Event-ID and miss nothing
+    CHAT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("CHAT_STREAM_HEARTBEAT_SECONDS", 15))
+    CHAT_STREAM_MAX_SECONDS = int(os.getenv("CHAT_STREAM_MAX_SECONDS", 300))
+    # Most missed messages replayed on reconnect; beyond it the stream sends a
+    # "truncated" event and the client refetches the conversation history
+    CHAT_STREAM_MAX_REPLAY = int(os.getenv("CHAT_STREAM_MAX_REPLAY", 1000))
+
+    # Bulk notifications: recipients per multi-row INSERT / per Celery task
+    NOTIFICATION_BULK_CHUNK_SIZE = int(os.getenv("NOTIFICATION_BULK_CHUNK_SIZE", 1000))
+
+    # Chunked uploads: total and per-chunk limits, and when abandoned uploads are purged
+    MEDIA_MAX_UPLOAD_BYTES = int(os.getenv("MEDIA_MAX_UPLOAD_BYTES", 2 * 1024 ** 3))
+    MEDIA_MAX_CHUNK_BYTES = int(os.getenv("MEDIA_MAX_CHUNK_BYTES", 16 * 1024 ** 2))
+    MEDIA_UPLOAD_EXPIRY_HOURS = int(os.getenv("MEDIA_UPLOAD_EXPIRY_HOURS", 24))
+
+    # Media storage: "local" (under MEDIA_UPLOAD_PATH) or "s3" for any
+    # S3-compatible service, so media does not live on the app servers
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+    STORAGE_S3_BUCKET = os.getenv("STORAGE_S3_BUCKET")
+    STORAGE_S3_ENDPOINT_URL = os.getenv("STORAGE_S3_ENDPOINT_URL")  # e.g. MinIO
+    STORAGE_S3_REGION = os.getenv("STORAGE_S3_REGION")
+    STORAGE_S3_ACCESS_KEY = os.getenv("STORAGE_S3_ACCESS_KEY")
+    STORAGE_S3_SECRET_KEY = os.getenv("STORAGE_S3_SECRET_KEY")
+    STORAGE_S3_PREFIX = os.getenv("STORAGE_S3_PREFIX", "")
+    STORAGE_URL_EXPIRY = int(os.getenv("STORAGE_URL_EXPIRY", 3600))
+
+    # Media serving: "stream" (the app sends the bytes), "x-accel" (nginx),
+    # "x-sendfile" (Apache/lighttpd) or "redirect" (presigned storage URLs)
+    MEDIA_SERVE_MODE = os.getenv("MEDIA_SERVE_MODE", "stream")
+    MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+    MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", 3600))
+
+    # Responsive image variants generated for each new image upload
+    IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")]
+    IMAGE_VARIANT_FORMATS = os.getenv("IMAGE_VARIANT_FORMATS", "webp,jpeg").split(",")
+    IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", 75))
+
+    # HLS transcoding of uploaded videos (ladder defaults to 240p/480p/720p,
+    # see DEFAULT_HLS_LADDER in app/utils/video_optimizer.py)
+    VIDEO_HLS_LADDER = None
+    VIDEO_HLS_SEGMENT_SECONDS = int(os.getenv("VIDEO_HLS_SEGMENT_SECONDS", 4))
+    VIDEO_X264_PRESET = os.getenv("VIDEO_X264_PRESET", "veryfast")
+    # Concurrent ffmpeg processes per worker host; each gets cores / this many
+    # threads unless VIDEO_FFMPEG_THREADS is set
+    VIDEO_MAX_CONCURRENT_TRANSCODES = int(os.getenv("VIDEO_MAX_CONCURRENT_TRANSCODES", 2))
+    VIDEO_FFMPEG_THREADS = int(os.getenv("VIDEO_FFMPEG_THREADS", 0))
+    VIDEO_SLOT_LOCK_DIR = os.getenv("VIDEO_SLOT_LOCK_DIR")
+    VIDEO_SLOT_WAIT_SECONDS = int(os.getenv("VIDEO_SLOT_WAIT_SECONDS", 30))
+
+    # Media processing retries: attempts per job, backoff doubling from this base
+    MEDIA_JOB_MAX_ATTEMPTS = int(os.getenv("MEDIA_JOB_MAX_ATTEMPTS", 4))
+    MEDIA_JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("MEDIA_JOB_RETRY_BACKOFF_SECONDS", 30))
+
+    # Full-text search (FTS5 on SQLite, tsvector + GIN on Postgres); the
+    # Postgres text search configuration, e.g. "english" to enable stemming
+    SEARCH_PG_CONFIG = os.getenv("SEARCH_PG_CONFIG", "simple")
+
+    # Typeahead: matches ranked per keystroke (followed users are always included)
+    TYPEAHEAD_MAX_CANDIDATES = int(os.getenv("TYPEAHEAD_MAX_CANDIDATES", 5000))
+
+    # Per-request SQL instrumentation: "headers" (X-Query-Count, X-Query-Time-Ms,
+    # Server-Timing), "log" or "off". Requests over their endpoint's query
+    # budget (QUERY_BUDGETS by endpoint name, else QUERY_BUDGET_DEFAULT) log a warning
+    QUERY_METRICS = os.getenv("QUERY_METRICS", "headers")
+    QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", 20))
+    QUERY_BUDGETS = {}
+
     # Media upload path (local dev)
     MEDIA_UPLOAD_PATH = os.getenv("MEDIA_UPLOAD_PATH", "./uploads")
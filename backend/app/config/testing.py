@@ -23,5 +23,59 @@ class Config:
     CELERY_BROKER_URL = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND = "redis://localhost:6379/1"
 
+    # Home timeline fan-out (small threshold so both paths are exercised)
+    FEED_FANOUT_MAX_FOLLOWERS = 50
+    FEED_FANOUT_BATCH_SIZE = 100
+    FEED_FOLLOW_BACKFILL_POSTS = 5
+
+    # Follow graph adjacency cache and suggestion fan-in
+    FOLLOW_GRAPH_CACHE_TTL = 300
+    FOLLOW_SUGGESTION_MAX_SOURCES = 50
+
+    # Entity cache (per-process LRU, nothing shared between test runs)
+    CACHE_BACKEND = "lru"
+    CACHE_DEFAULT_TTL = 60
+    CACHE_MAX_ENTRIES = 1000
+
+    # Real-time chat push (in-process hub, short streams)
+    PUBSUB_BACKEND = "memory"
+    CHAT_STREAM_HEARTBEAT_SECONDS = 1
+    CHAT_STREAM_MAX_SECONDS = 5
+    CHAT_STREAM_MAX_REPLAY = 1000
+
+    # Bulk notifications (small chunks so multi-chunk paths are exercised)
+    NOTIFICATION_BULK_CHUNK_SIZE = 50
+
+    # Chunked uploads (small limits so chunking is exercised)
+    MEDIA_MAX_UPLOAD_BYTES = 10 * 1024 ** 2
+    MEDIA_MAX_CHUNK_BYTES = 64 * 1024
+    MEDIA_UPLOAD_EXPIRY_HOURS = 1
+
+    # Media storage (local disk under the test upload path)
+    STORAGE_BACKEND = "local"
+    MEDIA_SERVE_MODE = "stream"
+
+    # Image variants (two small widths to keep tests fast)
+    IMAGE_VARIANT_WIDTHS = [64, 128]
+    IMAGE_VARIANT_FORMATS = ["webp", "jpeg"]
+    IMAGE_VARIANT_QUALITY = 75
+
+    # HLS transcoding (one small rung, fastest preset)
+    VIDEO_HLS_LADDER = [{"name": "144p", "height": 144, "video_kbps": 200, "audio_kbps": 48}]
+    VIDEO_HLS_SEGMENT_SECONDS = 2
+    VIDEO_X264_PRESET = "ultrafast"
+    VIDEO_MAX_CONCURRENT_TRANSCODES = 1
+    VIDEO_SLOT_WAIT_SECONDS = 1
+    MEDIA_JOB_MAX_ATTEMPTS = 2
+    MEDIA_JOB_RETRY_BACKOFF_SECONDS = 0
+
+    # Typeahead: matches ranked per keystroke (followed users are always included)
+    TYPEAHEAD_MAX_CANDIDATES = 5000
+
+    # Query instrumentation headers and budgets
+    QUERY_METRICS = "headers"
+    QUERY_BUDGET_DEFAULT = 20
+    QUERY_BUDGETS = {}
+
     # Test upload path
     MEDIA_UPLOAD_PATH = "./test_uploads"
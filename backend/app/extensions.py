@@ -3,7 +3,16 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 
+from app.utils.cache import Cache
+from app.utils.pubsub import PubSub
+from app.utils.search import Search
+from app.utils.storage import Storage
+
 #  Flask extensions 
 db = SQLAlchemy()
 jwt = JWTManager()
 migrate = Migrate()
+cache = Cache()
+pubsub = PubSub()
+storage = Storage()
+search = Search()
@@ -2,6 +2,7 @@ from flask import Flask
 from app.middleware.cors import configure_cors
 from app.middleware.error_handler import register_error_handlers
 from app.middleware.auth_middleware import register_auth_middleware
+from app.middleware.query_metrics import register_query_metrics
 
 
 def register_middlewares(app: Flask):
@@ -11,7 +12,9 @@ def register_middlewares(app: Flask):
     - CORS setup
     - Error handling
     - Custom auth/request middlewares
+    - Per-request query count / DB time instrumentation
     """
     configure_cors(app)
     register_error_handlers(app)
     register_auth_middleware(app)
+    register_query_metrics(app)
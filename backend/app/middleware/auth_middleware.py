@@ -1,6 +1,6 @@
 from flask import request, g
 import logging
-from flask_jwt_extended import verify_jwt_in_request_optional, get_jwt_identity
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ def register_auth_middleware(app):
         Middleware that runs before each request.
         It sets `g.current_user_id` if a valid JWT is provided.
         """
-        verify_jwt_in_request_optional()
+        verify_jwt_in_request(optional=True)
         g.current_user_id = get_jwt_identity()
 
         logger.debug(f"Request Path: {request.path}")
@@ -0,0 +1,89 @@
+import logging
+import time
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    if has_request_context():
+        stats = g.get("query_stats")
+        if stats is not None:
+            stats["count"] += 1
+            stats["seconds"] += time.perf_counter() - started
+
+
+def query_budget(endpoint):
+    """
+    Query budget for an endpoint: QUERY_BUDGETS[endpoint], else
+    QUERY_BUDGET_DEFAULT (None means unlimited).
+    """
+    config = current_app.config
+    return config.get("QUERY_BUDGETS", {}).get(endpoint, config.get("QUERY_BUDGET_DEFAULT"))
+
+
+def register_query_metrics(app: Flask):
+    """
+    Count the SQL statements each request runs and the time spent in them.
+
+    QUERY_METRICS selects what happens with the numbers:
+    - "headers": X-Query-Count, X-Query-Time-Ms and Server-Timing response
+      headers, readable from the browser's network panel (development)
+    - "log": one record per request on this module's logger, with endpoint,
+      queries and db_time_ms as extra fields for log-based metrics (production)
+    - "off": no instrumentation
+
+    In every mode but "off", requests that run more queries than their
+    endpoint's budget are logged as warnings.
+
+    Safe to call more than once per app (create_app and register_middlewares
+    both do); the hooks are added only the first time, so queries aren't
+    counted twice.
+    """
+    if "query_metrics" in app.extensions:
+        return
+    mode = app.config.get("QUERY_METRICS", "off")
+    if mode not in ("off", "headers", "log"):
+        raise ValueError(f"Unknown QUERY_METRICS '{mode}'")
+    app.extensions["query_metrics"] = mode
+    if mode == "off":
+        return
+
+    # Engine-wide listeners; registered once even when several apps are created
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = {"count": 0, "seconds": 0.0}
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        endpoint = request.endpoint or request.path
+        count, db_ms = stats["count"], stats["seconds"] * 1000
+        if mode == "headers":
+            response.headers["X-Query-Count"] = str(count)
+            response.headers["X-Query-Time-Ms"] = f"{db_ms:.1f}"
+            response.headers.add("Server-Timing", f'db;dur={db_ms:.1f};desc="{count} queries"')
+        else:
+            logger.info("query stats for %s: %d queries, %.1f ms", endpoint, count, db_ms,
+                        extra={"endpoint": endpoint, "queries": count, "db_time_ms": round(db_ms, 1)})
+
+        budget = query_budget(endpoint)
+        if budget is not None and count > budget:
+            logger.warning("Query budget exceeded: %s %s ran %d queries (budget %d), %.1f ms in the database",
+                           request.method, endpoint, count, budget, db_ms)
+        return response
@@ -13,6 +13,12 @@ from .event import Event
 from .chat_message import ChatMessage
 from .notification import Notification
 from .follow import Follow
+from .timeline_entry import TimelineEntry
+from .notification_counter import NotificationCounter
+from .conversation import Conversation
+from .upload_session import UploadSession
+from .media_blob import MediaBlob
+from .media_processing_job import MediaProcessingJob
 
 __all__ = [
     "db",
@@ -27,5 +33,11 @@ __all__ = [
     "Event",
     "ChatMessage",
     "Notification",
-    "Follow"
+    "Follow",
+    "TimelineEntry",
+    "NotificationCounter",
+    "Conversation",
+    "UploadSession",
+    "MediaBlob",
+    "MediaProcessingJob"
 ]
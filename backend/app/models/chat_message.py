@@ -24,6 +24,12 @@ class ChatMessage(db.Model):
         back_populates="received_messages"
     )
 
+    __table_args__ = (
+        db.Index("ix_chat_messages_sender_receiver_timestamp", "sender_id", "receiver_id", "timestamp"),
+        # Stream catch-up: messages received after a given id
+        db.Index("ix_chat_messages_receiver_id_id", "receiver_id", "id"),
+    )
+
     def __repr__(self):
         return f"<ChatMessage id={self.id} from={self.sender_id} to={self.receiver_id} at={self.timestamp}>"
 
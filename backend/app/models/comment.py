@@ -26,5 +26,22 @@ class Comment(db.Model):
                            backref=backref('parent', remote_side=[id]),
                            lazy='dynamic')
 
+    __table_args__ = (
+        db.Index('ix_comments_post_id_created_at', 'post_id', 'created_at', 'id'),
+        # "Has the viewer commented on these posts?" (PostService.get_relationships)
+        db.Index('ix_comments_user_id_post_id', 'user_id', 'post_id'),
+    )
+
     def __repr__(self):
         return f"<Comment {self.id} by User {self.user_id} on Post {self.post_id}>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "content": self.content,
+            "user_id": self.user_id,
+            "post_id": self.post_id,
+            "parent_id": self.parent_id,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,41 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class Conversation(db.Model):
+    """
+    One row per pair of users who have exchanged messages: a summary of the
+    latest message plus each side's unread count, so the inbox is an index
+    scan instead of a GROUP BY over the whole message history. The pair is
+    stored ordered (user_a_id < user_b_id) so both directions map to the same row.
+    """
+    __tablename__ = "conversations"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_a_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_b_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Messages not yet read by user_a / user_b respectively
+    unread_a = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    unread_b = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # Latest message summary, maintained by ChatService
+    last_message_id = db.Column(db.Integer, db.ForeignKey("chat_messages.id", ondelete="SET NULL",
+                                                              name="fk_conversations_last_message_id"), nullable=True)
+    last_message_preview = db.Column(db.String(200), nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    last_sender_id = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_a_id", "user_b_id", name="uq_conversations_pair"),
+        # Inbox for either side, newest activity first (keyset on last_message_at, id)
+        db.Index("ix_conversations_user_a_last_message", "user_a_id", "last_message_at", "id"),
+        db.Index("ix_conversations_user_b_last_message", "user_b_id", "last_message_at", "id"),
+    )
+
+    @staticmethod
+    def ordered_pair(user1_id, user2_id):
+        return (user1_id, user2_id) if user1_id < user2_id else (user2_id, user1_id)
+
+    def __repr__(self):
+        return f"<Conversation {self.user_a_id}<->{self.user_b_id}>"
@@ -36,5 +36,23 @@ class Event(db.Model):
                              secondary=event_attendees,
                              backref=backref('events_attending', lazy='dynamic'))
 
+    __table_args__ = (
+        db.Index('ix_events_campus_id_start_time', 'campus_id', 'start_time'),
+        db.Index('ix_events_start_time', 'start_time'),
+    )
+
     def __repr__(self):
         return f"<Event {self.title} by User {self.creator_id}>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "location": self.location,
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat(),
+            "creator_id": self.creator_id,
+            "campus_id": self.campus_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -27,6 +27,10 @@ class Follow(db.Model):
     # Prevent duplicate follows
     __table_args__ = (
         UniqueConstraint('follower_id', 'followed_id', name='_follower_followed_uc'),
+        # Follower/following lists page newest first on (created_at, id); the
+        # first also serves "who follows X", which the unique constraint cannot
+        db.Index('ix_follows_followed_id_created_at', 'followed_id', 'created_at', 'id'),
+        db.Index('ix_follows_follower_id_created_at', 'follower_id', 'created_at', 'id'),
     )
 
     def __repr__(self):
@@ -17,6 +17,7 @@ class GroupMembership(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "group_id", name="uq_user_group"),
+        db.Index("ix_group_memberships_group_id", "group_id"),
     )
 
     def __repr__(self):
@@ -16,6 +16,8 @@ class Like(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "post_id", name="uq_user_post_like"),
+        # The unique constraint leads with user_id; per-post lookups need their own index
+        db.Index("ix_likes_post_id", "post_id"),
     )
 
     def __repr__(self):
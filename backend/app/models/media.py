@@ -12,11 +12,34 @@ class Media(db.Model):
     uploader_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), nullable=True)  # Optional: media can be standalone or linked to posts
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Content-addressed storage; null for files stored before deduplication
+    blob_id = db.Column(db.Integer, db.ForeignKey("media_blobs.id", name="fk_media_blob_id"), nullable=True)
+    sha256 = db.Column(db.String(64), nullable=True)
+    # Probed from the file headers at upload time
+    size = db.Column(db.BigInteger, nullable=True)
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    duration = db.Column(db.Float, nullable=True)  # seconds, videos only
+    codec = db.Column(db.String(50), nullable=True)
+    # Resized copies and blurhash placeholder of images, set by the variants worker:
+    # {"width", "height", "placeholder", "images": [{"width", "height", "format", "url", "size"}]}
+    variants = db.Column(db.JSON(none_as_null=True), nullable=True)
+    optimized_at = db.Column(db.DateTime, nullable=True)  # set once variants exist; backfills skip these rows
+    # HLS ladder of videos, set by the video worker:
+    # {"master", "poster", "width", "height", "duration", "codec",
+    #  "renditions": [{"name", "width", "height", "bandwidth", "playlist"}]}
+    renditions = db.Column(db.JSON(none_as_null=True), nullable=True)
 
     # Relationships
     uploader = db.relationship("User", back_populates="media_files")
     post = db.relationship("Post", back_populates="media")
 
+    __table_args__ = (
+        db.Index("ix_media_post_id", "post_id"),
+        db.Index("ix_media_uploader_id", "uploader_id"),
+        db.Index("ix_media_blob_id", "blob_id"),
+    )
+
     def __repr__(self):
         return f"<Media {self.filename} ({self.media_type})>"
 
@@ -28,5 +51,13 @@ class Media(db.Model):
             "media_type": self.media_type,
             "uploader_id": self.uploader_id,
             "post_id": self.post_id,
+            "sha256": self.sha256,
+            "size": self.size,
+            "width": self.width,
+            "height": self.height,
+            "duration": self.duration,
+            "codec": self.codec,
+            "variants": self.variants,
+            "renditions": self.renditions,
             "uploaded_at": self.uploaded_at.isoformat(),
         }
@@ -0,0 +1,21 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class MediaBlob(db.Model):
+    """
+    A stored file, addressed by the SHA-256 of its content. Identical uploads
+    share one blob; `ref_count` is the number of Media rows pointing at it and
+    the file is removed only when the last of them is deleted.
+    """
+    __tablename__ = "media_blobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    path = db.Column(db.String(512), nullable=False)  # relative to the upload root
+    size = db.Column(db.BigInteger, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<MediaBlob {self.sha256[:12]} refs={self.ref_count}>"
@@ -0,0 +1,50 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class MediaProcessingJob(db.Model):
+    """
+    Background processing of one media file (one row per media and kind).
+    Workers move it queued -> running -> done, or back to queued while
+    retrying and finally to failed. `progress` runs from 0 to 1.
+    """
+    __tablename__ = "media_processing_jobs"
+
+    KIND_IMAGE_VARIANTS = "image_variants"
+    KIND_VIDEO_HLS = "video_hls"
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    id = db.Column(db.Integer, primary_key=True)
+    media_id = db.Column(db.Integer, db.ForeignKey("media.id", ondelete="CASCADE"), nullable=False)
+    kind = db.Column(db.String(30), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_QUEUED)
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("media_id", "kind", name="uq_media_processing_jobs_media_kind"),
+    )
+
+    def __repr__(self):
+        return f"<MediaProcessingJob media_id={self.media_id} {self.kind} {self.status}>"
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "attempts": self.attempts,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -26,6 +26,11 @@ class Notification(db.Model):
         back_populates="sent_notifications"
     )
 
+    __table_args__ = (
+        db.Index("ix_notifications_recipient_read_created", "recipient_id", "is_read", "created_at"),
+        db.Index("ix_notifications_recipient_created", "recipient_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<Notification id={self.id} recipient={self.recipient_id} type={self.notification_type}>"
 
@@ -0,0 +1,16 @@
+from app.extensions import db
+
+
+class NotificationCounter(db.Model):
+    """
+    Per-user unread notification count, maintained incrementally by
+    NotificationService so the badge count is a primary-key read.
+    Kept out of `users` so frequent increments don't contend with profile rows.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<NotificationCounter user_id={self.user_id} unread={self.unread_count}>"
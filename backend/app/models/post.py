@@ -13,6 +13,11 @@ class Post(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
+    # Denormalized counters, maintained with atomic UPDATEs by the like and
+    # comment services (see post_service.adjust_post_counter)
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    comments_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     # Relationships
     author = db.relationship("User", back_populates="posts")
     campus = db.relationship("Campus", back_populates="posts")
@@ -28,10 +33,27 @@ class Post(db.Model):
         "Media", back_populates="post", cascade="all, delete-orphan", lazy="dynamic"
     )
 
+    # Composite indexes for the feed filters; the trailing id keeps keyset
+    # pagination on (created_at, id) index-only
+    __table_args__ = (
+        db.Index("ix_posts_created_at_id", "created_at", "id"),
+        db.Index("ix_posts_campus_id_created_at", "campus_id", "created_at", "id"),
+        db.Index("ix_posts_user_id_created_at", "user_id", "created_at", "id"),
+        db.Index("ix_posts_group_id_created_at", "group_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<Post id={self.id} user_id={self.user_id} created_at={self.created_at}>"
 
-    def to_dict(self):
+    def to_dict(self, media=None):
+        """
+        Serialize the post. Pass preloaded media when rendering many posts at
+        once (see PostService.serialize_posts); otherwise it is loaded through
+        the dynamic relationship.
+        """
+        if media is None:
+            media = self.media
+
         return {
             "id": self.id,
             "content": self.content,
@@ -40,7 +62,7 @@ class Post(db.Model):
             "group_id": self.group_id,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "comments_count": self.comments.count(),
-            "likes_count": self.likes.count(),
-            "media": [m.to_dict() for m in self.media],
+            "comments_count": self.comments_count,
+            "likes_count": self.likes_count,
+            "media": [m.to_dict() for m in media],
         }
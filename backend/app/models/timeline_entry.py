@@ -0,0 +1,25 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class TimelineEntry(db.Model):
+    """
+    A post materialized into a follower's home timeline (fan-out-on-write).
+    `created_at` mirrors the post's creation time so timelines can be
+    paginated on (created_at, post_id) without touching the posts table.
+    """
+    __tablename__ = "timeline_entries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "post_id", name="uq_timeline_user_post"),
+        db.Index("ix_timeline_entries_user_created", "user_id", "created_at", "post_id"),
+    )
+
+    def __repr__(self):
+        return f"<TimelineEntry user_id={self.user_id} post_id={self.post_id}>"
@@ -0,0 +1,49 @@
+from app.extensions import db
+from datetime import datetime
+
+
+class UploadSession(db.Model):
+    """
+    State of a chunked, resumable upload. Chunks are streamed into
+    `partial_path` and `received` is the committed offset the next chunk
+    must start at, so a client can resume after a disconnect.
+    """
+    __tablename__ = "upload_sessions"
+
+    STATUS_UPLOADING = "uploading"
+    STATUS_COMPLETE = "complete"
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex, used in URLs
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    media_type = db.Column(db.String(50), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id", ondelete="SET NULL"), nullable=True)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received = db.Column(db.BigInteger, nullable=False, default=0)
+    sha256 = db.Column(db.String(64), nullable=True)  # expected checksum, verified on completion
+    partial_path = db.Column(db.String(512), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_UPLOADING)
+    media_id = db.Column(db.Integer, db.ForeignKey("media.id", ondelete="SET NULL"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Stale-session clean-up scans by status and age
+        db.Index("ix_upload_sessions_status_updated", "status", "updated_at"),
+    )
+
+    def __repr__(self):
+        return f"<UploadSession {self.id} {self.received}/{self.total_size}>"
+
+    def to_dict(self):
+        return {
+            "upload_id": self.id,
+            "filename": self.filename,
+            "media_type": self.media_type,
+            "post_id": self.post_id,
+            "size": self.total_size,
+            "offset": self.received,
+            "status": self.status,
+            "media_id": self.media_id,
+            "created_at": self.created_at.isoformat(),
+        }
@@ -17,6 +17,10 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
+    # Denormalized follower count; decides fan-out-on-write vs fan-out-on-read
+    # for the home timeline (see TimelineService)
+    followers_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     # Relationships (simple ones declared here)
     campus = db.relationship("Campus", back_populates="users")
     comments = db.relationship("Comment", back_populates="user", lazy="dynamic")
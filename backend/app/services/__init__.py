@@ -19,6 +19,9 @@ from .media_service import MediaService
 from .event_service import EventService
 from .notification_service import NotificationService
 from .chat_service import ChatService
+from .timeline_service import TimelineService
+from .search_service import SearchService
+from .follow_service import FollowService
 
 __all__ = [
     "AuthService",
@@ -30,4 +33,7 @@ __all__ = [
     "EventService",
     "NotificationService",
     "ChatService",
+    "TimelineService",
+    "SearchService",
+    "FollowService",
 ]
@@ -2,7 +2,9 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from flask import current_app
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
-from app.extensions import db
+from app.extensions import db, cache
+from app.services.search_service import search_service
+from app.services.typeahead_service import typeahead_service
 from app.utils import jwt_utils
 from datetime import datetime
 
@@ -25,10 +27,13 @@ class AuthService:
         )
         try:
             db.session.add(new_user)
+            db.session.flush()
+            search_service.index(new_user)
             db.session.commit()
         except IntegrityError:
             db.session.rollback()
             raise ValueError("Username or email already exists")
+        typeahead_service.user_changed(new_user)
 
         return {
             "message": "User registered successfully",
@@ -88,6 +93,7 @@ class AuthService:
 
         user.password_hash = generate_password_hash(new_password)
         db.session.commit()
+        cache.delete_entity(User, user.id)
 
         return {
             "message": "Password reset successful"
@@ -103,6 +109,7 @@ class AuthService:
 
         user.password_hash = generate_password_hash(new_password)
         db.session.commit()
+        cache.delete_entity(User, user_id)
 
         return {
             "message": "Password updated successfully"
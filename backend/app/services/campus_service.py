@@ -1,4 +1,4 @@
-from app import db
+from app.extensions import db, cache
 from app.models import Campus
 
 
@@ -9,7 +9,7 @@ class CampusService:
 
     @staticmethod
     def get_campus_by_id(campus_id):
-        return Campus.query.get(campus_id)
+        return cache.get_entity(Campus, campus_id)
 
     @staticmethod
     def create_campus(name, location, description=None):
@@ -27,6 +27,7 @@ class CampusService:
         campus.location = location
         campus.description = description
         db.session.commit()
+        cache.delete_entity(Campus, campus_id)
         return campus
 
     @staticmethod
@@ -35,3 +36,4 @@ class CampusService:
         if campus:
             db.session.delete(campus)
             db.session.commit()
+            cache.delete_entity(Campus, campus_id)
@@ -1,60 +1,125 @@
 from datetime import datetime
-from app.extensions import db
+from app.extensions import db, cache, pubsub
 from app.models.chat_message import ChatMessage
+from app.models.conversation import Conversation
 from app.models.user import User
-from sqlalchemy import or_, and_
+from app.utils.db_helpers import insert_or_ignore
+from app.utils.pagination import apply_keyset_seek, decode_cursor, encode_cursor, paginate_query
+from sqlalchemy import or_, and_, case, delete, func, select, update
 
 class ChatService:
+    # Characters of the latest message kept on the conversation summary
+    PREVIEW_LENGTH = 100
+
     def send_message(self, sender_id: int, recipient_id: int, content: str) -> dict:
         """
         Send a message from one user to another.
         """
-        sender = User.query.get(sender_id)
-        recipient = User.query.get(recipient_id)
+        sender = cache.get_entity(User, sender_id)
+        recipient = cache.get_entity(User, recipient_id)
 
         if not sender or not recipient:
             raise ValueError("Sender or recipient does not exist.")
 
         message = ChatMessage(
             sender_id=sender_id,
-            recipient_id=recipient_id,
+            receiver_id=recipient_id,
             content=content,
             timestamp=datetime.utcnow(),
             is_read=False
         )
 
         db.session.add(message)
+        db.session.flush()
+        self._ensure_conversation(sender_id, recipient_id)
+        self._adjust_unread(reader_id=recipient_id, other_id=sender_id, delta=1)
+        self._set_last_message(sender_id, recipient_id, message)
         db.session.commit()
 
+        # Push to the recipient's open streams so clients don't poll
+        pubsub.publish(self.user_channel(recipient_id), {
+            "type": "message",
+            "message": self._serialize_message(message)
+        })
+
         return {
             "message_id": message.id,
             "timestamp": message.timestamp.isoformat(),
             "status": "sent"
         }
 
-    def get_conversation(self, user1_id: int, user2_id: int, limit: int = 50, offset: int = 0) -> list:
+    def get_conversation(self, user1_id: int, user2_id: int, limit: int = 50, offset: int = 0,
+                         cursor: str = None):
         """
         Fetch recent messages between two users, ordered chronologically.
+
+        With a cursor (empty string for the most recent page) keyset pagination
+        on (timestamp, id) is used to walk back through history, returning
+        {"items": [...], "pagination": {..., "next_cursor": ...}}.
         """
-        messages = ChatMessage.query.filter(
+        query = ChatMessage.query.filter(
             or_(
-                and_(ChatMessage.sender_id == user1_id, ChatMessage.recipient_id == user2_id),
-                and_(ChatMessage.sender_id == user2_id, ChatMessage.recipient_id == user1_id)
+                and_(ChatMessage.sender_id == user1_id, ChatMessage.receiver_id == user2_id),
+                and_(ChatMessage.sender_id == user2_id, ChatMessage.receiver_id == user1_id)
             )
-        ).order_by(ChatMessage.timestamp.desc()) \
-         .limit(limit).offset(offset).all()
-
-        return [
-            {
-                "id": msg.id,
-                "sender_id": msg.sender_id,
-                "recipient_id": msg.recipient_id,
-                "content": msg.content,
-                "timestamp": msg.timestamp.isoformat(),
-                "is_read": msg.is_read
-            }
-            for msg in reversed(messages)
-        ]
+        )
+
+        if cursor is not None:
+            return paginate_query(
+                query, per_page=limit, cursor=cursor,
+                keyset=(ChatMessage.timestamp, ChatMessage.id),
+                # Pages are fetched newest first but returned oldest first
+                batch_serializer=lambda messages: [self._serialize_message(m) for m in reversed(messages)]
+            )
+
+        messages = query.order_by(ChatMessage.timestamp.desc()) \
+            .limit(limit).offset(offset).all()
+
+        return [self._serialize_message(msg) for msg in reversed(messages)]
+
+    @staticmethod
+    def user_channel(user_id: int) -> str:
+        """
+        Pub/sub channel carrying real-time chat events for a user.
+        """
+        return f"chat:user:{user_id}"
+
+    def get_messages_since(self, user_id: int, after_id: int, limit: int = 100) -> list:
+        """
+        Messages received by a user with id > after_id, oldest first. Used to
+        replay what a stream missed while the client was disconnected.
+        """
+        messages = ChatMessage.query.filter(ChatMessage.receiver_id == user_id, ChatMessage.id > after_id) \
+            .order_by(ChatMessage.id.asc()).limit(limit).all()
+        return [self._serialize_message(msg) for msg in messages]
+
+    def get_missed_messages(self, user_id: int, after_id: int, max_messages: int = 1000) -> tuple:
+        """
+        Everything a reconnecting stream missed: pages through
+        `get_messages_since` until it runs dry, up to `max_messages`.
+
+        Returns:
+            tuple: (messages oldest first, True if more were left unreplayed)
+        """
+        messages = []
+        while len(messages) < max_messages:
+            page = self.get_messages_since(user_id, after_id, limit=min(100, max_messages - len(messages)))
+            if not page:
+                return messages, False
+            messages += page
+            after_id = page[-1]["id"]
+        return messages, bool(self.get_messages_since(user_id, after_id, limit=1))
+
+    @staticmethod
+    def _serialize_message(msg: ChatMessage) -> dict:
+        return {
+            "id": msg.id,
+            "sender_id": msg.sender_id,
+            "recipient_id": msg.receiver_id,
+            "content": msg.content,
+            "timestamp": msg.timestamp.isoformat(),
+            "is_read": msg.is_read
+        }
 
     def mark_as_read(self, message_id: int, reader_id: int) -> dict:
         """
@@ -64,10 +129,18 @@ class ChatService:
         if not message:
             raise ValueError("Message not found.")
 
-        if message.recipient_id != reader_id:
+        if message.receiver_id != reader_id:
             raise PermissionError("You can only mark your own received messages as read.")
 
-        message.is_read = True
+        # Conditional UPDATE: only the request that flips it lowers the unread count
+        result = db.session.execute(
+            update(ChatMessage)
+            .where(ChatMessage.id == message_id, ChatMessage.is_read.is_(False))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            self._adjust_unread(reader_id=reader_id, other_id=message.sender_id, delta=-result.rowcount)
         db.session.commit()
 
         return {
@@ -86,10 +159,215 @@ class ChatService:
         if message.sender_id != requester_id:
             raise PermissionError("Only the sender can delete this message.")
 
-        db.session.delete(message)
+        sender_id, receiver_id = message.sender_id, message.receiver_id
+        # Delete it while still unread first, so a concurrent read or delete
+        # can't make both requests lower the unread count
+        stmt = delete(ChatMessage).where(ChatMessage.id == message_id) \
+            .execution_options(synchronize_session=False)
+        unread = db.session.execute(stmt.where(ChatMessage.is_read.is_(False))).rowcount
+        if unread:
+            self._adjust_unread(reader_id=receiver_id, other_id=sender_id, delta=-unread)
+        else:
+            db.session.execute(stmt)
+        db.session.expunge(message)
+        self._refresh_last_message(sender_id, receiver_id, deleted_id=message_id)
         db.session.commit()
 
         return {
             "message": "Message deleted successfully.",
             "message_id": message_id
         }
+
+    def mark_conversation_read(self, reader_id: int, other_id: int) -> int:
+        """
+        Mark every message from `other_id` to `reader_id` as read with one
+        UPDATE and lower the reader's unread count for the conversation by
+        the rows it changed (a message arriving meanwhile stays counted).
+        Returns the number of messages updated.
+        """
+        result = db.session.execute(
+            update(ChatMessage)
+            .where(ChatMessage.sender_id == other_id,
+                   ChatMessage.receiver_id == reader_id,
+                   ChatMessage.is_read.is_(False))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            self._adjust_unread(reader_id=reader_id, other_id=other_id, delta=-result.rowcount)
+        db.session.commit()
+        return result.rowcount
+
+    def reconcile_unread_counts(self, batch_size: int = 1000) -> int:
+        """
+        Recompute each side's unread count on `conversations` from the
+        messages table in conversation id batches, rewriting only drifted
+        rows. Returns the number of conversations corrected.
+        """
+        def unread_total(reader_column, sender_column):
+            return select(func.count(ChatMessage.id)).where(
+                ChatMessage.receiver_id == reader_column,
+                ChatMessage.sender_id == sender_column,
+                ChatMessage.is_read.is_(False)
+            ).scalar_subquery()
+
+        unread_a = unread_total(Conversation.user_a_id, Conversation.user_b_id)
+        unread_b = unread_total(Conversation.user_b_id, Conversation.user_a_id)
+
+        max_id = db.session.query(func.max(Conversation.id)).scalar() or 0
+        corrected = 0
+        for start in range(0, max_id, batch_size):
+            result = db.session.execute(
+                update(Conversation)
+                .where(Conversation.id > start, Conversation.id <= start + batch_size)
+                .where(or_(Conversation.unread_a != unread_a, Conversation.unread_b != unread_b))
+                .values(unread_a=unread_a, unread_b=unread_b)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            corrected += result.rowcount
+        return corrected
+
+    def get_unread_counts(self, user_id: int) -> dict:
+        """
+        Unread chat messages for a user, total and per conversation, read from
+        the maintained counters on `conversations`.
+        """
+        as_a = db.session.query(Conversation.user_b_id, Conversation.unread_a) \
+            .filter(Conversation.user_a_id == user_id, Conversation.unread_a > 0).all()
+        as_b = db.session.query(Conversation.user_a_id, Conversation.unread_b) \
+            .filter(Conversation.user_b_id == user_id, Conversation.unread_b > 0).all()
+
+        conversations = [{"user_id": other_id, "unread": unread} for other_id, unread in as_a + as_b]
+        return {
+            "total": sum(c["unread"] for c in conversations),
+            "conversations": conversations
+        }
+
+    def get_recent_conversations(self, user_id: int, limit: int = 20, cursor: str = None) -> dict:
+        """
+        The user's conversations ordered by last activity, newest first, with
+        the latest message preview and unread count. Keyset-paginated on
+        (last_message_at, id); an empty/None cursor returns the first page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        position = decode_cursor(cursor)
+
+        # The user can be on either side of the pair; seek both indexes and merge
+        conversations = []
+        for side_column in (Conversation.user_a_id, Conversation.user_b_id):
+            query = Conversation.query.filter(side_column == user_id,
+                                              Conversation.last_message_at.isnot(None))
+            query = apply_keyset_seek(query, Conversation.last_message_at, Conversation.id, position)
+            conversations += query.order_by(Conversation.last_message_at.desc(), Conversation.id.desc()) \
+                .limit(limit + 1).all()
+
+        conversations.sort(key=lambda c: (c.last_message_at, c.id), reverse=True)
+        has_next = len(conversations) > limit
+        conversations = conversations[:limit]
+
+        other_ids = [c.user_b_id if c.user_a_id == user_id else c.user_a_id for c in conversations]
+        users = {u.id: u for u in User.query.filter(User.id.in_(other_ids)).all()} if other_ids else {}
+
+        items = []
+        for conversation, other_id in zip(conversations, other_ids):
+            other = users.get(other_id)
+            items.append({
+                "user_id": other_id,
+                "username": other.username if other else None,
+                "profile_image_url": other.profile_image_url if other else None,
+                "last_message": {
+                    "id": conversation.last_message_id,
+                    "preview": conversation.last_message_preview,
+                    "sender_id": conversation.last_sender_id,
+                    "timestamp": conversation.last_message_at.isoformat()
+                },
+                "unread": conversation.unread_a if conversation.user_a_id == user_id else conversation.unread_b
+            })
+
+        next_cursor = None
+        if has_next:
+            last = conversations[-1]
+            next_cursor = encode_cursor(last.last_message_at, last.id)
+
+        return {
+            "items": items,
+            "pagination": {
+                "per_page": limit,
+                "has_next": has_next,
+                "next_cursor": next_cursor
+            }
+        }
+
+    @staticmethod
+    def _ensure_conversation(user1_id: int, user2_id: int) -> None:
+        user_a_id, user_b_id = Conversation.ordered_pair(user1_id, user2_id)
+        db.session.execute(insert_or_ignore(Conversation), [{
+            "user_a_id": user_a_id,
+            "user_b_id": user_b_id,
+            "unread_a": 0,
+            "unread_b": 0,
+            "created_at": datetime.utcnow()
+        }])
+
+    @staticmethod
+    def _adjust_unread(reader_id: int, other_id: int, delta: int) -> None:
+        """
+        Atomically change the reader's unread count on the conversation
+        (never below zero). Runs inside the caller's transaction.
+        """
+        user_a_id, user_b_id = Conversation.ordered_pair(reader_id, other_id)
+        column = Conversation.unread_a if reader_id == user_a_id else Conversation.unread_b
+        db.session.execute(
+            update(Conversation)
+            .where(Conversation.user_a_id == user_a_id, Conversation.user_b_id == user_b_id)
+            .values({column: case((column + delta < 0, 0), else_=column + delta)})
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    def _set_last_message(cls, user1_id: int, user2_id: int, message, only_if_newer: bool = True) -> None:
+        """
+        Point the conversation summary at `message` (or clear it when None).
+        With `only_if_newer`, a message never replaces a later one written by
+        a concurrent request.
+        """
+        user_a_id, user_b_id = Conversation.ordered_pair(user1_id, user2_id)
+        stmt = update(Conversation).where(Conversation.user_a_id == user_a_id,
+                                          Conversation.user_b_id == user_b_id)
+        if message is None:
+            values = {"last_message_id": None, "last_message_preview": None,
+                      "last_message_at": None, "last_sender_id": None}
+        else:
+            if only_if_newer:
+                stmt = stmt.where(or_(Conversation.last_message_at.is_(None),
+                                      Conversation.last_message_at <= message.timestamp))
+            values = {
+                "last_message_id": message.id,
+                "last_message_preview": message.content[:cls.PREVIEW_LENGTH],
+                "last_message_at": message.timestamp,
+                "last_sender_id": message.sender_id
+            }
+        db.session.execute(stmt.values(**values).execution_options(synchronize_session=False))
+
+    def _refresh_last_message(self, user1_id: int, user2_id: int, deleted_id: int) -> None:
+        """
+        After deleting `deleted_id`, fall back to the previous message if the
+        deleted one was the conversation's latest.
+        """
+        user_a_id, user_b_id = Conversation.ordered_pair(user1_id, user2_id)
+        # Column query so a stale Conversation in the identity map isn't trusted
+        last_message_id = db.session.query(Conversation.last_message_id) \
+            .filter_by(user_a_id=user_a_id, user_b_id=user_b_id).scalar()
+        if last_message_id not in (deleted_id, None):
+            return
+
+        previous = ChatMessage.query.filter(
+            or_(
+                and_(ChatMessage.sender_id == user1_id, ChatMessage.receiver_id == user2_id),
+                and_(ChatMessage.sender_id == user2_id, ChatMessage.receiver_id == user1_id)
+            )
+        ).order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc()).first()
+        self._set_last_message(user1_id, user2_id, previous, only_if_newer=False)
@@ -1,11 +1,13 @@
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from app.extensions import db
+from app.extensions import db, cache
 from app.models.comment import Comment
 from app.models.post import Post
 from app.models.user import User
+from app.services.post_service import adjust_post_counter
+from app.utils.pagination import paginate_query
 
 class CommentService:
     @staticmethod
@@ -13,18 +15,19 @@ class CommentService:
         """
         Create a new comment for a post.
         """
-        post = Post.query.get(post_id)
+        post = cache.get_entity(Post, post_id)
         if not post:
             raise ValueError("Post not found")
         
         comment = Comment(
-            author_id=author_id,
+            user_id=author_id,
             post_id=post_id,
             content=content,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow()
         )
         db.session.add(comment)
+        adjust_post_counter(post_id, "comments_count", 1)
         db.session.commit()
         return comment
 
@@ -33,8 +36,18 @@ class CommentService:
         return Comment.query.get(comment_id)
 
     @staticmethod
-    def get_comments_by_post(post_id: int, limit: int = 20, offset: int = 0) -> List[Comment]:
-        return Comment.query.filter_by(post_id=post_id).order_by(Comment.created_at.desc()).limit(limit).offset(offset).all()
+    def get_comments_by_post(post_id: int, limit: int = 20, offset: int = 0,
+                             cursor: Optional[str] = None) -> Union[List[Comment], Dict[str, Any]]:
+        """
+        Fetch comments on a post, newest first. Passing a cursor (empty string
+        for the first page) switches to keyset pagination and returns
+        {"items": [...], "pagination": {..., "next_cursor": ...}}.
+        """
+        query = Comment.query.filter_by(post_id=post_id)
+        if cursor is not None:
+            return paginate_query(query, per_page=limit, cursor=cursor,
+                                  keyset=(Comment.created_at, Comment.id))
+        return query.order_by(Comment.created_at.desc()).limit(limit).offset(offset).all()
 
     @staticmethod
     def update_comment(comment_id: int, author_id: int, content: str) -> Optional[Comment]:
@@ -54,8 +67,10 @@ class CommentService:
         comment = Comment.query.get(comment_id)
         if not comment:
             raise ValueError("Comment not found")
-        if comment.author_id != author_id:
+        if comment.user_id != author_id:
             raise PermissionError("Unauthorized to delete this comment")
 
+        post_id = comment.post_id
         db.session.delete(comment)
+        adjust_post_counter(post_id, "comments_count", -1)
         db.session.commit()
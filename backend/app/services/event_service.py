@@ -2,6 +2,7 @@ from datetime import datetime
 from app.extensions import db
 from app.models.event import Event
 from app.models.user import User
+from app.services.search_service import search_service
 from sqlalchemy.exc import IntegrityError
 
 
@@ -27,6 +28,8 @@ class EventService:
         )
 
         db.session.add(event)
+        db.session.flush()
+        search_service.index(event)
         db.session.commit()
 
         return event  # Return ORM instance
@@ -68,6 +71,7 @@ class EventService:
             if key in kwargs:
                 setattr(event, key, kwargs[key])
 
+        search_service.index(event)
         db.session.commit()
         return event  # Return updated ORM instance
 
@@ -81,5 +85,6 @@ class EventService:
         if event.created_by != user_id:
             raise PermissionError("Only the event creator can delete this event.")
 
+        search_service.remove(event)
         db.session.delete(event)
         db.session.commit()
@@ -0,0 +1,260 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import current_app
+from sqlalchemy import case, update
+
+from app.extensions import db, cache
+from app.models.follow import Follow
+from app.models.user import User
+from app.services.timeline_service import timeline_service
+from app.utils.db_helpers import delete_returning, insert_or_ignore_returning
+from app.utils.pagination import paginate_query
+
+# Most ids accepted by one bulk call
+MAX_BULK_IDS = 100
+
+
+def following_cache_key(user_id: int) -> str:
+    return f"follows:following:{user_id}"
+
+
+class FollowService:
+    """
+    The follow graph: bulk follow/unfollow, follower and following lists,
+    batched relationship checks, mutuals and "people you may know".
+
+    Each user's following list (their adjacency list) is cached as a set, so
+    relationship checks, mutuals and suggestions are set operations in
+    memory instead of one query per user. Follow writes drop the entries
+    they change.
+    """
+
+    # --------------------------------------
+    # Adjacency lists
+    # --------------------------------------
+
+    def following_map(self, user_ids: Iterable[int]) -> Dict[int, frozenset]:
+        """
+        Following sets for several users: cache hits first, then a single
+        query for all the misses.
+        """
+        result, missing = {}, []
+        for user_id in set(user_ids):
+            following = cache.get(following_cache_key(user_id))
+            if following is None:
+                missing.append(user_id)
+            else:
+                result[user_id] = following
+
+        if missing:
+            loaded = defaultdict(set)
+            rows = db.session.query(Follow.follower_id, Follow.followed_id).filter(Follow.follower_id.in_(missing))
+            for follower_id, followed_id in rows:
+                loaded[follower_id].add(followed_id)
+            ttl = current_app.config.get("FOLLOW_GRAPH_CACHE_TTL", 300)
+            for user_id in missing:
+                result[user_id] = frozenset(loaded[user_id])
+                cache.set(following_cache_key(user_id), result[user_id], ttl=ttl)
+        return result
+
+    def following_ids(self, user_id: int) -> frozenset:
+        return self.following_map([user_id])[user_id]
+
+    def _invalidate(self, follower_id: int, user_ids: List[int]) -> None:
+        cache.delete(following_cache_key(follower_id))
+        # Cached users carry followers_count
+        cache.delete_entity(User, *user_ids)
+
+    # --------------------------------------
+    # Writes
+    # --------------------------------------
+
+    @staticmethod
+    def _normalize_ids(user_ids) -> List[int]:
+        if not isinstance(user_ids, (list, tuple)) or not user_ids:
+            raise ValueError("user_ids must be a non-empty list.")
+        if len(user_ids) > MAX_BULK_IDS:
+            raise ValueError(f"At most {MAX_BULK_IDS} user ids per request.")
+        try:
+            return list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        except (TypeError, ValueError):
+            raise ValueError("user_ids must be integers.")
+
+    @staticmethod
+    def _adjust_followers_count(user_ids: List[int], delta: int) -> None:
+        column = User.followers_count
+        db.session.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values({
+                column: case((column + delta < 0, 0), else_=column + delta),
+                # Follower changes are not profile edits; keep onupdate from touching updated_at
+                User.updated_at: User.updated_at,
+            })
+            .execution_options(synchronize_session=False)
+        )
+
+    def follow(self, follower_id: int, user_ids) -> Dict[str, List[int]]:
+        """
+        Follow several users at once, in one transaction: the follow rows,
+        their followers_count and the follower's timeline backfill.
+
+        Returns:
+            dict: {"followed": newly followed ids, "already_following": [...]}
+
+        Raises:
+            ValueError: For an invalid list, unknown users or following yourself.
+        """
+        ids = self._normalize_ids(user_ids)
+        if follower_id in ids:
+            raise ValueError("You cannot follow yourself.")
+        unknown = set(ids) - {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(ids))}
+        if unknown:
+            raise ValueError(f"User(s) not found: {', '.join(map(str, sorted(unknown)))}")
+
+        already = {
+            followed_id for (followed_id,) in
+            db.session.query(Follow.followed_id).filter(Follow.follower_id == follower_id, Follow.followed_id.in_(ids))
+        }
+        new_ids = [user_id for user_id in ids if user_id not in already]
+        if new_ids:
+            now = datetime.utcnow()
+            # Only rows this statement inserted are counted, so a concurrent
+            # identical follow can't increment followers_count twice
+            inserted = {followed_id for (followed_id,) in insert_or_ignore_returning(Follow, [
+                {"follower_id": follower_id, "followed_id": user_id, "created_at": now} for user_id in new_ids
+            ], Follow.followed_id)}
+            new_ids = [user_id for user_id in new_ids if user_id in inserted]
+        if new_ids:
+            self._adjust_followers_count(new_ids, 1)
+            timeline_service.add_authors(follower_id, new_ids)
+            db.session.commit()
+            self._invalidate(follower_id, new_ids)
+
+        return {"followed": new_ids, "already_following": [user_id for user_id in ids if user_id not in new_ids]}
+
+    def unfollow(self, follower_id: int, user_ids) -> Dict[str, List[int]]:
+        """
+        Unfollow several users at once; their posts leave the follower's timeline.
+
+        Returns:
+            dict: {"unfollowed": [...], "not_following": [...]}
+        """
+        ids = self._normalize_ids(user_ids)
+        # Only rows this statement deleted are counted, so a concurrent
+        # unfollow of the same users can't decrement followers_count twice
+        deleted = {followed_id for (followed_id,) in delete_returning(
+            Follow, [Follow.follower_id == follower_id, Follow.followed_id.in_(ids)], Follow.followed_id
+        )}
+        removed = [user_id for user_id in ids if user_id in deleted]
+        if removed:
+            self._adjust_followers_count(removed, -1)
+            timeline_service.remove_authors(follower_id, removed)
+            db.session.commit()
+            self._invalidate(follower_id, removed)
+
+        return {"unfollowed": removed, "not_following": [user_id for user_id in ids if user_id not in deleted]}
+
+    # --------------------------------------
+    # Reads
+    # --------------------------------------
+
+    @staticmethod
+    def _require_user(user_id: int) -> None:
+        if not cache.get_entity(User, user_id):
+            raise ValueError("User not found.")
+
+    @staticmethod
+    def _serialize_follows(follows: List[Follow], user_column: str) -> List[Dict[str, Any]]:
+        user_ids = [getattr(follow, user_column) for follow in follows]
+        users = {user.id: user for user in User.query.filter(User.id.in_(user_ids)).all()} if user_ids else {}
+        return [
+            dict(users[getattr(follow, user_column)].to_dict(), followed_at=follow.created_at.isoformat())
+            for follow in follows if getattr(follow, user_column) in users
+        ]
+
+    def get_followers(self, user_id: int, cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """
+        A user's followers, most recent first, with keyset pagination
+        ({"items", "pagination": {..., "next_cursor"}}).
+
+        Raises:
+            ValueError: If the user does not exist or the cursor is malformed.
+        """
+        self._require_user(user_id)
+        return paginate_query(Follow.query.filter(Follow.followed_id == user_id), per_page=limit,
+                              cursor=cursor, keyset=(Follow.created_at, Follow.id),
+                              batch_serializer=lambda follows: self._serialize_follows(follows, "follower_id"))
+
+    def get_following(self, user_id: int, cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """
+        Users a user follows, most recently followed first; paginated like get_followers.
+        """
+        self._require_user(user_id)
+        return paginate_query(Follow.query.filter(Follow.follower_id == user_id), per_page=limit,
+                              cursor=cursor, keyset=(Follow.created_at, Follow.id),
+                              batch_serializer=lambda follows: self._serialize_follows(follows, "followed_id"))
+
+    def is_following(self, follower_id: int, user_ids) -> Dict[int, bool]:
+        """
+        Whether `follower_id` follows each of `user_ids`, from the cached following set.
+        """
+        following = self.following_ids(follower_id)
+        return {user_id: user_id in following for user_id in self._normalize_ids(user_ids)}
+
+    def _users_by_id(self, user_ids: List[int]) -> Dict[int, User]:
+        if not user_ids:
+            return {}
+        return {user.id: user for user in User.query.filter(User.id.in_(user_ids)).all()}
+
+    def get_mutual_following(self, user_id: int, other_id: int, limit: int = 20) -> Dict[str, Any]:
+        """
+        People both users follow (mutual connections), as the intersection of
+        their following sets.
+        """
+        self._require_user(other_id)
+        graph = self.following_map([user_id, other_id])
+        mutual = graph[user_id] & graph[other_id]
+
+        ids = sorted(mutual)[:limit]
+        users = self._users_by_id(ids)
+        return {"count": len(mutual), "users": [users[i].to_dict() for i in ids if i in users]}
+
+    def suggest_users(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        "People you may know": users followed by the people `user_id` follows
+        (friends of friends), ranked by how many of them follow each one. At
+        most FOLLOW_SUGGESTION_MAX_SOURCES followees are expanded, with their
+        adjacency lists fetched in one batch.
+        """
+        following = self.following_ids(user_id)
+        max_sources = current_app.config.get("FOLLOW_SUGGESTION_MAX_SOURCES", 200)
+        sources = sorted(following)[:max_sources]
+
+        mutual_counts = Counter()
+        for followed in self.following_map(sources).values():
+            mutual_counts.update(followed - following - {user_id})
+
+        top = mutual_counts.most_common(limit)
+        users = self._users_by_id([candidate for candidate, _ in top])
+        return [
+            dict(users[candidate].to_dict(), mutual_count=count)
+            for candidate, count in top if candidate in users
+        ]
+
+
+# --------------------------------------
+# Instance and Wrapper Functions
+# --------------------------------------
+
+follow_service = FollowService()
+
+
+def follow_users(follower_id, user_ids):
+    return follow_service.follow(follower_id, user_ids)
+
+
+def unfollow_users(follower_id, user_ids):
+    return follow_service.unfollow(follower_id, user_ids)
@@ -1,4 +1,5 @@
-from app.extensions import db
+from app.extensions import db, cache
+from app.services.search_service import search_service
 from app.models.group import Group
 from app.models.group_membership import GroupMembership
 from app.models.user import User
@@ -20,6 +21,7 @@ class GroupService:
         )
         db.session.add(group)
         db.session.flush()
+        search_service.index(group)
 
         membership = GroupMembership(
             user_id=creator_id,
@@ -42,7 +44,7 @@ class GroupService:
 
     @staticmethod
     def get_group_by_id(group_id):
-        return Group.query.get(group_id)
+        return cache.get_entity(Group, group_id)
 
     @staticmethod
     def get_user_groups(user_id):
@@ -59,7 +61,9 @@ class GroupService:
             group.name = name
         if description:
             group.description = description
+        search_service.index(group)
         db.session.commit()
+        cache.delete_entity(Group, group_id)
         return group
 
     @staticmethod
@@ -67,8 +71,10 @@ class GroupService:
         group = Group.query.get(group_id)
         if not group:
             raise ValueError("Group not found.")
+        search_service.remove(group)
         db.session.delete(group)
         db.session.commit()
+        cache.delete_entity(Group, group_id)
 
     @staticmethod
     def join_group(group_id, user_id):
@@ -1,6 +1,10 @@
 
+from sqlalchemy.exc import IntegrityError
+
 from app.extensions import db
 from app.models.like import Like
+from app.models.post import Post
+from app.services.post_service import adjust_post_counter
 
 def like_post(post_id, user_id):
     existing_like = Like.query.filter_by(post_id=post_id, user_id=user_id).first()
@@ -8,19 +12,36 @@ def like_post(post_id, user_id):
         return False
     new_like = Like(post_id=post_id, user_id=user_id)
     db.session.add(new_like)
-    db.session.commit()
+    adjust_post_counter(post_id, "likes_count", 1)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent like from the same user
+        db.session.rollback()
+        return False
     return True
 
 def unlike_post(post_id, user_id):
-    like = Like.query.filter_by(post_id=post_id, user_id=user_id).first()
-    if not like:
+    deleted = Like.query.filter_by(post_id=post_id, user_id=user_id).delete(synchronize_session=False)
+    if not deleted:
         return False
-    db.session.delete(like)
+    adjust_post_counter(post_id, "likes_count", -deleted)
     db.session.commit()
     return True
 
 def get_like_count(post_id):
-    return Like.query.filter_by(post_id=post_id).count()
+    count = db.session.query(Post.likes_count).filter(Post.id == post_id).scalar()
+    return count or 0
 
 def has_liked_post(post_id, user_id):
     return Like.query.filter_by(post_id=post_id, user_id=user_id).first() is not None
+
+def get_liked_post_ids(post_ids, user_id):
+    """
+    The subset of `post_ids` the user has liked, in one query (served by the
+    (user_id, post_id) unique constraint).
+    """
+    if not post_ids:
+        return set()
+    rows = db.session.query(Like.post_id).filter(Like.user_id == user_id, Like.post_id.in_(post_ids))
+    return {post_id for (post_id,) in rows}
@@ -1,11 +1,51 @@
 import os
+import re
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
 from werkzeug.utils import secure_filename
-from app.extensions import db
+from flask import current_app
+from sqlalchemy import delete, update
+from app.extensions import db, storage
 from app.models.media import Media
-from app.utils.file_storage import save_file_to_storage as save_file, delete_file
-from datetime import datetime
+from app.models.media_blob import MediaBlob
+from app.models.media_processing_job import MediaProcessingJob
+from app.models.upload_session import UploadSession
+from app.utils.db_helpers import insert_or_ignore
+from app.utils.file_storage import (
+    delete_file, create_partial_file, write_chunk, file_sha256, delete_partial_file,
+    store_partial_file, get_partial_file_path, blob_path, hash_stream, save_stream
+)
+from app.utils.image_optimizer import create_image_variants
+from app.utils.media_probe import probe_image, probe_media, probe_video_file
+from app.utils.video_optimizer import DEFAULT_HLS_LADDER, transcode_video_hls
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'mp4', 'mov', 'avi', 'mkv'}
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+VIDEO_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv'}
+
+
+class UploadOffsetConflict(ValueError):
+    """
+    A chunk was sent for an offset other than the upload's current one
+    (e.g. a retried chunk that already landed). Carries the offset to resume from.
+    """
+
+    def __init__(self, expected_offset: int):
+        super().__init__(f"Upload offset mismatch; resume from offset {expected_offset}.")
+        self.expected_offset = expected_offset
+
+
+# Media columns filled in by the upload-time probe
+PROBE_FIELDS = ('width', 'height', 'duration', 'codec')
+
+# Background job that processes each media type
+PROCESSING_JOB_KINDS = {
+    'image': MediaProcessingJob.KIND_IMAGE_VARIANTS,
+    'video': MediaProcessingJob.KIND_VIDEO_HLS,
+}
+
 
 class MediaService:
 
@@ -13,7 +53,27 @@ class MediaService:
         return '.' in filename and \
                filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-    def upload_media(self, user_id: int, file_storage, media_type: str = None) -> dict:
+    def detect_media_type(self, filename: str, media_type: str = None) -> str:
+        """
+        The media type implied by the file extension. A client-supplied
+        `media_type` is only checked against it, never trusted: it decides
+        probing, processing and storage, so it must be one of ours.
+        """
+        ext = filename.rsplit('.', 1)[1].lower()
+        if ext in IMAGE_EXTENSIONS:
+            detected = 'image'
+        elif ext in VIDEO_EXTENSIONS:
+            detected = 'video'
+        else:
+            raise ValueError("Could not detect media type.")
+
+        if media_type and media_type != detected:
+            if media_type not in ('image', 'video'):
+                raise ValueError("Invalid media type. Allowed: image, video")
+            raise ValueError(f"Media type '{media_type}' does not match the .{ext} extension.")
+        return detected
+
+    def upload_media(self, user_id: int, file_storage, media_type: str = None, post_id: int = None) -> dict:
         filename = secure_filename(file_storage.filename)
         if not filename:
             raise ValueError("Invalid file name.")
@@ -21,71 +81,559 @@ class MediaService:
         if not self.allowed_file(filename):
             raise ValueError(f"Unsupported file extension. Allowed: {ALLOWED_EXTENSIONS}")
 
+        media_type = self.detect_media_type(filename, media_type)
         ext = filename.rsplit('.', 1)[1].lower()
-        if not media_type:
-            if ext in {'png', 'jpg', 'jpeg', 'gif'}:
-                media_type = 'image'
-            elif ext in {'mp4', 'mov', 'avi', 'mkv'}:
-                media_type = 'video'
+
+        # Header-only probe: content that doesn't match its extension is rejected before any write
+        metadata = probe_image(file_storage.stream, ext) if media_type == 'image' else None
+
+        def store(path):
+            nonlocal metadata
+            if media_type != 'video':
+                return save_stream(file_storage.stream, path)
+            # ffprobe needs a file: stage the video on local scratch disk and probe it there
+            partial_path = create_partial_file(uuid.uuid4().hex)
+            try:
+                _, error = write_chunk(partial_path, file_storage.stream, 0, size)
+                if error is not None:
+                    raise error
+                metadata = probe_video_file(get_partial_file_path(partial_path), ext)
+            except Exception:
+                delete_partial_file(partial_path)
+                raise
+            return store_partial_file(partial_path, path)
+
+        # Hash first: known content is never written (or probed) again
+        sha256, size = hash_stream(file_storage.stream)
+        blob, created = self._acquire_blob(sha256, size, ext, store)
+
+        media = self._create_media(user_id, filename, media_type, post_id, blob, created, metadata)
+        db.session.commit()
+
+        if created:
+            self._queue_processing(media)
+        return dict(media.to_dict(), deduplicated=not created)
+
+    def get_media(self, media_id: int) -> dict:
+        media = Media.query.get(media_id)
+        if not media:
+            raise ValueError("Media not found.")
+
+        return media.to_dict()
+
+    def get_media_file(self, media_id: int) -> Media:
+        """
+        The Media row to serve; its `url` is the storage path of the content.
+        """
+        media = Media.query.get(media_id)
+        if not media:
+            raise ValueError("Media not found.")
+        return media
+
+    def delete_media(self, media_id: int, user_id: int) -> dict:
+        media = Media.query.get(media_id)
+        if not media:
+            raise ValueError("Media not found.")
+        if media.uploader_id != user_id:
+            raise PermissionError("User does not have permission to delete this media.")
+
+        stored = self.stored_files([media])
+        db.session.delete(media)
+        db.session.commit()
+        self.release_stored_files(stored)
+
+        return {
+            "message": "Media deleted successfully",
+            "media_id": media_id
+        }
+
+    @staticmethod
+    def _variant_paths(variants) -> list:
+        """Storage paths of the image variants recorded on a Media row."""
+        return [image["url"] for image in (variants or {}).get("images", []) if image.get("url")]
+
+    def stored_files(self, media_items) -> list:
+        """
+        What `release_stored_files` needs to free the storage behind Media
+        rows: (blob_id, url, variant paths) each. Collect it before deleting the rows.
+        """
+        return [(media.blob_id, media.url, self._variant_paths(media.variants)) for media in media_items]
+
+    def post_stored_files(self, post_id: int) -> list:
+        """`stored_files` for the media attached to a post, without loading the rows."""
+        rows = db.session.query(Media.blob_id, Media.url, Media.variants).filter(Media.post_id == post_id)
+        return [(blob_id, url, self._variant_paths(variants)) for blob_id, url, variants in rows]
+
+    def release_stored_files(self, stored: list) -> None:
+        """
+        Free the storage of deleted Media rows (as collected by `stored_files`):
+        drop one blob reference each, deleting files no row uses anymore.
+        Call after committing the delete.
+        """
+        for blob_id, path, variant_paths in stored:
+            if blob_id is None:
+                # Stored before deduplication; the files belong to this row alone
+                self._delete_stored(path, variant_paths)
             else:
-                raise ValueError("Could not detect media type.")
+                self._release_blob(blob_id, path, variant_paths)
+
+    @staticmethod
+    def _hls_prefix(path: str) -> str:
+        """Storage directory holding the HLS renditions and poster of the video at `path`."""
+        return os.path.splitext(path)[0] + "_hls"
 
-        saved_path = save_file(file_storage, media_type)
+    def _delete_stored(self, path: str, variant_paths=()) -> bool:
+        """Delete an original and everything derived from it. Returns True if the original was deleted."""
+        for variant_path in variant_paths:
+            delete_file(variant_path)
+        # Derived from the path rather than the recorded renditions, so a transcode
+        # that failed halfway is cleaned up too
+        storage.delete_prefix(self._hls_prefix(path) + "/")
+        return delete_file(path)
 
+    # --- Content-addressed storage ---
+
+    def _create_media(self, user_id, filename, media_type, post_id, blob, created, metadata=None) -> Media:
         media = Media(
-            user_id=user_id,
+            uploader_id=user_id,
             filename=filename,
             media_type=media_type,
-            filepath=saved_path,
+            url=blob.path,
+            blob_id=blob.id,
+            sha256=blob.sha256,
+            size=blob.size,
+            post_id=post_id,
             uploaded_at=datetime.utcnow()
         )
+        if metadata:
+            for field in PROBE_FIELDS:
+                setattr(media, field, metadata[field])
 
+        if not created:
+            # Known content was probed and processed with its first upload; reuse the results
+            sibling = Media.query.filter(Media.blob_id == blob.id).first()
+            if sibling:
+                media.variants, media.optimized_at, media.renditions = \
+                    sibling.variants, sibling.optimized_at, sibling.renditions
+                if not metadata:
+                    for field in PROBE_FIELDS:
+                        setattr(media, field, getattr(sibling, field))
         db.session.add(media)
+        db.session.flush()
+        return media
+
+    def _queue_processing(self, media: Media) -> None:
+        """Hand newly stored content to the background processing workers."""
+        kind = PROCESSING_JOB_KINDS.get(media.media_type)
+        if kind is None:
+            return
+        db.session.execute(insert_or_ignore(MediaProcessingJob), [{"media_id": media.id, "kind": kind}])
         db.session.commit()
 
-        return {
-            "media_id": media.id,
-            "filename": media.filename,
-            "media_type": media.media_type,
-            "filepath": media.filepath,
-            "uploaded_at": media.uploaded_at.isoformat()
-        }
+        if media.media_type == "image":
+            from app.workers.image_variants import generate_image_variants
+            generate_image_variants.delay(media.id)
+        else:
+            from app.workers.video_processor import process_video
+            process_video.delay(media.id)
 
-    def get_media(self, media_id: int) -> dict:
+    def _acquire_blob(self, sha256: str, size: int, ext: str, store) -> tuple:
+        """
+        Take a reference on the blob holding content `sha256`. `store(path)` is
+        only called to put the bytes in place when the content is new.
+        Runs inside the caller's transaction; the caller commits.
+
+        Returns:
+            tuple: (MediaBlob, True if the content was stored by this call)
+        """
+        existing = MediaBlob.query.filter_by(sha256=sha256).first()
+        created = existing is None
+        if created:
+            path = store(blob_path(sha256, ext))
+            # A concurrent upload of the same content may have won the race; that is fine
+            db.session.execute(insert_or_ignore(MediaBlob),
+                               [{"sha256": sha256, "path": path, "size": size, "ref_count": 0}])
+
+        db.session.execute(
+            update(MediaBlob)
+            .where(MediaBlob.sha256 == sha256)
+            .values(ref_count=MediaBlob.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        blob = MediaBlob.query.filter_by(sha256=sha256).populate_existing().one()
+        return blob, created
+
+    def _release_blob(self, blob_id: int, path: str, variant_paths=()) -> bool:
+        """
+        Drop one reference to a blob and commit. The blob row, its file and
+        everything derived from it (image variants, HLS renditions) are
+        removed when the last reference goes.
+        Returns True if the file was deleted.
+        """
+        db.session.execute(
+            update(MediaBlob)
+            .where(MediaBlob.id == blob_id)
+            .values(ref_count=MediaBlob.ref_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+        removed = db.session.execute(
+            delete(MediaBlob)
+            .where(MediaBlob.id == blob_id, MediaBlob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+
+        # Re-check after commit in case the same content was uploaded again meanwhile
+        if removed and not MediaBlob.query.filter_by(path=path).first():
+            return self._delete_stored(path, variant_paths)
+        return False
+
+    # --- Image variants ---
+
+    def generate_image_variants(self, media_id: int, force: bool = False) -> dict:
+        """
+        Create the resized WebP/JPEG variants and blurhash placeholder of an
+        image, store them next to the original and record them on every Media
+        row sharing its content.
+        """
         media = Media.query.get(media_id)
         if not media:
             raise ValueError("Media not found.")
+        if media.media_type != "image":
+            raise ValueError("Media is not an image.")
+        if media.optimized_at and not force:
+            return media.variants
 
-        return {
-            "media_id": media.id,
-            "filename": media.filename,
-            "media_type": media.media_type,
-            "filepath": media.filepath,
-            "uploaded_at": media.uploaded_at.isoformat(),
-            "user_id": media.user_id
-        }
+        config = current_app.config
+        with storage.local_copy(media.url) as source, tempfile.TemporaryDirectory() as work_dir:
+            variants = create_image_variants(
+                source, work_dir,
+                widths=config.get("IMAGE_VARIANT_WIDTHS", (320, 640, 1280)),
+                formats=config.get("IMAGE_VARIANT_FORMATS", ("webp", "jpeg")),
+                quality=config.get("IMAGE_VARIANT_QUALITY", 75)
+            )
+            self.save_image_variants(media, variants)
+        db.session.commit()
+        return variants
 
-    def delete_media(self, media_id: int, user_id: int) -> dict:
+    def save_image_variants(self, media: Media, variants: dict) -> None:
+        """
+        Store the files produced by `create_image_variants` next to the original
+        and record them on every Media row sharing its content, marking the rows
+        optimized. Runs inside the caller's transaction; the caller commits.
+        """
+        stem = os.path.splitext(media.url)[0]
+        for image in variants["images"]:
+            # Derived from content-addressed originals, so these paths are immutable too
+            image["url"] = storage.save_file(
+                f"{stem}_w{image['width']}.{image['format']}", image.pop("file"), move=True
+            )
+
+        now = datetime.utcnow()
+        media.variants = variants
+        media.optimized_at = now
+        if media.blob_id is not None:
+            db.session.execute(
+                update(Media)
+                .where(Media.blob_id == media.blob_id, Media.id != media.id)
+                .values(variants=variants, optimized_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+    # --- Video renditions ---
+
+    def transcode_video(self, media_id: int, force: bool = False, threads: int = 0, on_progress=None) -> dict:
+        """
+        Transcode a video into its HLS ladder and poster, store them under
+        '<original>_hls/' and record them on every Media row sharing its content.
+        `on_progress` receives the fraction encoded so far.
+        """
         media = Media.query.get(media_id)
         if not media:
             raise ValueError("Media not found.")
-        if media.user_id != user_id:
-            raise PermissionError("User does not have permission to delete this media.")
+        if media.media_type != "video":
+            raise ValueError("Media is not a video.")
+        if media.renditions and not force:
+            return media.renditions
 
-        delete_file(media.filepath)
-        db.session.delete(media)
+        config = current_app.config
+        prefix = self._hls_prefix(media.url)
+        with storage.local_copy(media.url) as source, tempfile.TemporaryDirectory() as work_dir:
+            renditions = transcode_video_hls(
+                source, work_dir,
+                ladder=config.get("VIDEO_HLS_LADDER") or DEFAULT_HLS_LADDER,
+                segment_seconds=config.get("VIDEO_HLS_SEGMENT_SECONDS", 4),
+                preset=config.get("VIDEO_X264_PRESET", "veryfast"),
+                threads=threads,
+                on_progress=on_progress
+            )
+            # Playlists reference segments by relative name, so the directory moves as a unit
+            for name in os.listdir(work_dir):
+                storage.save_file(f"{prefix}/{name}", os.path.join(work_dir, name), move=True)
+
+        renditions["master"] = f"{prefix}/{renditions['master']}"
+        renditions["poster"] = f"{prefix}/{renditions['poster']}"
+        for rendition in renditions["renditions"]:
+            rendition["playlist"] = f"{prefix}/{rendition['playlist']}"
+
+        media.renditions = renditions
+        if media.blob_id is not None:
+            db.session.execute(
+                update(Media)
+                .where(Media.blob_id == media.blob_id, Media.id != media.id)
+                .values(renditions=renditions)
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        return renditions
+
+    # --- Processing jobs ---
+
+    def start_job(self, media_id: int, kind: str) -> Optional[MediaProcessingJob]:
+        """
+        Mark a processing job running and count the attempt. Returns None if
+        the job already finished, so redelivered tasks do no work twice.
+        """
+        if db.session.get(Media, media_id) is None:
+            raise ValueError("Media not found.")
+
+        job = MediaProcessingJob.query.filter_by(media_id=media_id, kind=kind).with_for_update().first()
+        if job is None:
+            job = MediaProcessingJob(media_id=media_id, kind=kind, attempts=0)
+            db.session.add(job)
+        elif job.status == MediaProcessingJob.STATUS_DONE:
+            db.session.commit()
+            return None
+
+        job.status = MediaProcessingJob.STATUS_RUNNING
+        job.attempts += 1
+        job.progress = 0.0
+        job.error = None
+        job.started_at = datetime.utcnow()
+        job.finished_at = None
+        db.session.commit()
+        return job
+
+    def update_job_progress(self, job_id: int, progress: float) -> None:
+        db.session.execute(
+            update(MediaProcessingJob)
+            .where(MediaProcessingJob.id == job_id)
+            .values(progress=progress, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
         db.session.commit()
 
+    def finish_job(self, job_id: int) -> None:
+        job = db.session.get(MediaProcessingJob, job_id)
+        if job is None:
+            return
+        job.status = MediaProcessingJob.STATUS_DONE
+        job.progress = 1.0
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    def fail_job(self, job_id: int, error, retry: bool = True) -> Optional[int]:
+        """
+        Record a failed attempt. While attempts remain (MEDIA_JOB_MAX_ATTEMPTS)
+        and `retry` is set, the job goes back to queued.
+
+        Returns:
+            Seconds to wait before retrying (exponential backoff), or None if
+            the job has failed for good.
+        """
+        job = db.session.get(MediaProcessingJob, job_id)
+        if job is None:
+            return None
+
+        config = current_app.config
+        retrying = retry and job.attempts < config.get("MEDIA_JOB_MAX_ATTEMPTS", 4)
+        job.status = MediaProcessingJob.STATUS_QUEUED if retrying else MediaProcessingJob.STATUS_FAILED
+        job.error = str(error)[:2000]
+        if not retrying:
+            job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+        if not retrying:
+            return None
+        return config.get("MEDIA_JOB_RETRY_BACKOFF_SECONDS", 30) * 2 ** (job.attempts - 1)
+
+    def get_processing_status(self, media_id: int) -> dict:
+        media = Media.query.get(media_id)
+        if not media:
+            raise ValueError("Media not found.")
+
+        jobs = MediaProcessingJob.query.filter_by(media_id=media_id).all()
+        statuses = {job.status for job in jobs}
+        for status in (MediaProcessingJob.STATUS_FAILED, MediaProcessingJob.STATUS_RUNNING,
+                       MediaProcessingJob.STATUS_QUEUED):
+            if status in statuses:
+                break
+        else:
+            # Deduplicated uploads reuse earlier results and have no job of their own
+            done = jobs or media.variants or media.renditions
+            status = MediaProcessingJob.STATUS_DONE if done else "unprocessed"
+
         return {
-            "message": "Media deleted successfully",
-            "media_id": media_id
+            "media_id": media.id,
+            "media_type": media.media_type,
+            "status": status,
+            "progress": min((job.progress for job in jobs), default=1.0 if status == MediaProcessingJob.STATUS_DONE else 0.0),
+            "jobs": [job.to_dict() for job in jobs],
+            "variants": media.variants,
+            "renditions": media.renditions,
         }
 
+    # --- Chunked, resumable uploads ---
+
+    def init_upload(self, user_id: int, filename: str, size: int, sha256: str = None,
+                    media_type: str = None, post_id: int = None) -> UploadSession:
+        """
+        Start a chunked upload of `size` bytes. Chunks are then appended with
+        `append_chunk` and the upload finished with `complete_upload`.
+        """
+        filename = secure_filename(filename or "")
+        if not filename:
+            raise ValueError("Invalid file name.")
+        if not self.allowed_file(filename):
+            raise ValueError(f"Unsupported file extension. Allowed: {ALLOWED_EXTENSIONS}")
+        media_type = self.detect_media_type(filename, media_type)
+
+        max_size = current_app.config.get("MEDIA_MAX_UPLOAD_BYTES", 2 * 1024 ** 3)
+        if not isinstance(size, int) or size <= 0 or size > max_size:
+            raise ValueError(f"size must be between 1 and {max_size} bytes.")
+        if sha256 is not None and not re.fullmatch(r"[0-9a-f]{64}", sha256.lower()):
+            raise ValueError("sha256 must be a 64-character hex digest.")
+
+        upload_id = uuid.uuid4().hex
+        upload = UploadSession(
+            id=upload_id,
+            user_id=user_id,
+            filename=filename,
+            media_type=media_type,
+            post_id=post_id,
+            total_size=size,
+            received=0,
+            sha256=sha256.lower() if sha256 else None,
+            partial_path=create_partial_file(upload_id),
+            status=UploadSession.STATUS_UPLOADING
+        )
+        db.session.add(upload)
+        db.session.commit()
+        return upload
+
+    def get_upload(self, upload_id: str, user_id: int, lock: bool = False) -> UploadSession:
+        query = UploadSession.query.filter_by(id=upload_id)
+        if lock:
+            # Serializes concurrent chunks for the same upload (no-op on SQLite)
+            query = query.with_for_update()
+        upload = query.first()
+        if not upload:
+            raise ValueError("Upload not found.")
+        if upload.user_id != user_id:
+            raise PermissionError("Unauthorized to access this upload.")
+        return upload
+
+    def append_chunk(self, upload_id: str, user_id: int, offset: int, stream, length: int) -> UploadSession:
+        """
+        Stream a chunk straight from the request body into the partial file.
+        The chunk must start at the upload's current offset. Bytes received
+        before a disconnect are kept, so the client can resume from the new offset.
+
+        Raises:
+            UploadOffsetConflict: If `offset` is not the current offset.
+            ValueError: For oversized chunks, finished uploads or an interrupted transfer.
+        """
+        upload = self.get_upload(upload_id, user_id, lock=True)
+        if upload.status != UploadSession.STATUS_UPLOADING:
+            raise ValueError("Upload is already complete.")
+        if offset != upload.received:
+            raise UploadOffsetConflict(upload.received)
+
+        max_chunk = current_app.config.get("MEDIA_MAX_CHUNK_BYTES", 16 * 1024 ** 2)
+        if length is None or length <= 0 or length > max_chunk:
+            raise ValueError(f"Chunk size must be between 1 and {max_chunk} bytes.")
+        if offset + length > upload.total_size:
+            raise ValueError("Chunk exceeds the declared upload size.")
+
+        written, error = write_chunk(upload.partial_path, stream, offset, length)
+        upload.received = offset + written
+        db.session.commit()
+
+        if error is not None:
+            raise ValueError(f"Upload interrupted; resume from offset {upload.received}.") from error
+        return upload
+
+    def complete_upload(self, upload_id: str, user_id: int) -> dict:
+        """
+        Verify a fully received upload (size and, if declared, SHA-256),
+        move it into place and create its Media row. Idempotent.
+        """
+        upload = self.get_upload(upload_id, user_id, lock=True)
+        if upload.status == UploadSession.STATUS_COMPLETE:
+            return self.get_media(upload.media_id)
+        if upload.received != upload.total_size:
+            raise ValueError(f"Upload incomplete: {upload.received} of {upload.total_size} bytes received.")
+
+        sha256 = file_sha256(upload.partial_path)
+        if upload.sha256 and sha256 != upload.sha256:
+            # The bytes on disk are unusable; start over rather than keep a corrupt prefix
+            upload.received = 0
+            db.session.commit()
+            raise ValueError("Checksum mismatch; the upload has been reset to offset 0.")
+
+        ext = upload.filename.rsplit('.', 1)[1].lower()
+        # Headers only, from the local partial file; rejects mismatched content before it is stored
+        metadata = probe_media(get_partial_file_path(upload.partial_path), upload.media_type, ext)
+
+        blob, created = self._acquire_blob(
+            sha256, upload.total_size, ext, lambda path: store_partial_file(upload.partial_path, path)
+        )
+        if not created:
+            # Already stored; the received copy is redundant
+            delete_partial_file(upload.partial_path)
+
+        media = self._create_media(user_id, upload.filename, upload.media_type, upload.post_id,
+                                   blob, created, metadata)
+
+        upload.media_id = media.id
+        upload.partial_path = blob.path
+        upload.status = UploadSession.STATUS_COMPLETE
+        db.session.commit()
+
+        if created:
+            self._queue_processing(media)
+        return dict(media.to_dict(), deduplicated=not created)
+
+    def abort_upload(self, upload_id: str, user_id: int) -> None:
+        upload = self.get_upload(upload_id, user_id)
+        if upload.status == UploadSession.STATUS_COMPLETE:
+            raise ValueError("Upload is already complete.")
+        delete_partial_file(upload.partial_path)
+        db.session.delete(upload)
+        db.session.commit()
+
+    def purge_stale_uploads(self, max_age_hours: int = None) -> int:
+        """
+        Remove unfinished uploads untouched for `max_age_hours` (default
+        MEDIA_UPLOAD_EXPIRY_HOURS) and their partial files.
+        """
+        max_age_hours = max_age_hours or current_app.config.get("MEDIA_UPLOAD_EXPIRY_HOURS", 24)
+        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        stale = UploadSession.query.filter(
+            UploadSession.status == UploadSession.STATUS_UPLOADING,
+            UploadSession.updated_at < cutoff
+        ).all()
+        for upload in stale:
+            delete_partial_file(upload.partial_path)
+            db.session.delete(upload)
+        db.session.commit()
+        return len(stale)
+
 # --- Wrappers to match expected imports in media.py ---
 media_service = MediaService()
 
-def save_media_metadata(user_id, file_storage, media_type=None):
-    return media_service.upload_media(user_id, file_storage, media_type)
+def save_media_metadata(user_id, file_storage, media_type=None, post_id=None):
+    return media_service.upload_media(user_id, file_storage, media_type, post_id)
 
 def get_media_by_id(media_id):
     return media_service.get_media(media_id)
@@ -1,8 +1,18 @@
+import time
+from collections import Counter, defaultdict
 from datetime import datetime
+from typing import Iterable, List, Optional
+
+from flask import current_app
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+
 from app.extensions import db
 from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
 from app.models.user import User
-from app.workers.notification_dispatcher import enqueue_notification_dispatch
+from app.utils.db_helpers import delete_returning, insert_or_ignore
+from app.workers.notification_dispatcher import enqueue_notification_dispatch, dispatch_notifications_bulk
+from app.utils.pagination import decode_cursor, paginate_query
 
 
 class NotificationService:
@@ -20,36 +30,132 @@ class NotificationService:
         Create a new notification and optionally dispatch it async.
         """
         notification = Notification(
-            user_id=recipient_id,
+            recipient_id=recipient_id,
+            sender_id=sender_id,
             message=message,
-            link=link,
-            type=notif_type,
+            notification_type=notif_type or "general",
             created_at=datetime.utcnow(),
             is_read=False
         )
         db.session.add(notification)
+        adjust_unread_count([recipient_id], 1)
         db.session.commit()
 
-        # Asynchronously enqueue notification (e.g., email, push, websocket)
-        enqueue_notification_dispatch.delay(
-            recipient_id=recipient_id,
-            sender_id=sender_id,
-            type=notif_type,
-            message=message,
-            target_type=target_type,
-            target_id=target_id
-        )
+        # Asynchronously deliver the stored notification (e.g., email, push, websocket)
+        enqueue_notification_dispatch(notification.id)
 
         return notification
 
-    def get_user_notifications(self, user_id: int, unread_only: bool = False, limit: int = 50):
+    @staticmethod
+    def _unique_recipients(recipient_ids: Iterable[int]) -> List[int]:
+        # Keeps first-seen order so chunks are deterministic
+        return [rid for rid in dict.fromkeys(recipient_ids) if rid is not None]
+
+    def create_notifications_bulk(
+        self,
+        recipient_ids: Iterable[int],
+        sender_id: int,
+        message: str,
+        notif_type: str = None,
+        chunk_size: int = None
+    ) -> dict:
+        """
+        Store the same notification for many recipients (group announcements,
+        event reminders) with one multi-row INSERT and one commit per chunk.
+        Duplicate recipient ids are dropped.
+
+        Returns:
+            dict: Throughput metrics:
+                {"recipients": int, "inserted": int, "chunks": int,
+                 "elapsed_ms": float, "rows_per_sec": float}
+        """
+        chunk_size = chunk_size or current_app.config.get("NOTIFICATION_BULK_CHUNK_SIZE", 1000)
+        recipients = self._unique_recipients(recipient_ids)
+
+        started = time.perf_counter()
+        created_at = datetime.utcnow()
+        inserted = chunks = 0
+        for start in range(0, len(recipients), chunk_size):
+            rows = [
+                {
+                    "recipient_id": recipient_id,
+                    "sender_id": sender_id,
+                    "notification_type": notif_type or "general",
+                    "message": message,
+                    "is_read": False,
+                    "created_at": created_at,
+                }
+                for recipient_id in recipients[start:start + chunk_size]
+            ]
+            db.session.execute(insert(Notification), rows)
+            adjust_unread_count([row["recipient_id"] for row in rows], 1)
+            db.session.commit()
+            inserted += len(rows)
+            chunks += 1
+
+        elapsed = time.perf_counter() - started
+        return {
+            "recipients": len(recipients),
+            "inserted": inserted,
+            "chunks": chunks,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "rows_per_sec": round(inserted / elapsed, 1) if elapsed > 0 else float(inserted),
+        }
+
+    def enqueue_notifications_bulk(
+        self,
+        recipient_ids: Iterable[int],
+        sender_id: int,
+        message: str,
+        notif_type: str = None,
+        chunk_size: int = None
+    ) -> int:
         """
-        Fetch notifications for a user.
+        Fan a bulk notification out to Celery, one task per chunk of
+        recipients, so large audiences are inserted in parallel off the
+        request path.
+
+        Returns:
+            int: Number of tasks enqueued.
         """
-        query = Notification.query.filter_by(user_id=user_id)
+        chunk_size = chunk_size or current_app.config.get("NOTIFICATION_BULK_CHUNK_SIZE", 1000)
+        recipients = self._unique_recipients(recipient_ids)
+
+        tasks = 0
+        for start in range(0, len(recipients), chunk_size):
+            dispatch_notifications_bulk.delay(
+                recipient_ids=recipients[start:start + chunk_size],
+                sender_id=sender_id,
+                message=message,
+                notif_type=notif_type
+            )
+            tasks += 1
+        return tasks
+
+    def get_user_notifications(self, user_id: int, unread_only: bool = False, limit: int = 50,
+                               page: int = None, cursor: str = None):
+        """
+        Fetch notifications for a user, newest first.
+
+        Returns a list of up to `limit` notifications, or a pagination dict
+        ({"items": [...], "pagination": {...}}) when `page` (offset mode) or
+        `cursor` (keyset mode on (created_at, id); empty string for the first
+        page) is given.
+        """
+        query = Notification.query.filter_by(recipient_id=user_id)
         if unread_only:
             query = query.filter_by(is_read=False)
-        notifications = query.order_by(Notification.created_at.desc()).limit(limit).all()
+
+        if cursor is not None:
+            return paginate_query(query, per_page=limit, cursor=cursor,
+                                  keyset=(Notification.created_at, Notification.id),
+                                  item_serializer=lambda n: n)
+
+        query = query.order_by(Notification.created_at.desc())
+        if page is not None:
+            return paginate_query(query, page=page, per_page=limit, item_serializer=lambda n: n)
+
+        notifications = query.limit(limit).all()
         return notifications
 
     def mark_as_read(self, notification_id: int, user_id: int) -> Notification:
@@ -59,11 +165,11 @@ class NotificationService:
         notification = Notification.query.get(notification_id)
         if not notification:
             raise ValueError("Notification not found.")
-        if notification.user_id != user_id:
+        if notification.recipient_id != user_id:
             raise PermissionError("Unauthorized action.")
-        if not notification.is_read:
-            notification.is_read = True
-            db.session.commit()
+        if _mark_read(notification_id):
+            adjust_unread_count([user_id], -1)
+        db.session.commit()
         return notification
 
     def delete_notification(self, notification_id: int, user_id: int) -> None:
@@ -73,10 +179,177 @@ class NotificationService:
         notification = Notification.query.get(notification_id)
         if not notification:
             raise ValueError("Notification not found.")
-        if notification.user_id != user_id:
+        if notification.recipient_id != user_id:
             raise PermissionError("Unauthorized action.")
-        db.session.delete(notification)
+        # Delete it while still unread first: of two concurrent deletes or a
+        # delete racing a read, only the statement that removes an unread row
+        # lowers the badge
+        stmt = delete(Notification).where(Notification.id == notification_id) \
+            .execution_options(synchronize_session=False)
+        unread = db.session.execute(stmt.where(Notification.is_read.is_(False))).rowcount
+        if unread:
+            adjust_unread_count([user_id], -unread)
+        else:
+            db.session.execute(stmt)
+        db.session.expunge(notification)
+        db.session.commit()
+
+    def mark_all_as_read(self, user_id: int, up_to_id: Optional[int] = None,
+                         cursor: Optional[str] = None) -> int:
+        """
+        Mark a user's unread notifications as read with a single UPDATE.
+
+        Args:
+            up_to_id (int): Only notifications with id <= up_to_id.
+            cursor (str): Only notifications at or older than this position, as
+                returned in `next_cursor` by the notifications list.
+
+        Returns:
+            int: Number of notifications updated.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        stmt = update(Notification).where(
+            Notification.recipient_id == user_id,
+            Notification.is_read.is_(False)
+        )
+        if up_to_id is not None:
+            stmt = stmt.where(Notification.id <= up_to_id)
+        position = decode_cursor(cursor)
+        if position is not None:
+            created_at, notification_id = position
+            stmt = stmt.where(or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id <= notification_id)
+            ))
+
+        result = db.session.execute(
+            stmt.values(is_read=True).execution_options(synchronize_session=False)
+        )
+        adjust_unread_count([user_id], -result.rowcount)
         db.session.commit()
+        return result.rowcount
+
+    def delete_notifications_bulk(self, user_id: Optional[int] = None, older_than: Optional[datetime] = None,
+                                  notif_type: Optional[str] = None, batch_size: int = 1000) -> int:
+        """
+        Delete notifications matching the filters in id batches, committing
+        after each one so no single transaction holds locks for long.
+        With user_id=None this applies to every user (retention clean-up).
+
+        Returns:
+            int: Number of notifications deleted.
+        """
+        conditions = []
+        if user_id is not None:
+            conditions.append(Notification.recipient_id == user_id)
+        if older_than is not None:
+            conditions.append(Notification.created_at < older_than)
+        if notif_type is not None:
+            conditions.append(Notification.notification_type == notif_type)
+
+        deleted = 0
+        while True:
+            ids = db.session.execute(
+                select(Notification.id).where(*conditions).order_by(Notification.id).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            # is_read as of the delete itself: a notification read after the SELECT
+            # above must not lower the badge a second time
+            rows = delete_returning(Notification, [Notification.id.in_(ids)],
+                                    Notification.recipient_id, Notification.is_read)
+
+            # Deleting unread notifications lowers the badge; group recipients by how much
+            unread = Counter(recipient_id for recipient_id, is_read in rows if not is_read)
+            recipients_by_delta = defaultdict(list)
+            for recipient_id, count in unread.items():
+                recipients_by_delta[count].append(recipient_id)
+            for count, recipient_ids in recipients_by_delta.items():
+                adjust_unread_count(recipient_ids, -count)
+
+            db.session.commit()
+            deleted += len(rows)
+        return deleted
+
+    def get_unread_count(self, user_id: int) -> int:
+        """
+        Unread notification count for the badge: a single primary-key read.
+        """
+        count = db.session.query(NotificationCounter.unread_count) \
+            .filter(NotificationCounter.user_id == user_id).scalar()
+        return count or 0
+
+    def reconcile_unread_counts(self, batch_size: int = 1000) -> int:
+        """
+        Recompute unread counters from the notifications table in user id
+        batches, creating missing counter rows and rewriting only drifted ones.
+        Returns the number of counters corrected.
+        """
+        unread_total = select(func.count(Notification.id)).where(
+            Notification.recipient_id == NotificationCounter.user_id,
+            Notification.is_read.is_(False)
+        ).scalar_subquery()
+
+        max_id = db.session.query(func.max(User.id)).scalar() or 0
+        corrected = 0
+        for start in range(0, max_id, batch_size):
+            in_range = and_(Notification.recipient_id > start, Notification.recipient_id <= start + batch_size)
+            missing = db.session.execute(
+                select(Notification.recipient_id).where(in_range, Notification.is_read.is_(False)).distinct()
+            ).scalars().all()
+            if missing:
+                db.session.execute(insert_or_ignore(NotificationCounter),
+                                   [{"user_id": user_id, "unread_count": 0} for user_id in missing])
+
+            result = db.session.execute(
+                update(NotificationCounter)
+                .where(NotificationCounter.user_id > start, NotificationCounter.user_id <= start + batch_size)
+                .where(NotificationCounter.unread_count != unread_total)
+                .values(unread_count=unread_total)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            corrected += result.rowcount
+        return corrected
+
+
+def _mark_read(notification_id: int) -> int:
+    """
+    Flip one notification to read with a conditional UPDATE. Returns the
+    rowcount: 1 only for the request that actually changed it, so
+    concurrent reads of the same notification decrement the badge once.
+    """
+    return db.session.execute(
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def adjust_unread_count(user_ids: Iterable[int], delta: int) -> None:
+    """
+    Atomically add `delta` to the unread notification counters of `user_ids`,
+    creating missing counter rows and never going below zero.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    user_ids = list(user_ids)
+    if not user_ids or not delta:
+        return
+
+    if delta > 0:
+        db.session.execute(insert_or_ignore(NotificationCounter),
+                           [{"user_id": user_id, "unread_count": 0} for user_id in user_ids])
+
+    column = NotificationCounter.unread_count
+    db.session.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id.in_(user_ids))
+        .values(unread_count=case((column + delta < 0, 0), else_=column + delta))
+        .execution_options(synchronize_session=False)
+    )
 
 
 # Create a single instance for module-level usage
@@ -87,6 +360,12 @@ notification_service = NotificationService()
 def create_notification(*args, **kwargs):
     return notification_service.create_notification(*args, **kwargs)
 
+def create_notifications_bulk(*args, **kwargs):
+    return notification_service.create_notifications_bulk(*args, **kwargs)
+
+def enqueue_notifications_bulk(*args, **kwargs):
+    return notification_service.enqueue_notifications_bulk(*args, **kwargs)
+
 def get_user_notifications(*args, **kwargs):
     return notification_service.get_user_notifications(*args, **kwargs)
 
@@ -96,6 +375,12 @@ def mark_as_read(*args, **kwargs):
 def delete_notification(*args, **kwargs):
     return notification_service.delete_notification(*args, **kwargs)
 
+def delete_notifications_bulk(*args, **kwargs):
+    return notification_service.delete_notifications_bulk(*args, **kwargs)
+
+def get_unread_count(*args, **kwargs):
+    return notification_service.get_unread_count(*args, **kwargs)
+
 # Standalone utility functions
 
 def mark_notification_as_read(notification_id: int):
@@ -104,20 +389,15 @@ def mark_notification_as_read(notification_id: int):
     """
     notification = Notification.query.get(notification_id)
     if notification:
-        notification.is_read = True
+        if _mark_read(notification_id):
+            adjust_unread_count([notification.recipient_id], -1)
         db.session.commit()
         return True
     return False
 
-def mark_all_notifications_as_read(user_id: int) -> int:
+def mark_all_notifications_as_read(user_id: int, up_to_id: int = None, cursor: str = None) -> int:
     """
-    Mark all unread notifications for the user as read.
-    Returns the number of updated records.
+    Mark all unread notifications for the user as read (optionally only up to
+    an id or cursor position). Returns the number of updated records.
     """
-    notifications = Notification.query.filter_by(user_id=user_id, is_read=False).all()
-    if not notifications:
-        return 0
-    for notif in notifications:
-        notif.is_read = True
-    db.session.commit()
-    return len(notifications)
+    return notification_service.mark_all_as_read(user_id, up_to_id=up_to_id, cursor=cursor)
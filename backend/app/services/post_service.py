@@ -1,26 +1,37 @@
 from datetime import datetime
+from collections import defaultdict
 from typing import List, Optional, Dict, Any
 
-from app.extensions import db
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db, cache
 from app.models.post import Post
 from app.models.user import User
 from app.models.campus import Campus
 from app.models.group import Group
 from app.models.media import Media
 from app.models.like import Like
+from app.models.comment import Comment
+from app.models.timeline_entry import TimelineEntry
+from app.services.media_service import media_service
+from app.services.search_service import search_service
 from app.utils.pagination import paginate_query
 
+# Most post ids accepted by one relationship lookup (a few feed pages)
+MAX_RELATIONSHIP_IDS = 100
+
 
 class PostService:
     def create_post(self, author_id: int, content: str, campus_id: Optional[int] = None,
                     group_id: Optional[int] = None, media_ids: Optional[List[int]] = None) -> Post:
-        if campus_id and not Campus.query.get(campus_id):
+        if campus_id and not cache.get_entity(Campus, campus_id):
             raise ValueError("Invalid campus_id")
-        if group_id and not Group.query.get(group_id):
+        if group_id and not cache.get_entity(Group, group_id):
             raise ValueError("Invalid group_id")
 
         post = Post(
-            author_id=author_id,
+            user_id=author_id,
             content=content,
             campus_id=campus_id,
             group_id=group_id,
@@ -33,18 +44,24 @@ class PostService:
             post.media = media_items
 
         db.session.add(post)
+        db.session.flush()
+        search_service.index(post)
         db.session.commit()
+
+        # Push the post into followers' home timelines off the request path
+        from app.workers.timeline_fanout import fan_out_post
+        fan_out_post.delay(post.id)
         return post
 
     def get_post_by_id(self, post_id: int) -> Optional[Post]:
-        return Post.query.get(post_id)
+        return cache.get_entity(Post, post_id)
 
     def update_post(self, post_id: int, author_id: int, new_content: Optional[str] = None,
                     media_ids: Optional[List[int]] = None) -> Post:
         post = self.get_post_by_id(post_id)
         if not post:
             raise ValueError("Post not found")
-        if post.author_id != author_id:
+        if post.user_id != author_id:
             raise PermissionError("Unauthorized to update this post")
 
         if new_content is not None:
@@ -54,18 +71,34 @@ class PostService:
             post.media = media_items
 
         post.updated_at = datetime.utcnow()
+        search_service.index(post)
         db.session.commit()
+        cache.delete_entity(Post, post_id)
         return post
 
     def delete_post(self, post_id: int, author_id: int) -> None:
         post = self.get_post_by_id(post_id)
         if not post:
             raise ValueError("Post not found")
-        if post.author_id != author_id:
+        if post.user_id != author_id:
             raise PermissionError("Unauthorized to delete this post")
-
+        self._remove_post(post)
+
+    def _remove_post(self, post: Post) -> None:
+        """
+        Delete a post with everything hanging off it: timeline entries,
+        search index row, cache entry and stored media. No permission check;
+        callers (author delete, admin moderation) authorize first.
+        """
+        post_id = post.id
+        TimelineEntry.query.filter_by(post_id=post_id).delete(synchronize_session=False)
+        search_service.remove(post)
+        # The cascade deletes the Media rows; their blob references are released after commit
+        stored = media_service.post_stored_files(post_id)
         db.session.delete(post)
         db.session.commit()
+        cache.delete_entity(Post, post_id)
+        media_service.release_stored_files(stored)
 
     def _apply_filters(self, query, campus_id: Optional[int] = None,
                        group_id: Optional[int] = None, author_id: Optional[int] = None):
@@ -74,20 +107,114 @@ class PostService:
         if group_id is not None:
             query = query.filter(Post.group_id == group_id)
         if author_id is not None:
-            query = query.filter(Post.author_id == author_id)
+            query = query.filter(Post.user_id == author_id)
         return query
 
     def get_posts(self, page: int = 1, per_page: int = 20,
                   campus_id: Optional[int] = None, group_id: Optional[int] = None,
-                  author_id: Optional[int] = None, order_desc: bool = True) -> Dict[str, Any]:
+                  author_id: Optional[int] = None, order_desc: bool = True,
+                  cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch a page of serialized posts. With a cursor (empty string for the
+        first page) keyset pagination on (created_at, id) is used instead of
+        page/offset, skipping the total count.
+        """
         query = Post.query
         query = self._apply_filters(query, campus_id, group_id, author_id)
+        if cursor is not None:
+            return paginate_query(query, per_page=per_page, cursor=cursor,
+                                  keyset=(Post.created_at, Post.id), descending=order_desc,
+                                  batch_serializer=self.serialize_posts)
         order_col = Post.created_at.desc() if order_desc else Post.created_at.asc()
         query = query.order_by(order_col)
-        return paginate_query(query, page, per_page)
+        return paginate_query(query, page, per_page, batch_serializer=self.serialize_posts)
+
+    def serialize_posts(self, posts: List[Post]) -> List[Dict[str, Any]]:
+        """
+        Serialize a page of posts, loading media for the whole page in one
+        query. Like and comment counts come from the denormalized columns.
+        """
+        if not posts:
+            return []
+
+        post_ids = [post.id for post in posts]
+        media_by_post = defaultdict(list)
+        for media in Media.query.filter(Media.post_id.in_(post_ids)).order_by(Media.id).all():
+            media_by_post[media.post_id].append(media)
+
+        return [post.to_dict(media=media_by_post[post.id]) for post in posts]
+
+    def reconcile_counters(self, batch_size: int = 1000) -> int:
+        """
+        Recompute likes_count/comments_count from the source tables in id-range
+        batches, rewriting only the rows that drifted. Returns the number of
+        posts corrected.
+        """
+        likes_total = select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+        comments_total = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+
+        max_id = db.session.query(func.max(Post.id)).scalar() or 0
+        corrected = 0
+        for start in range(0, max_id, batch_size):
+            result = db.session.execute(
+                update(Post)
+                .where(Post.id > start, Post.id <= start + batch_size)
+                .where(or_(Post.likes_count != likes_total, Post.comments_count != comments_total))
+                .values(likes_count=likes_total, comments_count=comments_total,
+                        updated_at=Post.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            corrected += result.rowcount
+        return corrected
+
+    def get_commented_post_ids(self, user_id: int, post_ids: List[int]) -> set:
+        """
+        The subset of `post_ids` the user has commented on, in one query.
+        """
+        if not post_ids:
+            return set()
+        rows = db.session.query(Comment.post_id).filter(Comment.user_id == user_id, Comment.post_id.in_(post_ids)) \
+            .distinct()
+        return {post_id for (post_id,) in rows}
+
+    def get_relationships(self, user_id: int, post_ids: List[int]) -> Dict[int, Dict[str, bool]]:
+        """
+        The viewer's state for a page of posts: liked, commented and whether
+        they follow the author. One IN query per relation (plus one for the
+        authors); follows come from the viewer's cached following set.
+        Unknown post ids are left out.
+
+        Raises:
+            ValueError: If more than MAX_RELATIONSHIP_IDS ids are given.
+        """
+        # Imported here: both services import this module
+        from app.services.like_service import get_liked_post_ids
+        from app.services.follow_service import follow_service
+
+        post_ids = list(dict.fromkeys(post_ids))
+        if len(post_ids) > MAX_RELATIONSHIP_IDS:
+            raise ValueError(f"At most {MAX_RELATIONSHIP_IDS} post ids per request.")
+        if not post_ids:
+            return {}
+
+        authors = dict(db.session.query(Post.id, Post.user_id).filter(Post.id.in_(post_ids)).all())
+        liked = get_liked_post_ids(list(authors), user_id)
+        commented = self.get_commented_post_ids(user_id, list(authors))
+        following = follow_service.following_ids(user_id)
+
+        return {
+            post_id: {
+                "liked": post_id in liked,
+                "commented": post_id in commented,
+                "author_followed": authors[post_id] in following,
+            }
+            for post_id in post_ids if post_id in authors
+        }
 
     def count_likes(self, post_id: int) -> int:
-        return Like.query.filter_by(post_id=post_id).count()
+        count = db.session.query(Post.likes_count).filter(Post.id == post_id).scalar()
+        return count or 0
 
     def user_liked_post(self, user_id: int, post_id: int) -> bool:
         return Like.query.filter_by(user_id=user_id, post_id=post_id).first() is not None
@@ -97,15 +224,41 @@ class PostService:
             return
         like = Like(user_id=user_id, post_id=post_id)
         db.session.add(like)
-        db.session.commit()
+        adjust_post_counter(post_id, "likes_count", 1)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request liked the post first
+            db.session.rollback()
 
     def unlike_post(self, user_id: int, post_id: int) -> None:
-        like = Like.query.filter_by(user_id=user_id, post_id=post_id).first()
-        if like:
-            db.session.delete(like)
+        deleted = Like.query.filter_by(user_id=user_id, post_id=post_id).delete(synchronize_session=False)
+        if deleted:
+            adjust_post_counter(post_id, "likes_count", -deleted)
             db.session.commit()
 
 
+def adjust_post_counter(post_id: int, counter: str, delta: int) -> None:
+    """
+    Atomically add `delta` to a denormalized counter on a post
+    (UPDATE posts SET <counter> = <counter> + delta), never going below zero.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    column = getattr(Post, counter)
+    db.session.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values({
+            column: case((column + delta < 0, 0), else_=column + delta),
+            # Counter changes are not edits; keep onupdate from touching updated_at
+            Post.updated_at: Post.updated_at,
+        })
+        .execution_options(synchronize_session=False)
+    )
+    # Cached copies carry the counters; drop them so readers reload the row
+    cache.delete_entity(Post, post_id)
+
+
 # --------------------------------------
 # Instance and Wrapper Functions
 # --------------------------------------
@@ -162,17 +315,17 @@ def delete_post(user_id, post_id):
 
 def get_all_posts():
     result = post_service.get_posts()
-    return [post.as_dict() for post in result["items"]]
+    return result["items"]
 
 
 def get_posts_by_user(user_id):
     result = post_service.get_posts(author_id=user_id)
-    return [post.as_dict() for post in result["items"]]
+    return result["items"]
 
 
 def get_posts_by_campus(campus_id):
     result = post_service.get_posts(campus_id=campus_id)
-    return [post.as_dict() for post in result["items"]]
+    return result["items"]
 
 
 def like_post(user_id, post_id):
@@ -0,0 +1,131 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.extensions import db, search
+from app.models.event import Event
+from app.models.group import Group
+from app.models.post import Post
+from app.models.user import User
+from app.utils.search import DOC_TYPES
+
+# doc_type -> (model, title columns, body columns). Title matches rank above body matches.
+SEARCH_DOCUMENTS = {
+    "user": (User, ("username", "full_name"), ("bio",)),
+    "post": (Post, (), ("content",)),
+    "group": (Group, ("name",), ("description",)),
+    "event": (Event, ("title",), ("description", "location")),
+}
+
+MAX_SEARCH_LIMIT = 50
+
+
+def _join(entity, columns):
+    return " ".join(value for value in (getattr(entity, column) for column in columns) if value)
+
+
+class SearchService:
+    """
+    Ranked full-text search over users, posts, groups and events.
+
+    The owning services call `index`/`remove` from their create, update and
+    delete methods before committing, so the index changes in the same
+    transaction as the row it describes.
+    """
+
+    def _doc_type(self, entity) -> str:
+        for doc_type, (model, _, _) in SEARCH_DOCUMENTS.items():
+            if isinstance(entity, model):
+                return doc_type
+        raise ValueError(f"{type(entity).__name__} is not searchable.")
+
+    def index(self, entity) -> None:
+        """
+        Add or refresh an entity's document. The entity must have an id (flush first).
+        """
+        doc_type = self._doc_type(entity)
+        _, title_columns, body_columns = SEARCH_DOCUMENTS[doc_type]
+        search.index(doc_type, entity.id, _join(entity, title_columns), _join(entity, body_columns))
+
+    def remove(self, entity) -> None:
+        search.remove(self._doc_type(entity), entity.id)
+
+    def _parse_types(self, types: Optional[Iterable[str]]) -> tuple:
+        if not types:
+            return DOC_TYPES
+        unknown = set(types) - set(SEARCH_DOCUMENTS)
+        if unknown:
+            raise ValueError(f"Unknown search type(s): {', '.join(sorted(unknown))}")
+        return tuple(types)
+
+    def search_entities(self, query: str, types: Optional[Iterable[str]] = None, limit: int = 20,
+                        offset: int = 0, prefix: bool = False) -> List[tuple]:
+        """
+        Best matches first, as (doc_type, entity) pairs. Entities are loaded
+        with one query per type; index entries whose row is gone are skipped.
+        """
+        limit = min(max(limit, 1), MAX_SEARCH_LIMIT)
+        hits = search.search(query, self._parse_types(types), limit=limit, offset=max(offset, 0), prefix=prefix)
+
+        ids_by_type = defaultdict(list)
+        for doc_type, doc_id in hits:
+            ids_by_type[doc_type].append(doc_id)
+        loaded = {}
+        for doc_type, ids in ids_by_type.items():
+            model = SEARCH_DOCUMENTS[doc_type][0]
+            for entity in model.query.filter(model.id.in_(ids)).all():
+                loaded[(doc_type, entity.id)] = entity
+
+        return [(doc_type, loaded[(doc_type, doc_id)]) for doc_type, doc_id in hits
+                if (doc_type, doc_id) in loaded]
+
+    def search(self, query: str, types: Optional[Iterable[str]] = None, limit: int = 20,
+               offset: int = 0, prefix: bool = False) -> Dict[str, Any]:
+        """
+        Serialized, ranked search results across the requested types.
+        """
+        from app.services.post_service import post_service
+
+        matches = self.search_entities(query, types, limit, offset, prefix)
+        posts = post_service.serialize_posts([entity for doc_type, entity in matches if doc_type == "post"])
+        post_data = {post["id"]: post for post in posts}
+
+        results = []
+        for doc_type, entity in matches:
+            data = post_data[entity.id] if doc_type == "post" else entity.to_dict()
+            results.append({"type": doc_type, "id": entity.id, "data": data})
+        return {"query": query, "results": results, "limit": limit, "offset": offset}
+
+    def reindex(self, types: Optional[Iterable[str]] = None, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Rebuild the index for the given types from the source tables, in
+        id-ordered batches committed one at a time. Returns documents indexed per type.
+        """
+        counts = {}
+        for doc_type in self._parse_types(types):
+            model = SEARCH_DOCUMENTS[doc_type][0]
+            search.clear(doc_type)
+            db.session.commit()
+
+            counts[doc_type] = 0
+            last_id = 0
+            while True:
+                batch = model.query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+                if not batch:
+                    break
+                for entity in batch:
+                    self.index(entity)
+                db.session.commit()
+                counts[doc_type] += len(batch)
+                last_id = batch[-1].id
+        return counts
+
+
+# --------------------------------------
+# Instance and Wrapper Functions
+# --------------------------------------
+
+search_service = SearchService()
+
+
+def search_all(query, types=None, limit=20, offset=0, prefix=False):
+    return search_service.search(query, types, limit, offset, prefix)
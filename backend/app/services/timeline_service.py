@@ -0,0 +1,176 @@
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.follow import Follow
+from app.models.post import Post
+from app.models.timeline_entry import TimelineEntry
+from app.models.user import User
+from app.services.post_service import post_service
+from app.utils.db_helpers import insert_or_ignore
+from app.utils.pagination import apply_keyset_seek, decode_cursor, encode_cursor
+
+
+class TimelineService:
+    """
+    Home timelines built with fan-out-on-write.
+
+    New posts are pushed into each follower's `timeline_entries` so reading a
+    feed is a single index seek. Authors with more than FEED_FANOUT_MAX_FOLLOWERS
+    followers are not fanned out; their posts are pulled at read time instead.
+    """
+
+    @staticmethod
+    def _fanout_limit() -> int:
+        return current_app.config.get("FEED_FANOUT_MAX_FOLLOWERS", 5000)
+
+    def fan_out_post(self, post_id: int, batch_size: Optional[int] = None) -> int:
+        """
+        Materialize a post into the author's and their followers' timelines.
+        Safe to retry: entries that already exist are skipped.
+
+        Returns:
+            int: Number of timeline rows attempted.
+        """
+        post = Post.query.get(post_id)
+        if not post:
+            return 0
+        batch_size = batch_size or current_app.config.get("FEED_FANOUT_BATCH_SIZE", 1000)
+
+        # Authors always see their own posts in their feed
+        written = self._insert_entries(post, [post.user_id])
+
+        author = User.query.get(post.user_id)
+        if author is None or (author.followers_count or 0) > self._fanout_limit():
+            return written
+
+        last_follower_id = 0
+        while True:
+            follower_ids = [
+                row.follower_id for row in
+                db.session.query(Follow.follower_id)
+                .filter(Follow.followed_id == post.user_id, Follow.follower_id > last_follower_id)
+                .order_by(Follow.follower_id)
+                .limit(batch_size)
+            ]
+            if not follower_ids:
+                break
+            written += self._insert_entries(post, follower_ids)
+            last_follower_id = follower_ids[-1]
+
+        return written
+
+    def _insert_entries(self, post: Post, user_ids: List[int]) -> int:
+        rows = [
+            {"user_id": user_id, "post_id": post.id, "author_id": post.user_id, "created_at": post.created_at}
+            for user_id in user_ids
+        ]
+        db.session.execute(insert_or_ignore(TimelineEntry), rows)
+        db.session.commit()
+        return len(rows)
+
+    def add_authors(self, user_id: int, author_ids: List[int], per_author: Optional[int] = None) -> int:
+        """
+        Backfill the recent posts of newly followed authors into a user's
+        timeline, so a follow shows up in the feed straight away. Authors
+        above the fan-out limit are skipped; their posts are pulled at read time.
+        Runs inside the caller's transaction; the caller commits.
+
+        Returns:
+            int: Number of timeline rows attempted.
+        """
+        if not author_ids:
+            return 0
+        per_author = per_author or current_app.config.get("FEED_FOLLOW_BACKFILL_POSTS", 20)
+
+        fanned_out = [
+            row.id for row in
+            db.session.query(User.id)
+            .filter(User.id.in_(author_ids), User.followers_count <= self._fanout_limit())
+        ]
+        rows = []
+        for author_id in fanned_out:
+            recent = db.session.query(Post.id, Post.created_at) \
+                .filter(Post.user_id == author_id) \
+                .order_by(Post.created_at.desc(), Post.id.desc()).limit(per_author)
+            rows += [
+                {"user_id": user_id, "post_id": post.id, "author_id": author_id, "created_at": post.created_at}
+                for post in recent
+            ]
+        if rows:
+            db.session.execute(insert_or_ignore(TimelineEntry), rows)
+        return len(rows)
+
+    def remove_authors(self, user_id: int, author_ids: List[int]) -> int:
+        """
+        Drop unfollowed authors' posts from a user's timeline.
+        Runs inside the caller's transaction; the caller commits.
+
+        Returns:
+            int: Number of timeline rows deleted.
+        """
+        if not author_ids:
+            return 0
+        return TimelineEntry.query.filter(
+            TimelineEntry.user_id == user_id, TimelineEntry.author_id.in_(author_ids)
+        ).delete(synchronize_session=False)
+
+    def get_home_feed(self, user_id: int, cursor: Optional[str] = None, per_page: int = 20) -> Dict[str, Any]:
+        """
+        Newest-first home feed: materialized entries merged with recent posts
+        from followed high-follower authors. Both sources are keyset seeks on
+        (created_at, post id), so the cost does not grow with timeline length.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        position = decode_cursor(cursor)
+        limit = per_page + 1
+
+        entries = db.session.query(TimelineEntry.created_at, TimelineEntry.post_id) \
+            .filter(TimelineEntry.user_id == user_id)
+        entries = apply_keyset_seek(entries, TimelineEntry.created_at, TimelineEntry.post_id, position)
+        candidates = [
+            tuple(row) for row in
+            entries.order_by(TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc()).limit(limit)
+        ]
+
+        pull_author_ids = [
+            row.id for row in
+            db.session.query(User.id)
+            .join(Follow, Follow.followed_id == User.id)
+            .filter(Follow.follower_id == user_id, User.followers_count > self._fanout_limit())
+        ]
+        if pull_author_ids:
+            pulled = db.session.query(Post.created_at, Post.id).filter(Post.user_id.in_(pull_author_ids))
+            pulled = apply_keyset_seek(pulled, Post.created_at, Post.id, position)
+            candidates += [
+                tuple(row) for row in
+                pulled.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+            ]
+
+        # A post can come from both sources if its author crossed the threshold after fan-out
+        merged = sorted(set(candidates), reverse=True)
+        has_next = len(merged) > per_page
+        merged = merged[:per_page]
+
+        posts_by_id = {}
+        if merged:
+            posts_by_id = {
+                post.id: post for post in
+                Post.query.filter(Post.id.in_([post_id for _, post_id in merged])).all()
+            }
+        posts = [posts_by_id[post_id] for _, post_id in merged if post_id in posts_by_id]
+
+        return {
+            "items": post_service.serialize_posts(posts),
+            "pagination": {
+                "per_page": per_page,
+                "has_next": has_next,
+                "next_cursor": encode_cursor(*merged[-1]) if has_next else None
+            }
+        }
+
+
+timeline_service = TimelineService()
@@ -0,0 +1,160 @@
+import heapq
+import threading
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+
+from app.extensions import db, pubsub
+from app.models.user import User
+from app.services.follow_service import follow_service
+from app.utils.typeahead import TypeaheadIndex
+
+# Index changes are broadcast here so every worker process stays in sync
+TYPEAHEAD_CHANNEL = "typeahead:users"
+MAX_SUGGESTIONS = 20
+
+_load_lock = threading.Lock()
+
+
+def _user_terms(username: str, full_name: Optional[str]) -> set:
+    terms = {username.lower()}
+    if full_name:
+        name = full_name.lower()
+        terms.add(name)
+        terms.update(name.split())
+    return terms
+
+
+def _user_payload(user) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "full_name": user.full_name,
+        "profile_image_url": user.profile_image_url,
+        "campus_id": user.campus_id,
+        "followers_count": user.followers_count or 0,
+    }
+
+
+class TypeaheadService:
+    """
+    Username / name suggestions (@mentions, user lookup) answered from an
+    in-memory prefix index instead of the database.
+
+    Each worker process builds its index on first use from a streamed scan
+    of the users table. After that, user changes arrive through pub/sub: the
+    writer applies them locally and publishes them for the other processes.
+    """
+
+    def _index(self) -> TypeaheadIndex:
+        return current_app.extensions.setdefault("typeahead", TypeaheadIndex())
+
+    def _ensure_loaded(self) -> TypeaheadIndex:
+        index = self._index()
+        if index.loaded:
+            return index
+        with _load_lock:
+            if not index.loaded:
+                # Subscribe before scanning: changes committed during the scan wait
+                # in the subscription and are replayed once the load is done
+                subscription = pubsub.subscribe(TYPEAHEAD_CHANNEL)
+                index.load(self._scan_users())
+                threading.Thread(target=self._consume, args=(index, subscription),
+                                 name="typeahead-sync", daemon=True).start()
+        return index
+
+    def _scan_users(self):
+        query = db.session.query(
+            User.id, User.username, User.full_name, User.profile_image_url, User.campus_id, User.followers_count
+        ).yield_per(1000)
+        for user in query:
+            yield user.id, _user_terms(user.username, user.full_name), _user_payload(user)
+
+    @staticmethod
+    def _apply(index: TypeaheadIndex, message: Dict[str, Any]) -> None:
+        if message["op"] == "upsert":
+            user = message["user"]
+            index.upsert(user["id"], _user_terms(user["username"], user["full_name"]), user)
+        elif message["op"] == "remove":
+            index.remove(message["user_id"])
+
+    def _consume(self, index: TypeaheadIndex, subscription) -> None:
+        try:
+            while True:
+                message = subscription.get(timeout=30)
+                if message is not None:
+                    self._apply(index, message)
+        except Exception as e:
+            # Missed updates can't be recovered; rebuild on the next request instead
+            print(f"[❌] Typeahead sync stopped, index will be rebuilt: {e}")
+            index.loaded = False
+            subscription.close()
+
+    def _publish(self, message: Dict[str, Any]) -> None:
+        index = self._index()
+        if index.loaded:
+            self._apply(index, message)
+        pubsub.publish(TYPEAHEAD_CHANNEL, message)
+
+    def user_changed(self, user: User) -> None:
+        """
+        Index a created or updated user. Call after committing.
+        """
+        self._publish({"op": "upsert", "user": _user_payload(user)})
+
+    def user_removed(self, user_id: int) -> None:
+        """
+        Drop a deleted user. Call after committing.
+        """
+        self._publish({"op": "remove", "user_id": user_id})
+
+    def suggest(self, query: str, viewer_id: Optional[int] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Users whose username, full name or any word of it starts with `query`
+        (a leading "@" is ignored). Exact username matches come first, then
+        people the viewer follows, people on the viewer's campus, and
+        finally the most followed.
+
+        Short prefixes can match more users than TYPEAHEAD_MAX_CANDIDATES;
+        the ranking then covers the first matches in term order plus every
+        matching user the viewer follows.
+        """
+        prefix = (query or "").strip().lstrip("@").lower()
+        if not prefix:
+            return []
+        limit = min(max(limit, 1), MAX_SUGGESTIONS)
+
+        index = self._ensure_loaded()
+        viewer = index.get(viewer_id) if viewer_id is not None else None
+        following = follow_service.following_ids(viewer_id) if viewer is not None else frozenset()
+        campus_id = viewer["campus_id"] if viewer is not None else None
+
+        def rank(user):
+            return (
+                user["username"].lower() == prefix,
+                user["id"] in following,
+                campus_id is not None and user["campus_id"] == campus_id,
+                user["followers_count"],
+            )
+
+        max_candidates = current_app.config.get("TYPEAHEAD_MAX_CANDIDATES", 5000)
+        candidates = {user["id"]: user for user in index.search(prefix, max_candidates)}
+        if following:
+            # Followed users rank high, so they must not be lost to the candidate cap
+            candidates.update((user["id"], user) for user in index.search_among(following, prefix))
+        candidates.pop(viewer_id, None)
+        return [
+            {key: user[key] for key in ("id", "username", "full_name", "profile_image_url")}
+            for user in heapq.nlargest(limit, candidates.values(), key=rank)
+        ]
+
+
+# --------------------------------------
+# Instance and Wrapper Functions
+# --------------------------------------
+
+typeahead_service = TypeaheadService()
+
+
+def suggest_users(query, viewer_id=None, limit=10):
+    return typeahead_service.suggest(query, viewer_id, limit)
@@ -1,8 +1,12 @@
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import IntegrityError
 
+from app.models.follow import Follow
 from app.models.user import User
-from app.extensions import db
+from app.extensions import db, cache
+from app.services.search_service import search_service
+from app.services.typeahead_service import typeahead_service
 
 
 class UserService:
@@ -20,15 +24,18 @@ class UserService:
         )
         try:
             db.session.add(user)
+            db.session.flush()
+            search_service.index(user)
             db.session.commit()
-            return user
         except IntegrityError:
             db.session.rollback()
             raise ValueError("User with that email or username already exists.")
+        typeahead_service.user_changed(user)
+        return user
 
     @staticmethod
     def get_user_by_id(user_id):
-        return User.query.get(user_id)
+        return cache.get_entity(User, user_id)
 
     @staticmethod
     def get_user_by_email(email):
@@ -51,15 +58,23 @@ class UserService:
             return None
         for key, value in update_fields.items():
             setattr(user, key, value)
+        search_service.index(user)
         db.session.commit()
+        cache.delete_entity(User, user_id)
+        typeahead_service.user_changed(user)
         return user
 
     @staticmethod
     def search_users(query, limit=10, offset=0):
-        search = f"%{query}%"
-        return User.query.filter(
-            (User.username.ilike(search)) | (User.email.ilike(search))
-        ).limit(limit).offset(offset).all()
+        """
+        Users ranked by how well their username, name and bio match `query`;
+        the last word matches as a prefix, for search-as-you-type. An empty
+        query lists users by id.
+        """
+        if not query or not query.strip():
+            return User.query.order_by(User.id).limit(limit).offset(offset).all()
+        matches = search_service.search_entities(query, ("user",), limit=limit, offset=offset, prefix=True)
+        return [user for _, user in matches]
 
     @staticmethod
     def deactivate_user(user_id):
@@ -68,6 +83,7 @@ class UserService:
             return False
         user.is_active = False  # Make sure User model has this field
         db.session.commit()
+        cache.delete_entity(User, user_id)
         return True
 
     @staticmethod
@@ -77,6 +93,28 @@ class UserService:
         """
         return User.query.all()
 
+    @staticmethod
+    def reconcile_follower_counts(batch_size=1000):
+        """
+        Recompute followers_count from the follows table in id-range batches,
+        rewriting only the rows that drifted. Returns the number of users corrected.
+        """
+        followers_total = select(func.count(Follow.id)).where(Follow.followed_id == User.id).scalar_subquery()
+
+        max_id = db.session.query(func.max(User.id)).scalar() or 0
+        corrected = 0
+        for start in range(0, max_id, batch_size):
+            result = db.session.execute(
+                update(User)
+                .where(User.id > start, User.id <= start + batch_size)
+                .where(User.followers_count != followers_total)
+                .values(followers_count=followers_total, updated_at=User.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            corrected += result.rowcount
+        return corrected
+
 
 def delete_user(user_id):
     """
@@ -85,8 +123,11 @@ def delete_user(user_id):
     user = User.query.get(user_id)
     if not user:
         return False
+    search_service.remove(user)
     db.session.delete(user)
     db.session.commit()
+    cache.delete_entity(User, user_id)
+    typeahead_service.user_removed(user_id)
     return True
 
 
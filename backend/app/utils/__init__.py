@@ -24,7 +24,7 @@ from .file_storage import (
 from .pagination import paginate_query
 
 from .image_optimizer import optimize_image
-from .video_optimizer import process_video_compression
+from .video_optimizer import transcode_video_hls
 
 __all__ = [
     "create_access_token",
@@ -35,5 +35,5 @@ __all__ = [
     "delete_file",
     "paginate_query",
     "optimize_image",
-    "process_video_compression"
+    "transcode_video_hls"
 ]
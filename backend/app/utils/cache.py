@@ -0,0 +1,225 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from flask import current_app, g, has_request_context
+from sqlalchemy import inspect
+
+
+class NullCacheBackend:
+    """
+    Backend that never stores anything (caching disabled).
+    """
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCacheBackend:
+    """
+    In-process LRU cache with per-entry TTL and a bound on the number of entries.
+
+    Values are stored pickled so every reader gets its own copy. Each worker
+    process has its own cache, so keep the TTL short when running several.
+    """
+
+    def __init__(self, max_entries=10000, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key, value, ttl=None):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Cache shared by all workers, stored in Redis with native key expiry.
+
+    Redis errors are treated as cache misses so an outage only costs the
+    database round trip it was meant to save.
+    """
+
+    def __init__(self, url, default_ttl=300, key_prefix="cache:"):
+        self.default_ttl = default_ttl
+        self.key_prefix = key_prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        try:
+            payload = self._client.get(self.key_prefix + key)
+        except redis.RedisError:
+            return None
+        return pickle.loads(payload) if payload is not None else None
+
+    def set(self, key, value, ttl=None):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            self._client.set(self.key_prefix + key, payload, ex=ttl or self.default_ttl)
+        except redis.RedisError:
+            pass
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        try:
+            self._client.delete(*(self.key_prefix + key for key in keys))
+        except redis.RedisError:
+            pass
+
+    def clear(self):
+        try:
+            for key in self._client.scan_iter(match=self.key_prefix + "*"):
+                self._client.delete(key)
+        except redis.RedisError:
+            pass
+
+
+class Cache:
+    """
+    Flask extension selecting a cache backend from app config:
+
+        CACHE_BACKEND       "lru" (default), "redis" or "null"
+        CACHE_DEFAULT_TTL   seconds an entry lives (default 300)
+        CACHE_MAX_ENTRIES   LRU size bound (default 10000)
+        CACHE_REDIS_URL     Redis URL for the "redis" backend
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_name = app.config.get("CACHE_BACKEND", "lru")
+        ttl = app.config.get("CACHE_DEFAULT_TTL", 300)
+
+        if backend_name == "redis":
+            if not app.config.get("CACHE_REDIS_URL"):
+                raise ValueError("CACHE_REDIS_URL must be set for the redis cache backend")
+            backend = RedisCacheBackend(app.config["CACHE_REDIS_URL"], default_ttl=ttl)
+        elif backend_name == "lru":
+            backend = LRUCacheBackend(app.config.get("CACHE_MAX_ENTRIES", 10000), default_ttl=ttl)
+        elif backend_name == "null":
+            backend = NullCacheBackend()
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND '{backend_name}'")
+
+        app.extensions["cache"] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions["cache"]
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(key, value, ttl)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def clear(self):
+        self.backend.clear()
+
+    # --- Entity (primary key) read-through ---
+
+    @staticmethod
+    def entity_key(model, pk):
+        return f"entity:{model.__tablename__}:{pk}"
+
+    @staticmethod
+    def _request_entities():
+        """
+        Identity map for the current request (None outside one): entities
+        already loaded by this request, keyed like the shared cache.
+        """
+        if not has_request_context():
+            return None
+        if "entity_map" not in g:
+            g.entity_map = {}
+        return g.entity_map
+
+    def get_entity(self, model, pk):
+        """
+        Read-through replacement for `Model.query.get(pk)`.
+
+        Within a request, repeated lookups of the same row return the instance
+        loaded first, skipping the shared cache (a Redis round trip and an
+        unpickle) as well as the database.
+
+        A hit is attached to the current session without a SELECT, so the
+        returned instance can be modified and committed as usual. Callers that
+        write to the row must call `delete_entity` after committing.
+        """
+        if pk is None:
+            return None
+        from app.extensions import db
+
+        key = self.entity_key(model, pk)
+        entities = self._request_entities()
+        if entities is not None and key in entities:
+            state = inspect(entities[key])
+            # A commit expires it and a delete or rollback detaches it; reload those
+            if not (state.expired or state.deleted or state.was_deleted or state.detached):
+                return entities[key]
+
+        cached = self.get(key)
+        if cached is not None:
+            instance = db.session.merge(cached, load=False)
+        else:
+            instance = db.session.get(model, pk)
+            # Only cache fully loaded rows; an expired instance would pickle without its columns
+            if instance is not None and not inspect(instance).expired_attributes:
+                self.set(key, instance)
+
+        if entities is not None and instance is not None:
+            entities[key] = instance
+        return instance
+
+    def delete_entity(self, model, *pks):
+        keys = [self.entity_key(model, pk) for pk in pks]
+        entities = self._request_entities()
+        if entities is not None:
+            for key in keys:
+                entities.pop(key, None)
+        self.delete(*keys)
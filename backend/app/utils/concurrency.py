@@ -0,0 +1,57 @@
+import fcntl
+import os
+import time
+from contextlib import contextmanager
+
+
+class SlotUnavailable(Exception):
+    """No slot became free within the wait time."""
+
+
+class FileSlotSemaphore:
+    """
+    Counting semaphore shared by every process on a host, built from `slots`
+    lock files under `lock_dir`. Celery prefork children are separate
+    processes, so a threading primitive would not bound them.
+
+    A slot is released when its holder exits or dies (the OS drops the lock),
+    so a crashed worker can never leak one.
+    """
+
+    def __init__(self, lock_dir, slots, poll_interval=0.5):
+        self.lock_dir = lock_dir
+        self.slots = max(1, slots)
+        self.poll_interval = poll_interval
+
+    def _try_acquire(self):
+        for slot in range(self.slots):
+            fd = os.open(os.path.join(self.lock_dir, f"slot-{slot}.lock"), os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """
+        Hold one slot for the duration of the block, waiting up to `timeout`
+        seconds (forever if None) for one to free up.
+
+        Raises:
+            SlotUnavailable: If the wait times out.
+        """
+        os.makedirs(self.lock_dir, exist_ok=True)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        fd = self._try_acquire()
+        while fd is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise SlotUnavailable(f"All {self.slots} slots busy")
+            time.sleep(self.poll_interval)
+            fd = self._try_acquire()
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
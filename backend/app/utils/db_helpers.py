@@ -0,0 +1,75 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy import inspect as sa_inspect
+
+from app.extensions import db
+
+
+def insert_or_ignore(model):
+    """
+    Build an INSERT for `model` that silently skips rows violating a unique
+    constraint, so bulk writes can be retried safely.
+
+    Uses ON CONFLICT DO NOTHING on PostgreSQL/SQLite and INSERT IGNORE on MySQL.
+    Execute it with a list of row dicts for a multi-row insert:
+        db.session.execute(insert_or_ignore(Model), rows)
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(model).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(model).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(model).prefix_with("IGNORE")
+
+    return insert(model)
+
+
+def insert_or_ignore_returning(model, rows, *columns):
+    """
+    Insert `rows` (a list of dicts) with `insert_or_ignore` and return
+    `columns` of the rows this call actually inserted, as tuples. Rows that
+    already existed, including ones a concurrent insert just added, are
+    left out, so callers can adjust counters from the result safely.
+
+    Uses INSERT ... RETURNING where supported (PostgreSQL, SQLite 3.35+).
+    Elsewhere (MySQL) rows are inserted one at a time and kept when the
+    statement's rowcount shows it wrote one. Runs inside the caller's
+    transaction; the caller commits.
+    """
+    if not rows:
+        return []
+    if db.session.get_bind().dialect.insert_returning:
+        stmt = insert_or_ignore(model).values(rows).returning(*columns)
+        return [tuple(row) for row in db.session.execute(stmt)]
+
+    inserted = []
+    for row in rows:
+        if db.session.execute(insert_or_ignore(model).values(row)).rowcount:
+            inserted.append(tuple(row[column.key] for column in columns))
+    return inserted
+
+
+def delete_returning(model, criteria, *columns):
+    """
+    Delete the `model` rows matching `criteria` (a list of conditions) and
+    return `columns` of the rows this call actually deleted, as tuples. Of
+    two concurrent deletes of the same row only one reports it, so callers
+    can adjust counters from the result safely.
+
+    Uses DELETE ... RETURNING where supported (PostgreSQL, SQLite 3.35+).
+    Elsewhere (MySQL) the rows are read with SELECT ... FOR UPDATE and
+    deleted by primary key. Runs inside the caller's transaction; the caller commits.
+    """
+    if db.session.get_bind().dialect.delete_returning:
+        stmt = delete(model).where(*criteria).returning(*columns).execution_options(synchronize_session=False)
+        return [tuple(row) for row in db.session.execute(stmt)]
+
+    pk = sa_inspect(model).primary_key[0]
+    rows = db.session.execute(select(pk, *columns).where(*criteria).with_for_update()).all()
+    if rows:
+        db.session.execute(delete(model).where(pk.in_([row[0] for row in rows]))
+                           .execution_options(synchronize_session=False))
+    return [tuple(row[1:]) for row in rows]
@@ -1,7 +1,12 @@
+import hashlib
+import mimetypes
 import os
 import uuid
+from datetime import timezone
+from werkzeug.http import is_resource_modified
 from werkzeug.utils import secure_filename
-from flask import current_app
+from flask import Response, current_app, redirect, request
+from app.utils.storage import STREAM_BUFFER_SIZE, current_storage
 
 # Allowed extensions for different media types
 ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
@@ -17,13 +22,22 @@ def allowed_file(filename: str, allowed_set: set = ALLOWED_EXTENSIONS) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_set
 
 
+def get_upload_root():
+    """
+    Local base directory (UPLOAD_FOLDER, else MEDIA_UPLOAD_PATH). Holds the
+    media itself with the local storage backend, and always the partial files
+    of chunked uploads.
+    """
+    return current_app.config.get("UPLOAD_FOLDER") or current_app.config.get("MEDIA_UPLOAD_PATH", "uploads")
+
+
 def save_file_to_storage(file, subdir="uploads"):
     """
-    Save a file to the designated uploads directory.
+    Save a file to the configured storage backend.
 
     Args:
         file (FileStorage): File from request.files
-        subdir (str): Subdirectory within the UPLOAD_FOLDER (e.g., 'images', 'videos')
+        subdir (str): Subdirectory within the storage root (e.g., 'images', 'videos')
 
     Returns:
         str: Relative file path (e.g., 'uploads/images/abc123.jpg')
@@ -34,36 +48,234 @@ def save_file_to_storage(file, subdir="uploads"):
         unique_filename = f"{uuid.uuid4().hex}.{ext}"
         secure_name = secure_filename(unique_filename)
 
-        # Create subfolder path
-        upload_base = current_app.config.get("UPLOAD_FOLDER", "uploads")
-        target_folder = os.path.join(upload_base, subdir)
-
-        os.makedirs(target_folder, exist_ok=True)
-
-        file_path = os.path.join(target_folder, secure_name)
-        file.save(file_path)
-
-        # Return the relative path to store in DB
-        return os.path.relpath(file_path, start=upload_base)
+        relative_path = os.path.join(subdir, secure_name)
+        return current_storage.save(relative_path, file.stream)
 
     raise ValueError("File type not allowed or no file provided.")
 
 
-def delete_file(relative_path, upload_root=None):
+def delete_file(relative_path):
     """
     Deletes a file from storage, given a relative path.
 
     Args:
-        relative_path (str): Path relative to UPLOAD_FOLDER
-        upload_root (str): Base upload folder (optional, from config)
+        relative_path (str): Path relative to the storage root
 
     Returns:
         bool: True if deleted successfully, False if not found
     """
-    upload_base = upload_root or current_app.config.get("UPLOAD_FOLDER", "uploads")
-    abs_path = os.path.join(upload_base, relative_path)
+    return current_storage.delete(relative_path)
+
+
+# --- Chunked uploads ---
+
+def create_partial_file(upload_id):
+    """
+    Create the empty file a chunked upload is streamed into.
+
+    Returns:
+        str: Path relative to the upload root (e.g., 'partial/<upload_id>.part')
+    """
+    upload_base = get_upload_root()
+    target_folder = os.path.join(upload_base, "partial")
+    os.makedirs(target_folder, exist_ok=True)
+
+    file_path = os.path.join(target_folder, f"{secure_filename(upload_id)}.part")
+    open(file_path, "wb").close()
+    return os.path.relpath(file_path, start=upload_base)
+
+
+def write_chunk(relative_path, stream, offset, length):
+    """
+    Stream up to `length` bytes from `stream` into the file at `offset`
+    without buffering the chunk in memory or a temp file.
+
+    Returns:
+        tuple: (bytes written, exception raised while reading or None). Bytes
+        written before a client disconnect are kept so the upload can resume.
+    """
+    abs_path = os.path.join(get_upload_root(), relative_path)
+    written = 0
+    error = None
+    with open(abs_path, "r+b") as target:
+        target.seek(offset)
+        try:
+            while written < length:
+                data = stream.read(min(STREAM_BUFFER_SIZE, length - written))
+                if not data:
+                    break
+                target.write(data)
+                written += len(data)
+        except Exception as e:
+            error = e
+        # Drop anything past the new end left by an earlier, abandoned attempt
+        target.truncate(offset + written)
+    return written, error
+
+
+def file_sha256(relative_path):
+    """Hex SHA-256 of a stored file, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(os.path.join(get_upload_root(), relative_path), "rb") as source:
+        for block in iter(lambda: source.read(STREAM_BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 
+def get_partial_file_path(relative_path):
+    """Local filesystem path of a partial upload file (for tools that need one)."""
+    return os.path.join(get_upload_root(), relative_path)
+
+
+def delete_partial_file(relative_path):
+    """Remove a partial upload file; False if it was already gone."""
+    abs_path = os.path.join(get_upload_root(), relative_path)
     if os.path.exists(abs_path):
         os.remove(abs_path)
         return True
     return False
+
+
+def store_partial_file(relative_path, target_path):
+    """
+    Hand a completed partial upload to the storage backend at `target_path`.
+    The partial file is consumed: renamed into place on local storage,
+    uploaded and removed otherwise.
+    """
+    abs_path = os.path.join(get_upload_root(), relative_path)
+    return current_storage.save_file(target_path, abs_path, move=True)
+
+
+# --- Content-addressed blobs ---
+
+def blob_path(sha256, ext):
+    """
+    Storage path of the blob with content hash `sha256`, sharded two levels
+    deep so no directory grows past a few thousand entries
+    (e.g. 'blobs/ab/cd/abcd1234....jpg').
+    """
+    return os.path.join("blobs", sha256[:2], sha256[2:4], secure_filename(f"{sha256}.{ext}"))
+
+
+def hash_stream(stream):
+    """
+    SHA-256 and size of a seekable stream, read in fixed-size blocks.
+    The stream is rewound afterwards so it can still be saved.
+
+    Returns:
+        tuple: (hex digest, size in bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    stream.seek(0)
+    for block in iter(lambda: stream.read(STREAM_BUFFER_SIZE), b""):
+        digest.update(block)
+        size += len(block)
+    stream.seek(0)
+    return digest.hexdigest(), size
+
+
+def save_stream(stream, relative_path):
+    """Stream a readable binary object into storage at `relative_path`."""
+    return current_storage.save(relative_path, stream)
+
+
+# --- Serving ---
+
+# One year, the longest lifetime HTTP caches honour
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def _if_range_matches(etag, last_modified):
+    """Whether a Range should be honoured given the request's If-Range (if any)."""
+    if_range = request.if_range
+    if if_range.etag is not None:
+        return if_range.etag == etag
+    if if_range.date is not None:
+        return last_modified.replace(microsecond=0) <= if_range.date
+    return True
+
+
+def send_stored_file(relative_path, etag=None, last_modified=None, immutable=False, max_age=None):
+    """
+    Build a response serving a stored file, with support for:
+
+    - conditional GETs: ETag / Last-Modified validators and 304 responses
+    - single byte ranges: 206 Partial Content (e.g. video seeking), 416 when unsatisfiable
+    - Cache-Control: `immutable` for content-addressed paths, else `max_age`
+    - offloading the transfer, per MEDIA_SERVE_MODE:
+        "stream"      the app streams the bytes from the storage backend (default)
+        "x-accel"     nginx serves MEDIA_ACCEL_REDIRECT_PREFIX + path (X-Accel-Redirect)
+        "x-sendfile"  Apache/lighttpd serve the local file (X-Sendfile; local backend only)
+        "redirect"    302 to a presigned backend URL where the backend has them
+
+    Args:
+        relative_path (str): Storage path of the file
+        etag (str): Strong validator; derived from size and mtime if omitted
+        last_modified (datetime): Defaults to the stored file's mtime
+        immutable (bool): The path's content never changes
+        max_age (int): Cache lifetime for mutable paths (default MEDIA_CACHE_MAX_AGE)
+
+    Returns:
+        Response, or None if the file does not exist.
+    """
+    stat = current_storage.stat(relative_path)
+    if stat is None:
+        return None
+
+    size = stat["size"]
+    last_modified = last_modified or stat["modified"]
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    etag = etag or f"{size:x}-{int(last_modified.timestamp()):x}"
+
+    response = Response(mimetype=mimetypes.guess_type(relative_path)[0] or "application/octet-stream")
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.accept_ranges = "bytes"
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age if max_age is not None else \
+            current_app.config.get("MEDIA_CACHE_MAX_AGE", 3600)
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response.status_code = 304
+        return response
+
+    mode = current_app.config.get("MEDIA_SERVE_MODE", "stream")
+    if mode == "redirect":
+        url = current_storage.url(relative_path)
+        if url:
+            return redirect(url, 302)
+    elif mode == "x-accel":
+        # nginx handles Range itself from the original request headers
+        prefix = current_app.config.get("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+        response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + relative_path.replace(os.sep, "/")
+        return response
+    elif mode == "x-sendfile" and current_app.config.get("STORAGE_BACKEND", "local") == "local":
+        response.headers["X-Sendfile"] = os.path.abspath(os.path.join(get_upload_root(), relative_path))
+        return response
+
+    start, length = 0, size
+    byte_range = request.range
+    if byte_range is not None and len(byte_range.ranges) == 1 and _if_range_matches(etag, last_modified):
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            response.status_code = 416
+            response.content_range = f"bytes */{size}"
+            return response
+        start, stop = bounds
+        length = stop - start
+        response.status_code = 206
+        response.content_range = f"bytes {start}-{stop - 1}/{size}"
+
+    response.content_length = length
+    if request.method != "HEAD":
+        # The stored file is closed by the WSGI server when the response finishes
+        response.response = current_storage.open(relative_path, start, length)
+        response.direct_passthrough = True
+    return response
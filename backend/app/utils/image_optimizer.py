@@ -1,6 +1,9 @@
+import math
 import os
-from PIL import Image
+import tempfile
+from PIL import Image, ImageOps
 from flask import current_app
+from app.utils.storage import current_storage
 
 
 def optimize_image(file_path, output_path=None, quality=75, max_size=None):
@@ -24,7 +27,7 @@ def optimize_image(file_path, output_path=None, quality=75, max_size=None):
             img_format = img.format  # Preserve original format
 
             if max_size:
-                img.thumbnail(max_size, Image.ANTIALIAS)
+                img.thumbnail(max_size, Image.LANCZOS)
 
             # Default output to same file path (overwrite)
             output_path = output_path or file_path
@@ -44,3 +47,166 @@ def optimize_image(file_path, output_path=None, quality=75, max_size=None):
 
     except Exception as e:
         raise RuntimeError(f"Failed to optimize image: {str(e)}")
+
+
+def optimize_stored_image(relative_path, output_path, quality=75, max_size=None):
+    """
+    Optimizes an image held in media storage and stores the result.
+
+    Args:
+        relative_path (str): Storage path of the source image.
+        output_path (str): Storage path for the optimized image. Stored originals
+            are content-addressed, so it must differ from `relative_path`.
+        quality (int): JPEG/WebP quality (1–100). Default is 75.
+        max_size (tuple): Optional (width, height) max dimensions.
+
+    Returns:
+        str: Storage path of the optimized image.
+    """
+    if output_path == relative_path:
+        raise ValueError("Stored images cannot be optimized in place.")
+
+    with current_storage.local_copy(relative_path) as source, tempfile.TemporaryDirectory() as work_dir:
+        local_output = optimize_image(source, os.path.join(work_dir, os.path.basename(output_path)),
+                                      quality=quality, max_size=max_size)
+        # Unsupported formats are converted to JPEG, which changes the extension
+        output_path = os.path.join(os.path.dirname(output_path), os.path.basename(local_output))
+        return current_storage.save_file(output_path, local_output, move=True)
+
+
+# --- Responsive variants ---
+
+VARIANT_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+
+
+def create_image_variants(file_path, output_dir, widths=(320, 640, 1280), formats=("webp", "jpeg"), quality=75):
+    """
+    Decodes an image once and writes resized copies for responsive delivery.
+
+    JPEGs are decoded with `draft()`, so libjpeg scales down by 1/2..1/8 while
+    decoding instead of producing full-resolution pixels first. Each smaller
+    width is resized from the previous one. Widths at or above the original's
+    are skipped (the original width is used if all of them are).
+
+    Args:
+        file_path (str): Absolute path to the input image.
+        output_dir (str): Directory for the variant files.
+        widths (iterable): Target widths in pixels.
+        formats (iterable): Output formats, from VARIANT_FORMATS.
+        quality (int): Encoder quality (1–100).
+
+    Returns:
+        dict: {"width", "height", "placeholder" (blurhash), "images": [{"width",
+        "height", "format", "file", "size"}]}. Animated images get no variants.
+    """
+    with Image.open(file_path) as img:
+        original_width, original_height = img.size
+        if img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+            # EXIF orientation rotates by 90 degrees; report the displayed size
+            original_width, original_height = original_height, original_width
+        if img.format == "JPEG":
+            largest = min(max(widths), original_width)
+            img.draft("RGB", (largest, largest))
+
+        animated = getattr(img, "is_animated", False)
+        img = ImageOps.exif_transpose(img).convert("RGB")
+
+    result = {
+        "width": original_width,
+        "height": original_height,
+        "placeholder": encode_blurhash(img),
+        "images": [],
+    }
+    if animated:
+        return result
+
+    targets = sorted({w for w in widths if w < original_width} or {original_width}, reverse=True)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    current = img
+    for target_width in targets:
+        target_height = max(1, round(target_width * current.height / current.width))
+        if current.width != target_width:
+            current = current.resize((target_width, target_height), Image.LANCZOS)
+        for fmt in formats:
+            out_path = os.path.join(output_dir, f"{name}_w{target_width}.{fmt}")
+            current.save(out_path, format=VARIANT_FORMATS[fmt], quality=quality, optimize=True)
+            result["images"].append({
+                "width": target_width,
+                "height": target_height,
+                "format": fmt,
+                "file": out_path,
+                "size": os.path.getsize(out_path),
+            })
+    return result
+
+
+# --- Blurhash (https://blurha.sh) ---
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _base83(value, length):
+    return "".join(_BASE83[(value // 83 ** (length - i)) % 83] for i in range(1, length + 1))
+
+
+def _srgb_to_linear(value):
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value):
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value, exp):
+    return math.copysign(abs(value) ** exp, value)
+
+
+def encode_blurhash(img, x_components=4, y_components=3):
+    """
+    Encodes a ~20-character blurhash placeholder that clients render as a
+    blurred preview while the real image loads. Works on a 32px thumbnail,
+    so the cost does not depend on the image size.
+    """
+    small = img.convert("RGB")
+    small.thumbnail((32, 32))
+    width, height = small.size
+    pixels = [tuple(_srgb_to_linear(c) for c in px) for px in small.getdata()]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                basis_y = math.cos(math.pi * j * y / height)
+                row = y * width
+                for x in range(width):
+                    basis = normalisation * math.cos(math.pi * i * x / width) * basis_y
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = 1 / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    blurhash = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(v) for factor in ac for v in factor)
+        quantised_max = max(0, min(82, int(math.floor(actual_max * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        blurhash += _base83(quantised_max, 1)
+    else:
+        max_value = 1
+        blurhash += _base83(0, 1)
+
+    blurhash += _base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        r, g, b = (max(0, min(18, int(math.floor(_sign_pow(v / max_value, 0.5) * 9 + 9.5)))) for v in factor)
+        blurhash += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return blurhash
@@ -0,0 +1,77 @@
+import subprocess
+
+from PIL import Image
+
+from app.utils.video_optimizer import probe_video
+
+# Formats Pillow / ffprobe must report for each accepted extension
+IMAGE_FORMATS = {'png': 'PNG', 'jpg': 'JPEG', 'jpeg': 'JPEG', 'gif': 'GIF'}
+VIDEO_CONTAINERS = {'mp4': 'mp4', 'mov': 'mov', 'avi': 'avi', 'mkv': 'matroska'}
+
+
+def probe_image(source, ext):
+    """
+    Read an image's format and dimensions from its header. Pillow opens
+    lazily, so no pixel data is decoded however large the image is.
+
+    Args:
+        source: Path or seekable binary stream (rewound afterwards).
+        ext (str): The upload's file extension.
+
+    Returns:
+        dict: {"width", "height", "duration", "codec"} (duration is None)
+
+    Raises:
+        ValueError: If the content is not an image or not the format its extension claims.
+    """
+    try:
+        with Image.open(source) as img:
+            image_format = img.format
+            width, height = img.size
+            if img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+                width, height = height, width
+    except Exception as e:
+        raise ValueError("File is not a valid image.") from e
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+    if image_format != IMAGE_FORMATS.get(ext):
+        raise ValueError(f"File content ({image_format}) does not match its .{ext} extension.")
+    return {"width": width, "height": height, "duration": None, "codec": image_format.lower()}
+
+
+def probe_video_file(path, ext):
+    """
+    Read a video's dimensions, duration and codec with ffprobe (headers only).
+
+    Returns:
+        dict: {"width", "height", "duration", "codec"}, or None if ffprobe is
+        not installed on this host.
+
+    Raises:
+        ValueError: If the content is not a video or not the container its extension claims.
+    """
+    try:
+        probe = probe_video(path)
+    except FileNotFoundError:
+        return None
+    except subprocess.CalledProcessError as e:
+        raise ValueError("File is not a valid video.") from e
+
+    # ffprobe reports a family of names, e.g. "mov,mp4,m4a,3gp,3g2,mj2"
+    if VIDEO_CONTAINERS.get(ext) not in probe["format"].split(","):
+        raise ValueError(f"File content ({probe['format']}) does not match its .{ext} extension.")
+    return {key: probe[key] for key in ("width", "height", "duration", "codec")}
+
+
+def probe_media(source, media_type, ext):
+    """
+    Probe an upload before it is stored or processed. Images may be given
+    as a stream; videos need a local path for ffprobe.
+    """
+    if media_type == "image":
+        return probe_image(source, ext)
+    if media_type == "video":
+        return probe_video_file(source, ext)
+    return None
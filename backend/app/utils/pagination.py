@@ -1,17 +1,87 @@
+import base64
+import json
+from datetime import datetime
+
 from flask import request
 from math import ceil
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_value, row_id):
+    """
+    Encode a keyset position (sort column value, row id) as an opaque, URL-safe cursor.
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Returns:
+        tuple | None: (datetime, int) position, or None for an empty cursor (first page).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def apply_keyset_seek(query, sort_column, id_column, position, descending=True):
+    """
+    Filter a query to rows strictly after a keyset position in (sort_column, id_column) order.
+
+    Args:
+        position (tuple | None): (sort value, id) as returned by `decode_cursor`; None is a no-op.
+    """
+    if position is None:
+        return query
+
+    sort_value, row_id = position
+    if descending:
+        return query.filter(or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id)
+        ))
+    return query.filter(or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > row_id)
+    ))
 
 
-def paginate_query(query, page=None, per_page=None, max_per_page=100, item_serializer=None):
+def paginate_query(query, page=None, per_page=None, max_per_page=100, item_serializer=None,
+                   batch_serializer=None, cursor=None, keyset=None, descending=True):
     """
     Paginate a SQLAlchemy query and return structured data with metadata.
 
+    Two modes are supported:
+    - Offset mode (default): page/per_page with a total count.
+    - Cursor mode (when `keyset` is given): seeks past the position in `cursor`
+      using the (sort column, id) index, skipping the COUNT(*) and OFFSET scan.
+      An empty/None cursor returns the first page.
+
     Args:
         query (db.Query): SQLAlchemy query object.
         page (int): Page number (optional, default: from request args).
         per_page (int): Items per page (optional, default: from request args).
         max_per_page (int): Upper limit on per_page to prevent abuse.
         item_serializer (callable): Function to convert model instance to dict. Defaults to `.to_dict()`.
+        batch_serializer (callable): Function converting the whole page of items at once
+            (e.g. to preload related data in grouped queries). Takes precedence over item_serializer.
+        cursor (str): Opaque cursor returned as `next_cursor` by the previous page (cursor mode).
+        keyset (tuple): (sort_column, id_column) model attributes to paginate on, e.g.
+            (Post.created_at, Post.id). Enables cursor mode; any existing ordering is replaced.
+        descending (bool): Cursor mode only; newest first when True.
 
     Returns:
         dict: {
@@ -25,24 +95,29 @@ def paginate_query(query, page=None, per_page=None, max_per_page=100, item_seria
                 "has_prev": bool
             }
         }
+        In cursor mode "pagination" is {"per_page": int, "has_next": bool, "next_cursor": str | None}.
 
     Raises:
-        ValueError: For invalid page/per_page input.
+        ValueError: For invalid page/per_page input or a malformed cursor.
     """
     try:
-        page = page or int(request.args.get("page", 1))
         per_page = per_page or int(request.args.get("per_page", 20))
+        if per_page < 1:
+            raise ValueError("page and per_page must be positive integers")
+        per_page = min(per_page, max_per_page)
+
+        if keyset is not None:
+            return _paginate_keyset(query, keyset, cursor, per_page, descending,
+                                    item_serializer, batch_serializer)
 
-        if page < 1 or per_page < 1:
+        page = page or int(request.args.get("page", 1))
+        if page < 1:
             raise ValueError("page and per_page must be positive integers")
 
-        per_page = min(per_page, max_per_page)
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
-        serializer = item_serializer or (lambda item: item.to_dict())
-
         return {
-            "items": [serializer(item) for item in pagination.items],
+            "items": _serialize(pagination.items, item_serializer, batch_serializer),
             "pagination": {
                 "total": pagination.total,
                 "page": pagination.page,
@@ -55,3 +130,39 @@ def paginate_query(query, page=None, per_page=None, max_per_page=100, item_seria
 
     except Exception as e:
         raise ValueError(f"Pagination failed: {str(e)}")
+
+
+def _paginate_keyset(query, keyset, cursor, per_page, descending, item_serializer, batch_serializer):
+    sort_column, id_column = keyset
+    query = apply_keyset_seek(query, sort_column, id_column, decode_cursor(cursor), descending)
+
+    if descending:
+        query = query.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(None).order_by(sort_column.asc(), id_column.asc())
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return {
+        "items": _serialize(rows, item_serializer, batch_serializer),
+        "pagination": {
+            "per_page": per_page,
+            "has_next": has_next,
+            "next_cursor": next_cursor
+        }
+    }
+
+
+def _serialize(items, item_serializer, batch_serializer):
+    if batch_serializer:
+        return batch_serializer(items)
+    serializer = item_serializer or (lambda item: item.to_dict())
+    return [serializer(item) for item in items]
@@ -0,0 +1,156 @@
+import json
+import queue
+import threading
+
+import redis
+from flask import current_app
+
+
+class InMemorySubscription:
+    def __init__(self, hub, channel, max_pending):
+        self._hub = hub
+        self.channel = channel
+        self._queue = queue.Queue(maxsize=max_pending)
+
+    def _deliver(self, payload):
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            # Slow consumer; drop rather than block publishers. Clients catch up on reconnect.
+            pass
+
+    def get(self, timeout=None):
+        """
+        Wait up to `timeout` seconds for the next message; None on timeout.
+        """
+        try:
+            return json.loads(self._queue.get(timeout=timeout))
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._hub._unsubscribe(self)
+
+
+class InMemoryPubSub:
+    """
+    Pub/sub within a single process. Only subscribers in the same worker
+    receive messages, so use the Redis backend when running several workers.
+    """
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        payload = json.dumps(message)
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription._deliver(payload)
+        return len(subscribers)
+
+    def subscribe(self, channel):
+        subscription = InMemorySubscription(self, channel, self.max_pending)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+class RedisSubscription:
+    def __init__(self, client, channel):
+        self.channel = channel
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+
+    def get(self, timeout=None):
+        """
+        Wait up to `timeout` seconds for the next message; None on timeout.
+        """
+        message = self._pubsub.get_message(timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    def close(self):
+        try:
+            self._pubsub.close()
+        except redis.RedisError:
+            pass
+
+
+class RedisPubSub:
+    """
+    Pub/sub across processes and hosts through Redis channels.
+
+    Publishing failures are swallowed (and reported as zero receivers) so a
+    Redis outage never fails the write that triggered the message.
+    """
+
+    def __init__(self, url, channel_prefix="pubsub:"):
+        self.channel_prefix = channel_prefix
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        try:
+            return self._client.publish(self.channel_prefix + channel, json.dumps(message))
+        except redis.RedisError:
+            return 0
+
+    def subscribe(self, channel):
+        return RedisSubscription(self._client, self.channel_prefix + channel)
+
+
+class PubSub:
+    """
+    Flask extension selecting a pub/sub backend from app config:
+
+        PUBSUB_BACKEND      "memory" (default) or "redis"
+        PUBSUB_REDIS_URL    Redis URL for the "redis" backend
+        PUBSUB_MAX_PENDING  per-subscriber queue bound for the "memory" backend
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_name = app.config.get("PUBSUB_BACKEND", "memory")
+
+        if backend_name == "redis":
+            if not app.config.get("PUBSUB_REDIS_URL"):
+                raise ValueError("PUBSUB_REDIS_URL must be set for the redis pub/sub backend")
+            backend = RedisPubSub(app.config["PUBSUB_REDIS_URL"])
+        elif backend_name == "memory":
+            backend = InMemoryPubSub(app.config.get("PUBSUB_MAX_PENDING", 1000))
+        else:
+            raise ValueError(f"Unknown PUBSUB_BACKEND '{backend_name}'")
+
+        app.extensions["pubsub"] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions["pubsub"]
+
+    def publish(self, channel, message):
+        """
+        Publish a JSON-serializable message. Returns the number of receivers
+        (as reported by the backend).
+        """
+        return self.backend.publish(channel, message)
+
+    def subscribe(self, channel):
+        """
+        Subscribe to a channel. Call `.get(timeout)` on the result to receive
+        messages and `.close()` when done.
+        """
+        return self.backend.subscribe(channel)
@@ -0,0 +1,227 @@
+import re
+
+from flask import current_app
+from sqlalchemy import bindparam, event, text
+
+
+# Searchable document types. The position fixes each type's code in the
+# SQLite rowid encoding, so only ever append to this tuple.
+DOC_TYPES = ("user", "post", "group", "event")
+
+# Longest query (in words) that is passed on to the index
+MAX_QUERY_TERMS = 8
+
+
+def query_terms(query):
+    """
+    Split user input into lowercase words; punctuation and operators are
+    dropped, so nothing the user types is interpreted as query syntax.
+    """
+    return re.findall(r"\w+", (query or "").lower())[:MAX_QUERY_TERMS]
+
+
+class SQLiteSearchBackend:
+    """
+    SQLite FTS5 index (dev and tests). Every document is one row of the
+    `search_index` virtual table, ranked with bm25 and title matches weighted
+    above body matches. The rowid encodes (doc_type, doc_id), so updating or
+    removing a document is a rowid lookup rather than a scan.
+    """
+
+    dialect = "sqlite"
+
+    def create_schema(self, connection):
+        # prefix= keeps 2- and 3-character prefix indexes for typeahead queries
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "doc_type UNINDEXED, doc_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+
+    def drop_schema(self, connection):
+        connection.execute(text("DROP TABLE IF EXISTS search_index"))
+
+    @staticmethod
+    def _rowid(doc_type, doc_id):
+        return doc_id * 8 + DOC_TYPES.index(doc_type)
+
+    def index(self, session, doc_type, doc_id, title, body):
+        session.execute(
+            text("INSERT OR REPLACE INTO search_index (rowid, doc_type, doc_id, title, body) "
+                 "VALUES (:rowid, :doc_type, :doc_id, :title, :body)"),
+            {"rowid": self._rowid(doc_type, doc_id), "doc_type": doc_type, "doc_id": doc_id,
+             "title": title or "", "body": body or ""}
+        )
+
+    def remove(self, session, doc_type, doc_id):
+        session.execute(text("DELETE FROM search_index WHERE rowid = :rowid"),
+                        {"rowid": self._rowid(doc_type, doc_id)})
+
+    def clear(self, session, doc_type):
+        session.execute(text("DELETE FROM search_index WHERE doc_type = :doc_type"), {"doc_type": doc_type})
+
+    def search(self, session, terms, doc_types, limit, offset, prefix):
+        phrases = [f'"{term}"' for term in terms]
+        if prefix:
+            phrases[-1] += "*"
+        statement = text(
+            "SELECT doc_type, doc_id FROM search_index "
+            "WHERE search_index MATCH :match AND doc_type IN :doc_types "
+            # bm25 weights follow column order: doc_type, doc_id, title, body (lower ranks first)
+            "ORDER BY bm25(search_index, 0.0, 0.0, 10.0, 1.0), rowid DESC "
+            "LIMIT :limit OFFSET :offset"
+        ).bindparams(bindparam("doc_types", expanding=True))
+        rows = session.execute(statement, {"match": " ".join(phrases), "doc_types": list(doc_types),
+                                           "limit": limit, "offset": offset})
+        return [(row.doc_type, int(row.doc_id)) for row in rows]
+
+
+class PostgresSearchBackend:
+    """
+    Postgres full-text index (production): one `search_documents` row per
+    document holding a weighted tsvector (title A, body B) under a GIN index,
+    ranked with ts_rank_cd. Prefix queries use the `:*` tsquery operator,
+    which the GIN index serves as well.
+    """
+
+    dialect = "postgresql"
+
+    def __init__(self, config="simple"):
+        # "simple" does no stemming, which suits names and mixed-language content
+        self.config = config
+
+    def create_schema(self, connection):
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS search_documents ("
+            "doc_type VARCHAR(20) NOT NULL, doc_id INTEGER NOT NULL, document TSVECTOR NOT NULL, "
+            "PRIMARY KEY (doc_type, doc_id))"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_search_documents_document "
+            "ON search_documents USING GIN (document)"
+        ))
+
+    def drop_schema(self, connection):
+        connection.execute(text("DROP TABLE IF EXISTS search_documents"))
+
+    def index(self, session, doc_type, doc_id, title, body):
+        session.execute(
+            text("INSERT INTO search_documents (doc_type, doc_id, document) VALUES (:doc_type, :doc_id, "
+                 "setweight(to_tsvector(CAST(:config AS regconfig), :title), 'A') || "
+                 "setweight(to_tsvector(CAST(:config AS regconfig), :body), 'B')) "
+                 "ON CONFLICT (doc_type, doc_id) DO UPDATE SET document = EXCLUDED.document"),
+            {"doc_type": doc_type, "doc_id": doc_id, "config": self.config,
+             "title": title or "", "body": body or ""}
+        )
+
+    def remove(self, session, doc_type, doc_id):
+        session.execute(text("DELETE FROM search_documents WHERE doc_type = :doc_type AND doc_id = :doc_id"),
+                        {"doc_type": doc_type, "doc_id": doc_id})
+
+    def clear(self, session, doc_type):
+        session.execute(text("DELETE FROM search_documents WHERE doc_type = :doc_type"), {"doc_type": doc_type})
+
+    def search(self, session, terms, doc_types, limit, offset, prefix):
+        lexemes = [f"'{term}'" for term in terms]
+        if prefix:
+            lexemes[-1] += ":*"
+        statement = text(
+            "SELECT doc_type, doc_id FROM search_documents, "
+            "to_tsquery(CAST(:config AS regconfig), :query) AS query "
+            "WHERE document @@ query AND doc_type IN :doc_types "
+            "ORDER BY ts_rank_cd(document, query) DESC, doc_id DESC "
+            "LIMIT :limit OFFSET :offset"
+        ).bindparams(bindparam("doc_types", expanding=True))
+        rows = session.execute(statement, {"config": self.config, "query": " & ".join(lexemes),
+                                           "doc_types": list(doc_types), "limit": limit, "offset": offset})
+        return [(row.doc_type, row.doc_id) for row in rows]
+
+
+def _create_search_schema(target, connection, **kw):
+    backend = current_app.extensions["search"].get(connection.dialect.name)
+    if backend is not None:
+        backend.create_schema(connection)
+
+
+def _drop_search_schema(target, connection, **kw):
+    backend = current_app.extensions["search"].get(connection.dialect.name)
+    if backend is not None:
+        backend.drop_schema(connection)
+
+
+class Search:
+    """
+    Flask extension for full-text search. The index lives in the application
+    database, so it is updated in the same transaction as the rows it covers;
+    the backend follows the database dialect:
+
+        sqlite      FTS5 virtual table
+        postgresql  tsvector column with a GIN index
+
+    Config:
+        SEARCH_PG_CONFIG    Postgres text search configuration (default "simple")
+
+    `db.create_all()` creates the index schema as well; migrated databases get
+    it from the migration and are filled with `flask reindex-search`.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions["search"] = {
+            SQLiteSearchBackend.dialect: SQLiteSearchBackend(),
+            PostgresSearchBackend.dialect: PostgresSearchBackend(app.config.get("SEARCH_PG_CONFIG", "simple")),
+        }
+
+        metadata = app.extensions["sqlalchemy"].metadata
+        if not event.contains(metadata, "after_create", _create_search_schema):
+            event.listen(metadata, "after_create", _create_search_schema)
+            event.listen(metadata, "before_drop", _drop_search_schema)
+
+    @property
+    def session(self):
+        return current_app.extensions["sqlalchemy"].session
+
+    @property
+    def backend(self):
+        dialect = self.session.get_bind().dialect.name
+        backend = current_app.extensions["search"].get(dialect)
+        if backend is None:
+            raise RuntimeError(f"Full-text search is not supported on {dialect}")
+        return backend
+
+    def index(self, doc_type, doc_id, title, body=""):
+        """
+        Add or replace a document. Runs in the current transaction; the caller commits.
+        """
+        self.backend.index(self.session, doc_type, doc_id, title, body)
+
+    def remove(self, doc_type, doc_id):
+        """
+        Remove a document if present. Runs in the current transaction; the caller commits.
+        """
+        self.backend.remove(self.session, doc_type, doc_id)
+
+    def clear(self, doc_type):
+        """
+        Remove every document of a type (before a rebuild).
+        """
+        self.backend.clear(self.session, doc_type)
+
+    def search(self, query, doc_types=DOC_TYPES, limit=20, offset=0, prefix=False):
+        """
+        Ranked matches for every word of `query`.
+
+        Args:
+            prefix (bool): Treat the last word as a prefix ("jo" matches "john"),
+                for search-as-you-type.
+
+        Returns:
+            list: (doc_type, doc_id) tuples, best match first.
+        """
+        terms = query_terms(query)
+        if not terms or not doc_types:
+            return []
+        return self.backend.search(self.session, terms, doc_types, limit, offset, prefix)
@@ -0,0 +1,324 @@
+import mimetypes
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+# Read/write buffer for streaming copies
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# HLS types, missing or wrong in the system mime tables
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+
+
+class StoredFile:
+    """
+    Readable view of a stored file, optionally limited to a byte range.
+    Iterating yields blocks, so it can be passed straight to a streamed response.
+    """
+
+    def __init__(self, raw, length=None):
+        self._raw = raw
+        self._remaining = length
+
+    def read(self, size=-1):
+        if self._remaining is not None:
+            if self._remaining <= 0:
+                return b""
+            size = self._remaining if size is None or size < 0 else min(size, self._remaining)
+        data = self._raw.read(size) if size is not None and size >= 0 else self._raw.read()
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return data
+
+    def __iter__(self):
+        for block in iter(lambda: self.read(STREAM_BUFFER_SIZE), b""):
+            yield block
+
+    def close(self):
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LocalStorageBackend:
+    """
+    Files on the local disk (or a shared volume) under `root`.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _abs(self, path):
+        return os.path.join(self.root, path)
+
+    def save(self, path, stream):
+        abs_path = self._abs(path)
+        os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+
+        # Write beside the target and rename, so readers never see a partial file
+        tmp_path = f"{abs_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as target:
+                shutil.copyfileobj(stream, target, STREAM_BUFFER_SIZE)
+            os.replace(tmp_path, abs_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def save_file(self, path, local_path, move=False):
+        if not move:
+            with open(local_path, "rb") as source:
+                return self.save(path, source)
+        abs_path = self._abs(path)
+        os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+        os.replace(local_path, abs_path)
+        return path
+
+    def open(self, path, start=0, length=None):
+        raw = open(self._abs(path), "rb")
+        raw.seek(start)
+        return StoredFile(raw, length)
+
+    def stat(self, path):
+        try:
+            st = os.stat(self._abs(path))
+        except FileNotFoundError:
+            return None
+        return {"size": st.st_size, "modified": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)}
+
+    def delete(self, path):
+        try:
+            os.remove(self._abs(path))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete_prefix(self, prefix):
+        abs_path = self._abs(prefix)
+        if not os.path.isdir(abs_path):
+            return 0
+        count = sum(len(files) for _, _, files in os.walk(abs_path))
+        shutil.rmtree(abs_path, ignore_errors=True)
+        return count
+
+    def url(self, path, expires_in=None):
+        # No direct URL; files are served by the application (or nginx) instead
+        return None
+
+    @contextmanager
+    def local_copy(self, path):
+        yield self._abs(path)
+
+
+class S3StorageBackend:
+    """
+    Files in an S3-compatible bucket (AWS S3, MinIO, Ceph, ...), so media
+    I/O does not depend on any one app server's disk.
+
+    Requires boto3, which is imported only when this backend is configured.
+    """
+
+    def __init__(self, bucket, endpoint_url=None, region=None, access_key=None,
+                 secret_key=None, prefix="", url_expiry=3600):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("boto3 is required for the s3 storage backend") from e
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.url_expiry = url_expiry
+        self._client_error = ClientError
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key
+        )
+
+    def _key(self, path):
+        return self.prefix + path.replace(os.sep, "/")
+
+    @staticmethod
+    def _extra_args(path):
+        content_type = mimetypes.guess_type(path)[0]
+        return {"ContentType": content_type} if content_type else None
+
+    def save(self, path, stream):
+        # upload_fileobj switches to a streamed multipart upload for large files
+        self._client.upload_fileobj(stream, self.bucket, self._key(path), ExtraArgs=self._extra_args(path))
+        return path
+
+    def save_file(self, path, local_path, move=False):
+        self._client.upload_file(local_path, self.bucket, self._key(path), ExtraArgs=self._extra_args(path))
+        if move:
+            os.remove(local_path)
+        return path
+
+    def open(self, path, start=0, length=None):
+        kwargs = {"Bucket": self.bucket, "Key": self._key(path)}
+        if start or length is not None:
+            end = "" if length is None else start + length - 1
+            kwargs["Range"] = f"bytes={start}-{end}"
+        return StoredFile(self._client.get_object(**kwargs)["Body"], length)
+
+    def stat(self, path):
+        try:
+            head = self._client.head_object(Bucket=self.bucket, Key=self._key(path))
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return {"size": head["ContentLength"], "modified": head["LastModified"]}
+
+    def delete(self, path):
+        self._client.delete_object(Bucket=self.bucket, Key=self._key(path))
+        return True
+
+    def delete_prefix(self, prefix):
+        deleted = 0
+        paginator = self._client.get_paginator("list_objects_v2")
+        # Pages hold at most 1000 keys, the delete_objects limit
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix)):
+            keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            if keys:
+                self._client.delete_objects(Bucket=self.bucket, Delete={"Objects": keys, "Quiet": True})
+                deleted += len(keys)
+        return deleted
+
+    def url(self, path, expires_in=None):
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._key(path)},
+            ExpiresIn=expires_in or self.url_expiry
+        )
+
+    @contextmanager
+    def local_copy(self, path):
+        # Tools like ffmpeg and Pillow need a real file; download to a temp one
+        suffix = os.path.splitext(path)[1]
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as target:
+                self._client.download_fileobj(self.bucket, self._key(path), target)
+            yield tmp_path
+        finally:
+            os.remove(tmp_path)
+
+
+class Storage:
+    """
+    Flask extension selecting the media storage backend from app config:
+
+        STORAGE_BACKEND          "local" (default) or "s3"
+        UPLOAD_FOLDER /
+        MEDIA_UPLOAD_PATH        root directory for the "local" backend
+        STORAGE_S3_BUCKET        bucket for the "s3" backend
+        STORAGE_S3_ENDPOINT_URL  endpoint for S3-compatible services (e.g. MinIO)
+        STORAGE_S3_REGION, STORAGE_S3_ACCESS_KEY, STORAGE_S3_SECRET_KEY
+        STORAGE_S3_PREFIX        key prefix inside the bucket
+        STORAGE_URL_EXPIRY       lifetime of presigned URLs in seconds
+
+    Paths are always relative (e.g. 'blobs/ab/cd/<hash>.jpg'), so rows stay
+    valid when the backend changes.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_name = app.config.get("STORAGE_BACKEND", "local")
+
+        if backend_name == "s3":
+            if not app.config.get("STORAGE_S3_BUCKET"):
+                raise ValueError("STORAGE_S3_BUCKET must be set for the s3 storage backend")
+            backend = S3StorageBackend(
+                app.config["STORAGE_S3_BUCKET"],
+                endpoint_url=app.config.get("STORAGE_S3_ENDPOINT_URL"),
+                region=app.config.get("STORAGE_S3_REGION"),
+                access_key=app.config.get("STORAGE_S3_ACCESS_KEY"),
+                secret_key=app.config.get("STORAGE_S3_SECRET_KEY"),
+                prefix=app.config.get("STORAGE_S3_PREFIX", ""),
+                url_expiry=app.config.get("STORAGE_URL_EXPIRY", 3600)
+            )
+        elif backend_name == "local":
+            root = app.config.get("UPLOAD_FOLDER") or app.config.get("MEDIA_UPLOAD_PATH", "uploads")
+            backend = LocalStorageBackend(root)
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND '{backend_name}'")
+
+        app.extensions["storage"] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions["storage"]
+
+    def save(self, path, stream):
+        """
+        Stream a readable binary object to `path`. Returns the path.
+        """
+        return self.backend.save(path, stream)
+
+    def save_file(self, path, local_path, move=False):
+        """
+        Store a file from the local disk at `path`; with `move` the local
+        file is consumed (a plain rename on the local backend).
+        """
+        return self.backend.save_file(path, local_path, move)
+
+    def open(self, path, start=0, length=None):
+        """
+        Open a stored file for reading from byte `start`, limited to `length`
+        bytes if given. Use as a context manager or close it when done.
+        """
+        return self.backend.open(path, start, length)
+
+    def stat(self, path):
+        """
+        {"size", "modified"} of a stored file, or None if it does not exist.
+        """
+        return self.backend.stat(path)
+
+    def delete(self, path):
+        return self.backend.delete(path)
+
+    def delete_prefix(self, prefix):
+        """
+        Delete every file under `prefix` (a directory such as
+        'blobs/ab/cd/<hash>_hls/'). Returns the number of files deleted.
+        """
+        return self.backend.delete_prefix(prefix)
+
+    def url(self, path, expires_in=None):
+        """
+        Time-limited direct download URL, or None if the backend has none
+        (the file must then be served by the application).
+        """
+        return self.backend.url(path, expires_in)
+
+    def local_copy(self, path):
+        """
+        Context manager yielding a local filesystem path for tools that need
+        one (ffmpeg, Pillow). Temporary copies are removed on exit.
+        """
+        return self.backend.local_copy(path)
+
+
+# The configured backend of the current app, for modules that cannot import
+# app.extensions without a circular import
+current_storage = LocalProxy(lambda: current_app.extensions["storage"])
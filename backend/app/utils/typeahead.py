@@ -0,0 +1,89 @@
+import threading
+from bisect import bisect_left, insort
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class TypeaheadIndex:
+    """
+    In-memory prefix index: one sorted array of (term, entry_id) pairs, so a
+    prefix lookup is a binary search followed by a short forward scan.
+    Every entry carries a small payload dict returned with the matches.
+
+    All access goes through one lock; operations take microseconds, so
+    readers and writers barely contend.
+    """
+
+    def __init__(self):
+        self._entries = []    # sorted (term, entry_id)
+        self._terms = {}      # entry_id -> terms it is indexed under
+        self._payloads = {}   # entry_id -> payload
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def load(self, items):
+        """
+        Replace the contents with `items`, an iterable of (entry_id, terms, payload).
+        The array is sorted once at the end instead of insert by insert.
+        """
+        entries, terms_by_id, payloads = [], {}, {}
+        for entry_id, terms, payload in items:
+            terms = frozenset(terms)
+            entries.extend((term, entry_id) for term in terms)
+            terms_by_id[entry_id] = terms
+            payloads[entry_id] = payload
+        entries.sort()
+
+        with self._lock:
+            self._entries, self._terms, self._payloads = entries, terms_by_id, payloads
+            self.loaded = True
+
+    def _remove_locked(self, entry_id):
+        for term in self._terms.pop(entry_id, ()):
+            i = bisect_left(self._entries, (term, entry_id))
+            if i < len(self._entries) and self._entries[i] == (term, entry_id):
+                del self._entries[i]
+        self._payloads.pop(entry_id, None)
+
+    def upsert(self, entry_id, terms, payload):
+        terms = frozenset(terms)
+        with self._lock:
+            if self._terms.get(entry_id) != terms:
+                self._remove_locked(entry_id)
+                for term in terms:
+                    insort(self._entries, (term, entry_id))
+                self._terms[entry_id] = terms
+            self._payloads[entry_id] = payload
+
+    def remove(self, entry_id):
+        with self._lock:
+            self._remove_locked(entry_id)
+
+    def get(self, entry_id):
+        return self._payloads.get(entry_id)
+
+    def search(self, prefix, max_candidates=5000):
+        """
+        Payloads of entries with a term starting with `prefix`, in term order,
+        each entry once. At most `max_candidates` matching terms are read.
+        """
+        with self._lock:
+            # Every term starting with `prefix` sorts below prefix + the highest code point
+            start = bisect_left(self._entries, (prefix,))
+            end = min(bisect_left(self._entries, (prefix + _MAX_CHAR,)), start + max_candidates)
+            results = {entry_id: self._payloads[entry_id] for _, entry_id in self._entries[start:end]}
+        return list(results.values())
+
+    def search_among(self, entry_ids, prefix):
+        """
+        Payloads of the given entries that have a term starting with `prefix`,
+        independent of where those terms sort (no candidate cap).
+        """
+        with self._lock:
+            return [
+                self._payloads[entry_id] for entry_id in entry_ids
+                if any(term.startswith(prefix) for term in self._terms.get(entry_id, ()))
+            ]
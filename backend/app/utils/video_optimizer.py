@@ -1,67 +1,224 @@
+import json
 import os
-from moviepy.editor import VideoFileClip
-from flask import current_app
+import subprocess
+import tempfile
+import time
 
 
-def process_video_compression(
-    input_path,
-    output_path=None,
-    target_bitrate=None,
-    target_resolution=None
-):
+# Default adaptive-bitrate ladder. Rungs taller than the source are dropped.
+DEFAULT_HLS_LADDER = (
+    {"name": "240p", "height": 240, "video_kbps": 400, "audio_kbps": 64},
+    {"name": "480p", "height": 480, "video_kbps": 1000, "audio_kbps": 96},
+    {"name": "720p", "height": 720, "video_kbps": 2500, "audio_kbps": 128},
+)
+
+
+def probe_video(input_path):
+    """
+    Read a video's dimensions, duration and audio presence with ffprobe.
+    Only container and stream headers are read; nothing is decoded.
+
+    Returns:
+        dict: {"width", "height", "duration", "codec", "format", "has_audio"};
+        width and height are as displayed (rotation applied).
+
+    Raises:
+        ValueError: If the file has no video stream.
+        subprocess.CalledProcessError: If ffprobe cannot read the file.
     """
-    Compress and convert a video file to standard .mp4 format.
+    command = [
+        "ffprobe", "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", input_path
+    ]
+    info = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+    streams = info.get("streams", [])
+
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise ValueError("No video stream found.")
+
+    width, height = int(video["width"]), int(video["height"])
+    rotation = video.get("tags", {}).get("rotate") or next(
+        (side.get("rotation") for side in video.get("side_data_list", []) if "rotation" in side), 0
+    )
+    if abs(int(float(rotation))) % 180 == 90:
+        width, height = height, width
+
+    return {
+        "width": width,
+        "height": height,
+        "duration": float(info.get("format", {}).get("duration") or 0),
+        "codec": video.get("codec_name"),
+        "format": info.get("format", {}).get("format_name", ""),
+        "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+    }
+
+
+def select_ladder(ladder, source_height):
+    """
+    Rungs of `ladder` no taller than the source (never upscale). A source
+    shorter than every rung gets a single rung at its own height.
+    """
+    rungs = [rung for rung in ladder if rung["height"] <= source_height]
+    if not rungs:
+        lowest = min(ladder, key=lambda rung: rung["height"])
+        height = max(2, source_height - source_height % 2)
+        rungs = [dict(lowest, name=f"{height}p", height=height)]
+    return sorted(rungs, key=lambda rung: rung["height"])
+
+
+def build_hls_command(input_path, output_dir, rungs, has_audio, segment_seconds=4,
+                      preset="veryfast", threads=0):
+    """
+    ffmpeg arguments producing every rung of the ladder from a single decode:
+    the decoded frames are split and scaled once per rung, each rung is encoded
+    with libx264/AAC into HLS segments, and a master playlist ties them together.
+
+    Output files (in `output_dir`): master.m3u8, <name>.m3u8, <name>_NNN.ts
+    """
+    count = len(rungs)
+    filters = [f"[0:v]split={count}" + "".join(f"[v{i}]" for i in range(count))]
+    filters += [f"[v{i}]scale=-2:{rung['height']}[v{i}out]" for i, rung in enumerate(rungs)]
+
+    command = ["ffmpeg", "-y", "-i", input_path, "-filter_complex", ";".join(filters)]
+    for i, rung in enumerate(rungs):
+        kbps = rung["video_kbps"]
+        command += [
+            "-map", f"[v{i}out]",
+            f"-c:v:{i}", "libx264",
+            f"-b:v:{i}", f"{kbps}k",
+            f"-maxrate:v:{i}", f"{int(kbps * 1.07)}k",
+            f"-bufsize:v:{i}", f"{kbps * 2}k",
+        ]
+    if has_audio:
+        for i, rung in enumerate(rungs):
+            command += ["-map", "0:a:0", f"-c:a:{i}", "aac", f"-b:a:{i}", f"{rung['audio_kbps']}k"]
+        command += ["-ac", "2"]
+
+    stream_map = [
+        f"v:{i},a:{i},name:{rung['name']}" if has_audio else f"v:{i},name:{rung['name']}"
+        for i, rung in enumerate(rungs)
+    ]
+    command += [
+        "-preset", preset, "-profile:v", "main", "-pix_fmt", "yuv420p",
+        # Keyframes exactly on segment boundaries so players can switch rungs between segments
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})", "-sc_threshold", "0",
+        "-threads", str(threads),
+        "-f", "hls",
+        "-hls_time", str(segment_seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", os.path.join(output_dir, "%v_%03d.ts"),
+        "-master_pl_name", "master.m3u8",
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(output_dir, "%v.m3u8"),
+    ]
+    return command
+
+
+def run_ffmpeg(command, duration=None, on_progress=None, progress_interval=2.0):
+    """
+    Run an ffmpeg command, reporting progress from its `-progress` output.
 
     Args:
-        input_path (str): Path to original uploaded video (absolute).
-        output_path (str): Optional; if not provided, saves as *_compressed.mp4 in same directory.
-        target_bitrate (str): Bitrate string (e.g., '800k'). If None, use app config or default.
-        target_resolution (tuple): (width, height). If None, use app config or original size.
+        command (list): ffmpeg arguments, starting with "ffmpeg".
+        duration (float): Input duration in seconds, to turn output time into a fraction.
+        on_progress (callable): Called with a fraction in [0, 1], at most every
+            `progress_interval` seconds and once at the end.
+
+    Raises:
+        RuntimeError: If ffmpeg exits non-zero, with the tail of its error log.
+    """
+    command = [command[0], "-progress", "pipe:1", "-nostats", "-loglevel", "error"] + command[1:]
+    last_report = 0.0
+    # stderr goes to a file: a pipe nobody reads could fill up and stall ffmpeg
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            # out_time_ms is in microseconds despite its name (kept for older ffmpeg builds)
+            if key in ("out_time_us", "out_time_ms") and value.isdigit() and duration and on_progress:
+                now = time.monotonic()
+                if now - last_report >= progress_interval:
+                    last_report = now
+                    on_progress(min(1.0, int(value) / 1_000_000 / duration))
+        returncode = process.wait()
+
+        if returncode != 0:
+            stderr.seek(0)
+            log = stderr.read()[-2000:].decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg exited with status {returncode}: {log}")
+    if on_progress:
+        on_progress(1.0)
+
+
+def transcode_video_hls(input_path, output_dir, ladder=DEFAULT_HLS_LADDER, segment_seconds=4,
+                        preset="veryfast", threads=0, on_progress=None):
+    """
+    Transcode a video into an HLS adaptive-bitrate ladder plus a poster frame.
+
+    Args:
+        input_path (str): Path to the original video (absolute).
+        output_dir (str): Empty directory for playlists, segments and the poster.
+        ladder (iterable): Rungs as {"name", "height", "video_kbps", "audio_kbps"}.
+        segment_seconds (int): Target HLS segment duration.
+        preset (str): x264 preset; faster presets trade size for CPU.
+        threads (int): Encoder threads (0 lets ffmpeg decide).
+        on_progress (callable): Receives the fraction done while encoding.
 
     Returns:
-        str: Absolute path to compressed video file.
+        dict: {"width", "height", "duration", "codec", "master", "poster",
+        "renditions": [{"name", "width", "height", "bandwidth", "playlist"}]},
+        with file names relative to `output_dir`.
 
     Raises:
-        FileNotFoundError: If input file does not exist.
-        RuntimeError: For compression failures.
+        ValueError: If the file has no video stream.
+        subprocess.CalledProcessError: If ffprobe fails.
+        RuntimeError: If ffmpeg fails.
     """
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Video not found at: {input_path}")
 
-    # Get defaults from app config or fallback
-    target_bitrate = target_bitrate or current_app.config.get("VIDEO_BITRATE", "800k")
-    target_resolution = target_resolution or current_app.config.get("VIDEO_RESOLUTION", (720, 480))
-
-    # Ensure output path
-    if not output_path:
-        base, _ = os.path.splitext(input_path)
-        output_path = f"{base}_compressed.mp4"
-
-    try:
-        clip = VideoFileClip(input_path)
-
-        # Resize (if resolution provided)
-        if target_resolution:
-            clip = clip.resize(newsize=target_resolution)
-
-        # Write video with compression
-        clip.write_videofile(
-            output_path,
-            bitrate=target_bitrate,
-            codec="libx264",
-            audio_codec="aac",
-            preset="medium",
-            threads=4,
-            remove_temp=True,
-            logger=None  # Suppress output in production
-        )
-
-        return output_path
-
-    except Exception as e:
-        raise RuntimeError(f"Video compression failed: {str(e)}")
-
-    finally:
-        # Explicitly close resources to avoid locks/memory leaks
-        if 'clip' in locals():
-            clip.close()
+    probe = probe_video(input_path)
+    rungs = select_ladder(ladder, probe["height"])
+
+    command = build_hls_command(input_path, output_dir, rungs, probe["has_audio"],
+                                segment_seconds=segment_seconds, preset=preset, threads=threads)
+    run_ffmpeg(command, duration=probe["duration"], on_progress=on_progress)
+
+    poster = os.path.join(output_dir, "poster.jpg")
+    generate_thumbnail(input_path, poster, at_seconds=min(1, probe["duration"] / 2))
+
+    renditions = []
+    for rung in rungs:
+        width = round(rung["height"] * probe["width"] / probe["height"] / 2) * 2
+        audio_kbps = rung["audio_kbps"] if probe["has_audio"] else 0
+        renditions.append({
+            "name": rung["name"],
+            "width": width,
+            "height": rung["height"],
+            "bandwidth": (rung["video_kbps"] + audio_kbps) * 1000,
+            "playlist": f"{rung['name']}.m3u8",
+        })
+
+    return dict(probe, master="master.m3u8", poster="poster.jpg", renditions=renditions)
+
+
+def generate_thumbnail(input_path, output_path, at_seconds=1):
+    """
+    Grab a single frame of a video as a JPEG thumbnail with ffmpeg.
+
+    Args:
+        input_path (str): Path to the video (absolute).
+        output_path (str): Where to write the JPEG.
+        at_seconds (float): Timestamp of the frame.
+
+    Returns:
+        str: output_path
+    """
+    command = [
+        "ffmpeg", "-y", "-ss", str(at_seconds), "-i", input_path,
+        "-frames:v", "1", "-q:v", "3", output_path
+    ]
+    subprocess.run(command, check=True, capture_output=True)
+    return output_path
@@ -0,0 +1,82 @@
+from app.workers import celery
+from app.extensions import db
+from app.services.chat_service import ChatService
+from app.services.notification_service import notification_service
+from app.services.post_service import post_service
+from app.services.user_service import UserService
+
+
+@celery.task(name="reconcile_post_counters")
+def reconcile_post_counters(batch_size: int = 1000):
+    """
+    Periodically recompute the denormalized like/comment counters on posts
+    and correct any drift (schedule it with celery beat).
+
+    Args:
+        batch_size (int): Number of post ids reconciled per UPDATE/commit.
+    """
+    try:
+        corrected = post_service.reconcile_counters(batch_size=batch_size)
+        print(f"[✅] Post counters reconciled, {corrected} posts corrected")
+        return corrected
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[❌] Post counter reconciliation failed: {e}")
+
+
+@celery.task(name="reconcile_follower_counts")
+def reconcile_follower_counts(batch_size: int = 1000):
+    """
+    Recompute the denormalized followers_count on users, which decides
+    whether an author's posts are fanned out or pulled at read time.
+
+    Args:
+        batch_size (int): Number of user ids reconciled per UPDATE/commit.
+    """
+    try:
+        corrected = UserService.reconcile_follower_counts(batch_size=batch_size)
+        print(f"[✅] Follower counts reconciled, {corrected} users corrected")
+        return corrected
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[❌] Follower count reconciliation failed: {e}")
+
+
+@celery.task(name="reconcile_notification_counters")
+def reconcile_notification_counters(batch_size: int = 1000):
+    """
+    Recompute the per-user unread notification counters behind the
+    badge endpoint and correct any drift.
+
+    Args:
+        batch_size (int): Number of user ids reconciled per UPDATE/commit.
+    """
+    try:
+        corrected = notification_service.reconcile_unread_counts(batch_size=batch_size)
+        print(f"[✅] Notification counters reconciled, {corrected} users corrected")
+        return corrected
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[❌] Notification counter reconciliation failed: {e}")
+
+
+@celery.task(name="reconcile_conversation_unread_counts")
+def reconcile_conversation_unread_counts(batch_size: int = 1000):
+    """
+    Recompute the per-conversation unread chat counters (unread_a/unread_b)
+    behind the chat unread endpoints and correct any drift.
+
+    Args:
+        batch_size (int): Number of conversation ids reconciled per UPDATE/commit.
+    """
+    try:
+        corrected = ChatService().reconcile_unread_counts(batch_size=batch_size)
+        print(f"[✅] Conversation unread counters reconciled, {corrected} conversations corrected")
+        return corrected
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[❌] Conversation unread counter reconciliation failed: {e}")
@@ -0,0 +1,18 @@
+from app.workers import celery
+from app.workers.media_jobs import run_media_job
+from app.models.media_processing_job import MediaProcessingJob
+from app.services.media_service import media_service
+
+
+@celery.task(name="generate_image_variants", bind=True)
+def generate_image_variants(self, media_id: int):
+    """
+    Create the resized WebP/JPEG variants and blurhash placeholder of an
+    uploaded image. Idempotent: media that already has variants is skipped.
+    """
+    def generate(job_id):
+        variants = media_service.generate_image_variants(media_id)
+        print(f"[✅] Created {len(variants['images'])} variants for media {media_id}")
+        return len(variants["images"])
+
+    return run_media_job(self, media_id, MediaProcessingJob.KIND_IMAGE_VARIANTS, generate)
@@ -0,0 +1,32 @@
+from app.extensions import db
+from app.services.media_service import media_service
+
+
+def run_media_job(task, media_id: int, kind: str, work):
+    """
+    Run `work(job_id)` as the `kind` processing job of a media row, from
+    inside the bound Celery `task`. State and progress are kept on the job
+    row, finished jobs are skipped, and failures are retried with exponential
+    backoff until MEDIA_JOB_MAX_ATTEMPTS. A ValueError (missing media, bad
+    content) is permanent and never retried.
+    """
+    job_id = None
+    try:
+        job = media_service.start_job(media_id, kind)
+        if job is None:
+            print(f"[✅] {kind} already done for media {media_id}")
+            return None
+        job_id = job.id
+
+        result = work(job_id)
+        media_service.finish_job(job_id)
+        return result
+
+    except Exception as e:
+        db.session.rollback()
+        retry_in = media_service.fail_job(job_id, e, retry=not isinstance(e, ValueError)) if job_id else None
+        print(f"[❌] {kind} failed for media {media_id}: {e}")
+        if retry_in is not None:
+            # The attempt limit is enforced on the job row, not by Celery
+            raise task.retry(exc=e, countdown=retry_in, max_retries=None)
+        return None
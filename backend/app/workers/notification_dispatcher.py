@@ -1,56 +1,54 @@
 from app.workers import celery
 from app.extensions import db
 from app.models.notification import Notification
-from datetime import datetime
 
 @celery.task(name="dispatch_notification")
-def dispatch_notification(
-    recipient_id: int,
-    sender_id: int,
-    type: str,
-    message: str,
-    target_type: str = None,
-    target_id: int = None
-):
+def dispatch_notification(notification_id: int):
     """
-    Asynchronously creates and saves a notification.
+    Asynchronously delivers a stored notification (email, push, websocket).
+    The row itself is written by NotificationService before this is queued.
     """
     try:
-        notification = Notification(
-            recipient_id=recipient_id,
-            sender_id=sender_id,
-            type=type,
-            message=message,
-            target_type=target_type,
-            target_id=target_id,
-            created_at=datetime.utcnow(),
-            read=False
-        )
-        db.session.add(notification)
-        db.session.commit()
-        print(f"[] Notification dispatched to user {recipient_id}")
+        notification = db.session.get(Notification, notification_id)
+        if not notification:
+            print(f"[] Notification {notification_id} no longer exists")
+            return
+        print(f"[] Notification {notification_id} dispatched to user {notification.recipient_id}")
 
     except Exception as e:
         db.session.rollback()
         print(f"[] Failed to dispatch notification: {str(e)}")
 
 
-def enqueue_notification_dispatch(
-    recipient_id: int,
+@celery.task(name="dispatch_notifications_bulk")
+def dispatch_notifications_bulk(
+    recipient_ids: list,
     sender_id: int,
-    type: str,
     message: str,
-    target_type: str = None,
-    target_id: int = None
+    notif_type: str = None
 ):
+    """
+    Insert one chunk of a bulk notification with a single multi-row INSERT.
+    """
+    from app.services.notification_service import notification_service
+
+    try:
+        stats = notification_service.create_notifications_bulk(
+            recipient_ids, sender_id=sender_id, message=message, notif_type=notif_type
+        )
+        print(
+            f"[] Bulk notification: {stats['inserted']} rows in {stats['chunks']} chunks, "
+            f"{stats['elapsed_ms']} ms ({stats['rows_per_sec']} rows/s)"
+        )
+        return stats
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[] Bulk notification failed for {len(recipient_ids)} recipients: {str(e)}")
+
+
+def enqueue_notification_dispatch(notification_id: int):
     """
     Helper function to enqueue the Celery notification task.
     """
-    dispatch_notification.delay(
-        recipient_id=recipient_id,
-        sender_id=sender_id,
-        type=type,
-        message=message,
-        target_type=target_type,
-        target_id=target_id
-    )
+    dispatch_notification.delay(notification_id)
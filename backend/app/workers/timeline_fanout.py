@@ -0,0 +1,19 @@
+from app.workers import celery
+from app.extensions import db
+from app.services.timeline_service import timeline_service
+
+
+@celery.task(name="fan_out_post")
+def fan_out_post(post_id: int):
+    """
+    Push a newly created post into its followers' home timelines.
+    Idempotent, so it is safe for the broker to redeliver.
+    """
+    try:
+        written = timeline_service.fan_out_post(post_id)
+        print(f"[✅] Post {post_id} fanned out to {written} timelines")
+        return written
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[❌] Fan-out failed for post {post_id}: {e}")
@@ -0,0 +1,19 @@
+from app.workers import celery
+from app.extensions import db
+from app.services.media_service import media_service
+
+
+@celery.task(name="purge_stale_uploads")
+def purge_stale_uploads(max_age_hours: int = None):
+    """
+    Periodically delete chunked uploads that were abandoned before completion,
+    along with their partial files (schedule it with celery beat).
+    """
+    try:
+        purged = media_service.purge_stale_uploads(max_age_hours)
+        print(f"[✅] Purged {purged} stale uploads")
+        return purged
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"[❌] Stale upload purge failed: {e}")
@@ -1,50 +1,58 @@
 import os
-import subprocess
-from app.workers import celery
-from app.utils.file_storage import save_processed_file
-from app.utils.video_optimizer import generate_thumbnail
-
-@celery.task(name="process_video")
-def process_video(video_path, output_dir=None):
-    """
-    Compresses and optimizes a video asynchronously.
+import tempfile
 
-    Args:
-        video_path (str): Path to the uploaded raw video.
-        output_dir (str, optional): Directory to save optimized video and thumbnail.
-    """
-    try:
-        print(f"[🔄] Starting video processing for {video_path}...")
+from flask import current_app
 
-        # Default output directory
-        output_dir = output_dir or os.path.dirname(video_path)
+from app.workers import celery
+from app.workers.media_jobs import run_media_job
+from app.models.media_processing_job import MediaProcessingJob
+from app.services.media_service import media_service
+from app.utils.concurrency import FileSlotSemaphore, SlotUnavailable
 
-        filename = os.path.basename(video_path)
-        name, ext = os.path.splitext(filename)
-        output_video_path = os.path.join(output_dir, f"{name}_compressed{ext}")
-        thumbnail_path = os.path.join(output_dir, f"{name}_thumb.jpg")
 
-        # Compress video using ffmpeg (adjust bitrate as needed)
-        command = [
-            "ffmpeg", "-i", video_path,
-            "-b:v", "1M", "-vcodec", "libx264", "-preset", "fast",
-            output_video_path
-        ]
-        subprocess.run(command, check=True)
+def _transcode_slots():
+    """Host-wide bound on concurrent ffmpeg transcodes (VIDEO_MAX_CONCURRENT_TRANSCODES)."""
+    config = current_app.config
+    lock_dir = config.get("VIDEO_SLOT_LOCK_DIR") or os.path.join(tempfile.gettempdir(), "comrade-transcode-slots")
+    return FileSlotSemaphore(lock_dir, config.get("VIDEO_MAX_CONCURRENT_TRANSCODES", 2))
 
-        print(f"[✅] Compressed video saved: {output_video_path}")
 
-        # Generate a thumbnail
-        generate_thumbnail(video_path, thumbnail_path)
-        print(f"[🖼️] Thumbnail saved: {thumbnail_path}")
+def _thread_budget():
+    """
+    ffmpeg threads per transcode: VIDEO_FFMPEG_THREADS, or the cores split
+    evenly between the concurrent transcodes so they don't oversubscribe the CPU.
+    """
+    config = current_app.config
+    if config.get("VIDEO_FFMPEG_THREADS"):
+        return config["VIDEO_FFMPEG_THREADS"]
+    return max(1, (os.cpu_count() or 1) // max(1, config.get("VIDEO_MAX_CONCURRENT_TRANSCODES", 2)))
 
-        # Optional: save to cloud / move to media folder
-        save_processed_file(output_video_path)
-        save_processed_file(thumbnail_path)
 
-        print(f"[✅] Video processing completed for {video_path}")
+@celery.task(name="process_video", bind=True)
+def process_video(self, media_id: int):
+    """
+    Transcode an uploaded video into an HLS adaptive-bitrate ladder with a
+    poster frame, and record the renditions on its Media row.
 
-    except subprocess.CalledProcessError as e:
-        print(f"[❌] FFmpeg processing failed: {e}")
-    except Exception as e:
-        print(f"[❌] Video processing error: {e}")
+    Progress is reported on the media's processing job. If every transcode
+    slot on this host stays busy, the task is requeued without counting an
+    attempt.
+    """
+    def transcode(job_id):
+        print(f"[🔄] Starting video processing for media {media_id}...")
+        renditions = media_service.transcode_video(
+            media_id,
+            threads=_thread_budget(),
+            on_progress=lambda progress: media_service.update_job_progress(job_id, progress)
+        )
+        print(f"[✅] Video processing completed for media {media_id}: "
+              f"{', '.join(r['name'] for r in renditions['renditions'])}")
+        return renditions["master"]
+
+    wait = current_app.config.get("VIDEO_SLOT_WAIT_SECONDS", 30)
+    try:
+        with _transcode_slots().acquire(timeout=wait):
+            return run_media_job(self, media_id, MediaProcessingJob.KIND_VIDEO_HLS, transcode)
+    except SlotUnavailable:
+        print(f"[🔄] No transcode slot free for media {media_id}; requeued")
+        raise self.retry(countdown=wait, max_retries=None)
@@ -0,0 +1,42 @@
+"""add full-text search index
+
+Revision ID: 48bd46d27122
+Revises: 94f9dc789788
+Create Date: 2026-10-18 08:12:55.218334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '48bd46d27122'
+down_revision = '94f9dc789788'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The index is dialect-specific (see app/utils/search.py); fill it with `flask reindex-search`
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "CREATE TABLE search_documents ("
+            "doc_type VARCHAR(20) NOT NULL, doc_id INTEGER NOT NULL, document TSVECTOR NOT NULL, "
+            "PRIMARY KEY (doc_type, doc_id))"
+        )
+        op.execute("CREATE INDEX ix_search_documents_document ON search_documents USING GIN (document)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "doc_type UNINDEXED, doc_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP TABLE search_documents")
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE search_index")
@@ -0,0 +1,89 @@
+import io
+import random
+from contextlib import contextmanager
+
+import pytest
+from flask_jwt_extended import create_access_token
+from PIL import Image
+from sqlalchemy import event
+
+from app import create_app
+from app.config.testing import Config
+from app.extensions import db
+from app.models.post import Post
+from app.models.user import User
+from app.workers import celery
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        UPLOAD_FOLDER = str(tmp_path / "uploads")
+
+    app = create_app(TestConfig)
+    # Run .delay() tasks inline, without a broker
+    celery.conf.task_always_eager = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def make_user(app):
+    counter = iter(range(1, 10 ** 6))
+
+    def make_user(username=None, **fields):
+        username = username or f"user{next(counter)}"
+        user = User(username=username, email=f"{username}@example.com", password_hash="x", **fields)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def make_post(app):
+    def make_post(author, content="hello", **fields):
+        post = Post(user_id=author.id, content=content, **fields)
+        db.session.add(post)
+        db.session.commit()
+        return post
+    return make_post
+
+
+@pytest.fixture
+def auth_headers():
+    def auth_headers(user):
+        return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
+    return auth_headers
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager collecting the SQL statements run inside it."""
+    @contextmanager
+    def count_queries():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+    return count_queries
+
+
+@pytest.fixture
+def make_png():
+    """Encoded PNG bytes of seeded noise (incompressible); vary `seed` for distinct content."""
+    def make_png(width=160, height=120, seed=0):
+        pixels = random.Random(seed).randbytes(width * height * 3)
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (width, height), pixels).save(buffer, "PNG")
+        return buffer.getvalue()
+    return make_png
@@ -0,0 +1,35 @@
+from app.models.notification import Notification
+from app.services.notification_service import notification_service
+
+
+def test_bulk_create_inserts_one_row_per_unique_recipient_in_chunks(make_user, count_queries):
+    sender = make_user()
+    recipients = [make_user().id for _ in range(5)]
+
+    with count_queries() as statements:
+        stats = notification_service.create_notifications_bulk(
+            recipients + recipients[:2] + [None], sender.id, "Meeting moved", notif_type="group", chunk_size=2
+        )
+
+    assert (stats["recipients"], stats["inserted"], stats["chunks"]) == (5, 5, 3)
+    assert sum(statement.startswith("INSERT INTO notifications") for statement in statements) == 3
+    assert sorted(n.recipient_id for n in Notification.query.filter_by(notification_type="group")) == recipients
+    assert {notification_service.get_unread_count(user_id) for user_id in recipients} == {1}
+
+
+def test_enqueue_bulk_runs_one_task_per_chunk(app, make_user):
+    sender = make_user()
+    chunk_size = app.config["NOTIFICATION_BULK_CHUNK_SIZE"]
+    recipients = [make_user().id for _ in range(chunk_size + 1)]
+
+    tasks = notification_service.enqueue_notifications_bulk(recipients, sender.id, "Event tomorrow")
+
+    assert tasks == 2
+    assert Notification.query.count() == chunk_size + 1
+
+
+def test_bulk_create_with_no_recipients_is_a_no_op(make_user):
+    stats = notification_service.create_notifications_bulk([], make_user().id, "nobody")
+
+    assert (stats["inserted"], stats["chunks"]) == (0, 0)
+    assert Notification.query.count() == 0
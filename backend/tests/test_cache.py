@@ -0,0 +1,73 @@
+import pytest
+
+from app.extensions import cache, db
+from app.models.post import Post
+from app.services.post_service import post_service
+from app.utils import cache as cache_module
+from app.utils.cache import Cache, LRUCacheBackend, RedisCacheBackend
+
+
+def test_lru_evicts_least_recently_used_entry():
+    backend = LRUCacheBackend(max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert (backend.get("a"), backend.get("b"), backend.get("c")) == (1, None, 3)
+
+
+def test_lru_entries_expire_after_their_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    backend = LRUCacheBackend(default_ttl=60)
+    backend.set("short", "x", ttl=5)
+    backend.set("default", "y")
+
+    now[0] += 10
+    assert backend.get("short") is None
+    assert backend.get("default") == "y"
+
+
+def test_lru_hands_out_copies():
+    backend = LRUCacheBackend()
+    backend.set("list", [1, 2])
+    backend.get("list").append(3)
+
+    assert backend.get("list") == [1, 2]
+
+
+def test_redis_errors_are_cache_misses():
+    backend = RedisCacheBackend("redis://localhost:1/0")
+    backend.set("key", "value")
+
+    assert backend.get("key") is None
+
+
+def test_unknown_backend_is_rejected(app):
+    app.config["CACHE_BACKEND"] = "memcached"
+    with pytest.raises(ValueError):
+        Cache(app)
+
+
+def test_get_entity_reads_through_and_is_invalidated_on_write(app, make_user, make_post, count_queries):
+    author = make_user()
+    post_id = make_post(author, "original").id
+    cache.get_entity(Post, post_id)
+
+    with app.test_request_context():
+        db.session.expire_all()
+        with count_queries() as statements:
+            cached = cache.get_entity(Post, post_id)
+        assert statements == []
+        assert cached.content == "original"
+
+    post_service.update_post(post_id, author.id, new_content="edited")
+    with app.test_request_context():
+        assert cache.get_entity(Post, post_id).content == "edited"
+
+
+def test_missing_entities_are_not_cached(make_user):
+    assert cache.get_entity(Post, 12345) is None
+    assert cache.get(cache.entity_key(Post, 12345)) is None
+    assert cache.get_entity(Post, None) is None
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from app.services.chat_service import ChatService
+from app.utils.pubsub import InMemoryPubSub
+
+chat_service = ChatService()
+
+
+def sse_events(body):
+    """Parse an event stream body into (event, data) pairs, skipping comments."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def short_streams(app):
+    app.config.update(CHAT_STREAM_MAX_SECONDS=0.3, CHAT_STREAM_HEARTBEAT_SECONDS=0.1)
+
+
+def test_in_memory_hub_delivers_per_channel_until_closed():
+    hub = InMemoryPubSub()
+    first, second, elsewhere = hub.subscribe("user:1"), hub.subscribe("user:1"), hub.subscribe("user:2")
+
+    assert hub.publish("user:1", {"n": 1}) == 2
+    first.close()
+    assert hub.publish("user:1", {"n": 2}) == 1
+
+    assert first.get(timeout=0) == {"n": 1}
+    assert first.get(timeout=0) is None
+    assert [second.get(timeout=0), second.get(timeout=0)] == [{"n": 1}, {"n": 2}]
+    assert elsewhere.get(timeout=0) is None
+
+
+def test_slow_subscribers_drop_instead_of_blocking_publishers():
+    hub = InMemoryPubSub(max_pending=2)
+    subscription = hub.subscribe("user:1")
+    for n in range(3):
+        hub.publish("user:1", {"n": n})
+
+    assert [subscription.get(timeout=0) for _ in range(3)] == [{"n": 0}, {"n": 1}, None]
+
+
+def test_send_message_publishes_to_the_recipient_channel(app, make_user):
+    sender, recipient = make_user(), make_user()
+    subscription = app.extensions["pubsub"].subscribe(chat_service.user_channel(recipient.id))
+
+    sent = chat_service.send_message(sender.id, recipient.id, "ping")
+
+    event = subscription.get(timeout=0)
+    assert event["type"] == "message"
+    assert (event["message"]["id"], event["message"]["content"]) == (sent["message_id"], "ping")
+
+
+def test_missed_messages_are_paged_past_one_query_and_capped(make_user):
+    sender, recipient = make_user(), make_user()
+    ids = [chat_service.send_message(sender.id, recipient.id, f"m{i}")["message_id"] for i in range(130)]
+
+    everything, truncated = chat_service.get_missed_messages(recipient.id, 0)
+    assert ([m["id"] for m in everything], truncated) == (ids, False)
+
+    capped, truncated = chat_service.get_missed_messages(recipient.id, ids[4], max_messages=120)
+    assert ([m["id"] for m in capped], truncated) == (ids[5:125], True)
+
+    exact, truncated = chat_service.get_missed_messages(recipient.id, ids[9], max_messages=120)
+    assert (len(exact), truncated) == (120, False)
+
+
+def test_stream_replays_after_last_event_id_then_truncates(app, client, make_user, auth_headers, short_streams):
+    app.config["CHAT_STREAM_MAX_REPLAY"] = 3
+    sender, recipient = make_user(), make_user()
+    recipient_id, headers = recipient.id, auth_headers(recipient)
+    ids = [chat_service.send_message(sender.id, recipient_id, f"m{i}")["message_id"] for i in range(5)]
+
+    response = client.get("/api/v1/chat/stream", headers={**headers, "Last-Event-ID": str(ids[0])})
+
+    assert response.mimetype == "text/event-stream"
+    assert sse_events(response.get_data(as_text=True)) == [
+        ("message", message) for message in chat_service.get_messages_since(recipient_id, ids[0], limit=3)
+    ] + [("truncated", {"last_replayed_id": ids[3]})]
+
+
+def test_stream_pushes_live_messages(client, make_user, auth_headers, short_streams):
+    sender, recipient = make_user(), make_user()
+    sender_id, recipient_id, headers = sender.id, recipient.id, auth_headers(recipient)
+
+    response = client.get("/api/v1/chat/stream", headers=headers, buffered=False)
+    sent = chat_service.send_message(sender_id, recipient_id, "live")
+    body = response.get_data(as_text=True)
+
+    assert body.startswith("retry: 3000")
+    assert ": keepalive" in body
+    assert [(event, data["id"]) for event, data in sse_events(body)] == [("message", sent["message_id"])]
@@ -0,0 +1,126 @@
+import hashlib
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.exceptions import ClientDisconnected
+
+from app.extensions import db
+from app.models.media import Media
+from app.models.upload_session import UploadSession
+from app.services.media_service import UploadOffsetConflict, media_service
+
+
+class DisconnectingStream(io.BytesIO):
+    """Request body whose client goes away once the given bytes are read."""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if not data:
+            raise ClientDisconnected()
+        return data
+
+
+def upload_in_chunks(user, data, chunk_size, filename="photo.png", **kwargs):
+    upload = media_service.init_upload(user.id, filename, len(data), **kwargs)
+    for offset in range(0, len(data), chunk_size):
+        chunk = data[offset:offset + chunk_size]
+        media_service.append_chunk(upload.id, user.id, offset, io.BytesIO(chunk), len(chunk))
+    return upload.id
+
+
+def test_chunks_are_assembled_into_a_media_row(app, make_user, make_png):
+    user, data = make_user(), make_png()
+    upload_id = upload_in_chunks(user, data, chunk_size=20000, sha256=hashlib.sha256(data).hexdigest())
+
+    media = media_service.complete_upload(upload_id, user.id)
+
+    assert (media["media_type"], media["size"], media["width"], media["height"]) == ("image", len(data), 160, 120)
+    assert media_service.complete_upload(upload_id, user.id)["id"] == media["id"]
+    assert app.extensions["storage"].open(media["url"]).read() == data
+
+
+def test_chunk_at_the_wrong_offset_is_a_conflict(make_user, make_png):
+    user, data = make_user(), make_png()
+    upload = media_service.init_upload(user.id, "photo.png", len(data))
+    media_service.append_chunk(upload.id, user.id, 0, io.BytesIO(data[:500]), 500)
+
+    # A retried first chunk that already landed
+    with pytest.raises(UploadOffsetConflict) as conflict:
+        media_service.append_chunk(upload.id, user.id, 0, io.BytesIO(data[:500]), 500)
+
+    assert conflict.value.expected_offset == 500
+    assert media_service.get_upload(upload.id, user.id).received == 500
+
+
+def test_interrupted_chunk_keeps_the_bytes_received(make_user, make_png):
+    user, data = make_user(), make_png()
+    upload = media_service.init_upload(user.id, "photo.png", len(data))
+
+    # The client disconnects after sending 300 of the 800 declared bytes
+    with pytest.raises(ValueError, match="resume from offset 300"):
+        media_service.append_chunk(upload.id, user.id, 0, DisconnectingStream(data[:300]), 800)
+    media_service.append_chunk(upload.id, user.id, 300, io.BytesIO(data[300:]), len(data) - 300)
+
+    assert media_service.complete_upload(upload.id, user.id)["size"] == len(data)
+
+
+def test_chunk_limits_and_completion_checks(app, make_user, make_png):
+    user, other, data = make_user(), make_user(), make_png()
+    upload = media_service.init_upload(user.id, "photo.png", len(data), sha256="0" * 64)
+    max_chunk = app.config["MEDIA_MAX_CHUNK_BYTES"]
+
+    with pytest.raises(ValueError, match="Chunk size"):
+        media_service.append_chunk(upload.id, user.id, 0, io.BytesIO(b"x"), max_chunk + 1)
+    with pytest.raises(ValueError, match="exceeds the declared upload size"):
+        media_service.append_chunk(upload.id, user.id, 0, io.BytesIO(data + b"x"), len(data) + 1)
+    with pytest.raises(PermissionError):
+        media_service.append_chunk(upload.id, other.id, 0, io.BytesIO(data), len(data))
+    with pytest.raises(ValueError, match="incomplete"):
+        media_service.complete_upload(upload.id, user.id)
+
+    media_service.append_chunk(upload.id, user.id, 0, io.BytesIO(data), len(data))
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        media_service.complete_upload(upload.id, user.id)
+    assert media_service.get_upload(upload.id, user.id).received == 0
+
+
+@pytest.mark.parametrize("filename, size", [("notes.txt", 10), ("photo.png", 0), ("photo.png", 11 * 1024 ** 2)])
+def test_init_upload_rejects_bad_files_and_sizes(make_user, filename, size):
+    with pytest.raises(ValueError):
+        media_service.init_upload(make_user().id, filename, size)
+
+
+def test_stale_uploads_are_purged_with_their_partial_files(make_user, make_png):
+    user, data = make_user(), make_png()
+    stale = media_service.init_upload(user.id, "old.png", len(data))
+    fresh = media_service.init_upload(user.id, "new.png", len(data))
+    stale_id, fresh_id = stale.id, fresh.id
+    UploadSession.query.filter_by(id=stale_id).update({"updated_at": datetime.utcnow() - timedelta(hours=2)})
+    db.session.commit()
+
+    assert media_service.purge_stale_uploads() == 1
+    assert db.session.get(UploadSession, stale_id) is None
+    assert db.session.get(UploadSession, fresh_id) is not None
+
+
+def test_upload_protocol_over_http(client, make_user, make_png, auth_headers):
+    user, data = make_user(), make_png()
+    headers = auth_headers(user)
+
+    created = client.post("/api/v1/media/uploads", headers=headers, json={"filename": "photo.png", "size": len(data)})
+    location = created.headers["Location"]
+    first = client.patch(location, data=data[:1000], headers={**headers, "Upload-Offset": "0"})
+    retried = client.patch(location, data=data[:1000], headers={**headers, "Upload-Offset": "0"})
+    status = client.head(location, headers=headers)
+    rest = client.patch(location, data=data[1000:], headers={**headers, "Upload-Offset": "1000"})
+    completed = client.post(f"{location}/complete", headers=headers)
+
+    assert created.status_code == 201 and created.headers["Upload-Offset"] == "0"
+    assert first.status_code == 204 and first.headers["Upload-Offset"] == "1000"
+    assert retried.status_code == 409 and retried.headers["Upload-Offset"] == "1000"
+    assert retried.get_json()["offset"] == 1000
+    assert status.headers["Upload-Offset"] == "1000"
+    assert rest.headers["Upload-Offset"] == str(len(data))
+    assert completed.status_code == 201
+    assert db.session.get(Media, completed.get_json()["media"]["id"]).size == len(data)
@@ -0,0 +1,81 @@
+from app.extensions import db
+from app.models.conversation import Conversation
+from app.services.chat_service import ChatService
+
+chat_service = ChatService()
+
+
+def test_recent_conversations_newest_first_with_preview_and_unread(make_user):
+    me, alice, bob, carol = make_user(), make_user("alice"), make_user("bob"), make_user("carol")
+    chat_service.send_message(alice.id, me.id, "hi from alice")
+    chat_service.send_message(me.id, bob.id, "hi bob")
+    chat_service.send_message(carol.id, me.id, "x" * 150)
+    chat_service.send_message(alice.id, me.id, "alice again")
+
+    first = chat_service.get_recent_conversations(me.id, limit=2)
+    second = chat_service.get_recent_conversations(me.id, limit=2, cursor=first["pagination"]["next_cursor"])
+
+    items = first["items"] + second["items"]
+    assert [item["username"] for item in items] == ["alice", "carol", "bob"]
+    assert [item["unread"] for item in items] == [2, 1, 0]
+    assert items[0]["last_message"]["preview"] == "alice again"
+    assert items[1]["last_message"]["preview"] == "x" * ChatService.PREVIEW_LENGTH
+    assert second["pagination"]["has_next"] is False
+    assert chat_service.get_recent_conversations(bob.id)["items"][0]["unread"] == 1
+
+
+def test_unread_counts_drop_once_per_message_read(make_user):
+    reader, sender = make_user(), make_user()
+    first = chat_service.send_message(sender.id, reader.id, "one")["message_id"]
+    chat_service.send_message(sender.id, reader.id, "two")
+    chat_service.send_message(sender.id, reader.id, "three")
+
+    chat_service.mark_as_read(first, reader.id)
+    chat_service.mark_as_read(first, reader.id)
+    assert chat_service.get_unread_counts(reader.id) == {
+        "total": 2, "conversations": [{"user_id": sender.id, "unread": 2}]
+    }
+
+    assert chat_service.mark_conversation_read(reader.id, sender.id) == 2
+    assert chat_service.mark_conversation_read(reader.id, sender.id) == 0
+    chat_service.send_message(sender.id, reader.id, "late")
+    assert chat_service.get_unread_counts(reader.id)["total"] == 1
+
+
+def test_deleting_the_latest_message_falls_back_to_the_previous_one(make_user):
+    me, other = make_user(), make_user()
+    chat_service.send_message(other.id, me.id, "earlier")
+    latest = chat_service.send_message(me.id, other.id, "latest")["message_id"]
+
+    chat_service.delete_message(latest, me.id)
+
+    [item] = chat_service.get_recent_conversations(me.id)["items"]
+    assert item["last_message"]["preview"] == "earlier"
+    assert item["unread"] == 1
+    assert chat_service.get_recent_conversations(other.id)["items"][0]["unread"] == 0
+
+
+def test_reconcile_unread_counts_fixes_drift(make_user):
+    reader, sender = make_user(), make_user()
+    chat_service.send_message(sender.id, reader.id, "hello")
+    Conversation.query.update({"unread_a": 9, "unread_b": 9})
+    db.session.commit()
+
+    assert chat_service.reconcile_unread_counts() == 1
+    assert chat_service.get_unread_counts(reader.id)["total"] == 1
+    assert chat_service.get_unread_counts(sender.id)["total"] == 0
+    assert chat_service.reconcile_unread_counts() == 0
+
+
+def test_chat_routes_accept_string_jwt_identities(client, make_user, auth_headers):
+    me, other = make_user(), make_user()
+
+    sent = client.post("/api/v1/chat/send", headers=auth_headers(me),
+                       json={"recipient_id": str(other.id), "message": "hey"})
+    invalid = client.post("/api/v1/chat/send", headers=auth_headers(me),
+                          json={"recipient_id": "abc", "message": "hey"})
+    recent = client.get("/api/v1/chat/recent", headers=auth_headers(other))
+
+    assert sent.status_code == 201
+    assert invalid.status_code == 400
+    assert recent.get_json()["conversations"][0]["unread"] == 1
@@ -0,0 +1,128 @@
+import pytest
+
+from app.extensions import db
+from app.models.follow import Follow
+from app.models.timeline_entry import TimelineEntry
+from app.models.user import User
+from app.services import follow_service as follow_service_module
+from app.services.follow_service import MAX_BULK_IDS, follow_service
+from app.services.user_service import UserService
+
+
+def followers_count(user_id):
+    return db.session.query(User.followers_count).filter(User.id == user_id).scalar()
+
+
+def test_bulk_follow_counts_and_backfills_once(make_user, make_post):
+    me, alice, bob = make_user(), make_user(), make_user()
+    post = make_post(alice)
+
+    result = follow_service.follow(me.id, [alice.id, bob.id, alice.id])
+    assert result == {"followed": [alice.id, bob.id], "already_following": []}
+    result = follow_service.follow(me.id, [bob.id])
+    assert result == {"followed": [], "already_following": [bob.id]}
+
+    assert (followers_count(alice.id), followers_count(bob.id)) == (1, 1)
+    assert [entry.post_id for entry in TimelineEntry.query.filter_by(user_id=me.id)] == [post.id]
+
+
+def test_bulk_unfollow_decrements_only_removed_follows(make_user, make_post):
+    me, alice, bob = make_user(), make_user(), make_user()
+    make_post(alice)
+    follow_service.follow(me.id, [alice.id])
+
+    result = follow_service.unfollow(me.id, [alice.id, bob.id])
+
+    assert result == {"unfollowed": [alice.id], "not_following": [bob.id]}
+    assert (followers_count(alice.id), followers_count(bob.id)) == (0, 0)
+    assert TimelineEntry.query.filter_by(user_id=me.id).count() == 0
+    assert follow_service.unfollow(me.id, [alice.id]) == {"unfollowed": [], "not_following": [alice.id]}
+
+
+def test_invalid_follow_requests(make_user):
+    me, other = make_user(), make_user()
+
+    for user_ids in ([], [me.id], [other.id, 9999], ["x"], list(range(MAX_BULK_IDS + 1)), other.id):
+        with pytest.raises(ValueError):
+            follow_service.follow(me.id, user_ids)
+    assert Follow.query.count() == 0
+
+
+@pytest.mark.parametrize("returning", [True, False], ids=["returning", "row-by-row"])
+def test_follows_inserted_concurrently_are_not_counted_twice(monkeypatch, make_user, returning):
+    # Without RETURNING support (MySQL) rows are inserted one at a time
+    monkeypatch.setattr(db.engine.dialect, "insert_returning", returning)
+    me, alice, bob = make_user(), make_user(), make_user()
+    insert = follow_service_module.insert_or_ignore_returning
+
+    def racing_insert(model, rows, *columns):
+        # Another request follows alice after our existence check, before our insert
+        db.session.add(Follow(follower_id=me.id, followed_id=alice.id))
+        db.session.flush()
+        return insert(model, rows, *columns)
+
+    monkeypatch.setattr(follow_service_module, "insert_or_ignore_returning", racing_insert)
+    result = follow_service.follow(me.id, [alice.id, bob.id])
+
+    assert result == {"followed": [bob.id], "already_following": [alice.id]}
+    assert (followers_count(alice.id), followers_count(bob.id)) == (0, 1)
+
+
+def test_following_sets_are_cached_until_a_follow_changes_them(make_user, count_queries):
+    me, alice = make_user(), make_user()
+    assert follow_service.following_ids(me.id) == frozenset()
+
+    with count_queries() as statements:
+        follow_service.following_ids(me.id)
+    assert statements == []
+
+    follow_service.follow(me.id, [alice.id])
+    assert follow_service.following_ids(me.id) == {alice.id}
+    assert follow_service.is_following(me.id, [alice.id, me.id]) == {alice.id: True, me.id: False}
+
+
+def test_mutuals_and_suggestions(make_user):
+    me, friend, other_friend, shared, popular, loner = (make_user() for _ in range(6))
+    follow_service.follow(me.id, [friend.id, other_friend.id, shared.id])
+    follow_service.follow(friend.id, [shared.id, popular.id, me.id])
+    follow_service.follow(other_friend.id, [shared.id, popular.id, loner.id])
+
+    mutual = follow_service.get_mutual_following(me.id, friend.id)
+    assert mutual["count"] == 1 and [u["id"] for u in mutual["users"]] == [shared.id]
+
+    suggestions = follow_service.suggest_users(me.id)
+    assert [(u["id"], u["mutual_count"]) for u in suggestions] == [(popular.id, 2), (loner.id, 1)]
+
+
+def test_follower_lists_page_by_cursor(make_user):
+    me = make_user()
+    fans = [make_user() for _ in range(3)]
+    for fan in fans:
+        follow_service.follow(fan.id, [me.id])
+
+    first = follow_service.get_followers(me.id, cursor="", limit=2)
+    second = follow_service.get_followers(me.id, cursor=first["pagination"]["next_cursor"], limit=2)
+
+    ids = [u["id"] for u in first["items"] + second["items"]]
+    assert sorted(ids) == sorted(fan.id for fan in fans) and len(set(ids)) == 3
+    assert second["pagination"]["next_cursor"] is None
+
+
+def test_reconcile_follower_counts(make_user):
+    me, alice, bob = make_user(), make_user(), make_user()
+    follow_service.follow(me.id, [alice.id])
+    db.session.query(User).filter(User.id.in_([alice.id, bob.id])).update({"followers_count": 7})
+    db.session.commit()
+
+    assert UserService.reconcile_follower_counts(batch_size=2) == 2
+    assert (followers_count(alice.id), followers_count(bob.id)) == (1, 0)
+    assert UserService.reconcile_follower_counts() == 0
+
+
+def test_follow_endpoint(client, auth_headers, make_user):
+    me, alice = make_user(), make_user()
+
+    response = client.post("/api/v1/follows/", json={"user_ids": [alice.id]}, headers=auth_headers(me))
+    assert response.status_code == 200 and response.json["data"]["followed"] == [alice.id]
+    response = client.post("/api/v1/follows/", json={"user_ids": [me.id]}, headers=auth_headers(me))
+    assert response.status_code == 400
@@ -0,0 +1,91 @@
+import io
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from app.cli import _read_checkpoint, _write_checkpoint
+from app.extensions import db, storage
+from app.models.media import Media
+from app.services.media_service import media_service
+from app.utils.image_optimizer import optimize_stored_image
+
+
+def legacy_upload(user, data, filename="photo.png"):
+    """An upload as it looked before variants existed: no variants, not optimized."""
+    media = media_service.upload_media(user.id, FileStorage(io.BytesIO(data), filename=filename))
+    row = db.session.get(Media, media["id"])
+    row.variants, row.optimized_at = None, None
+    db.session.commit()
+    return row.id
+
+
+def backfill(app, checkpoint, *args):
+    result = app.test_cli_runner().invoke(
+        args=["optimize-images", "--workers", "1", "--batch-size", "2", "--checkpoint", str(checkpoint), *args]
+    )
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_backfill_optimizes_legacy_images_and_checkpoints(app, tmp_path, make_user, make_png):
+    user = make_user()
+    ids = [legacy_upload(user, make_png(seed=seed)) for seed in range(3)]
+    checkpoint = tmp_path / "backfill.checkpoint"
+
+    output = backfill(app, checkpoint)
+
+    assert "Done: 3 images" in output and "0 failed" in output
+    assert _read_checkpoint(checkpoint) == ids[-1]
+    db.session.expire_all()
+    for media in Media.query.filter(Media.id.in_(ids)):
+        assert media.optimized_at is not None
+        assert all(storage.stat(image["url"]) for image in media.variants["images"])
+
+
+def test_backfill_resumes_from_the_checkpoint(app, tmp_path, make_user, make_png):
+    user = make_user()
+    ids = [legacy_upload(user, make_png(seed=seed)) for seed in range(3)]
+    checkpoint = tmp_path / "backfill.checkpoint"
+    _write_checkpoint(checkpoint, ids[0])
+
+    output = backfill(app, checkpoint)
+
+    assert f"Resuming after media id {ids[0]}" in output and "Done: 2 images" in output
+    db.session.expire_all()
+    assert db.session.get(Media, ids[0]).optimized_at is None
+    assert "Done: 1 images" in backfill(app, checkpoint, "--restart")
+    assert "Done: 0 images" in backfill(app, checkpoint, "--restart")
+
+
+def test_rows_sharing_content_are_processed_once(app, tmp_path, make_user, make_png):
+    data = make_png()
+    ids = [legacy_upload(make_user(), data) for _ in range(2)]
+
+    output = backfill(app, tmp_path / "backfill.checkpoint")
+
+    assert "Done: 1 images" in output
+    db.session.expire_all()
+    first, second = (db.session.get(Media, media_id) for media_id in ids)
+    assert second.optimized_at is not None and second.variants == first.variants
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = tmp_path / "checkpoint"
+
+    assert _read_checkpoint(path) == 0
+    _write_checkpoint(path, 42)
+    assert _read_checkpoint(path) == 42
+    assert [p.name for p in tmp_path.iterdir()] == ["checkpoint"]
+
+
+def test_optimize_stored_image_writes_a_new_object(app, make_user, make_png):
+    media = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(make_png(800, 600)), filename="big.png"))
+
+    with pytest.raises(ValueError):
+        optimize_stored_image(media["url"], media["url"])
+    output = optimize_stored_image(media["url"], "optimized/big.png", max_size=(200, 200))
+
+    with storage.local_copy(output) as path, Image.open(path) as img:
+        assert img.size == (200, 150)
+    assert storage.stat(media["url"])["size"] == media["size"]
@@ -0,0 +1,85 @@
+import io
+
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from app.extensions import db, storage
+from app.models.media import Media
+from app.services.media_service import media_service
+from app.utils.image_optimizer import create_image_variants, encode_blurhash
+
+
+def write_image(path, size=(400, 300), fmt="JPEG", **save_args):
+    Image.new("RGB", size, (20, 120, 220)).save(path, fmt, **save_args)
+    return str(path)
+
+
+def test_variants_cover_widths_below_the_original_in_every_format(tmp_path):
+    source = write_image(tmp_path / "photo.jpg")
+
+    result = create_image_variants(source, str(tmp_path), widths=(100, 200, 800), formats=("webp", "jpeg"))
+
+    assert (result["width"], result["height"]) == (400, 300)
+    assert [(i["width"], i["height"], i["format"]) for i in result["images"]] == [
+        (200, 150, "webp"), (200, 150, "jpeg"), (100, 75, "webp"), (100, 75, "jpeg")
+    ]
+    for image in result["images"]:
+        with Image.open(image["file"]) as variant:
+            assert variant.size == (image["width"], image["height"])
+
+
+def test_small_originals_keep_their_own_width(tmp_path):
+    source = write_image(tmp_path / "tiny.png", size=(50, 40), fmt="PNG")
+
+    result = create_image_variants(source, str(tmp_path), widths=(320, 640), formats=("webp",))
+
+    assert [(i["width"], i["height"]) for i in result["images"]] == [(50, 40)]
+
+
+def test_exif_rotation_is_applied(tmp_path):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    source = write_image(tmp_path / "rotated.jpg", size=(400, 300), exif=exif)
+
+    result = create_image_variants(source, str(tmp_path), widths=(150,), formats=("jpeg",))
+
+    assert (result["width"], result["height"]) == (300, 400)
+    assert (result["images"][0]["width"], result["images"][0]["height"]) == (150, 200)
+
+
+def test_animated_images_get_a_placeholder_but_no_variants(tmp_path):
+    frames = [Image.new("RGB", (120, 80), color) for color in ((255, 0, 0), (0, 0, 255))]
+    source = str(tmp_path / "anim.gif")
+    frames[0].save(source, save_all=True, append_images=frames[1:])
+
+    result = create_image_variants(source, str(tmp_path), widths=(60,))
+
+    assert result["images"] == [] and result["placeholder"]
+
+
+def test_blurhash_matches_the_reference_encoder():
+    # Values produced by the reference implementation (the `blurhash` package)
+    assert encode_blurhash(Image.new("RGB", (300, 200), (255, 255, 255))) == "LFTSUA?bfQ?b~qoffQoffQfQfQfQ"
+    assert encode_blurhash(Image.new("RGB", (64, 64), (20, 120, 220))) == "L62S#mk]fQk]k]flfQflfQfQfQfQ"
+
+
+def test_uploaded_images_get_variants_recorded_and_stored(app, make_user, make_png):
+    media = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(make_png()), filename="photo.png"))
+
+    media = db.session.get(Media, media["id"])
+    widths = sorted({image["width"] for image in media.variants["images"]})
+    assert widths == app.config["IMAGE_VARIANT_WIDTHS"]
+    assert len(media.variants["images"]) == len(widths) * len(app.config["IMAGE_VARIANT_FORMATS"])
+    assert media.optimized_at is not None
+    assert all(storage.stat(image["url"])["size"] == image["size"] for image in media.variants["images"])
+    assert media_service.get_processing_status(media.id)["status"] == "done"
+
+
+def test_generation_is_skipped_once_done_unless_forced(make_user, make_png):
+    media = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(make_png()), filename="photo.png"))
+    optimized_at = db.session.get(Media, media["id"]).optimized_at
+
+    assert media_service.generate_image_variants(media["id"]) == media["variants"]
+    assert db.session.get(Media, media["id"]).optimized_at == optimized_at
+    media_service.generate_image_variants(media["id"], force=True)
+    assert db.session.get(Media, media["id"]).optimized_at > optimized_at
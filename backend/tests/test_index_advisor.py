@@ -0,0 +1,15 @@
+from app.cli import _explain, _service_query_shapes
+from app.models.post import Post
+
+
+def test_every_service_query_shape_uses_an_index(app):
+    result = app.test_cli_runner().invoke(args=["index-advisor", "--strict"])
+
+    assert result.exit_code == 0, result.output
+    assert f"0 of {len(_service_query_shapes())} query shapes" in result.output
+
+
+def test_explain_flags_a_sequential_scan(app):
+    plan, flagged = _explain(Post.query.filter(Post.content == "hello"))
+
+    assert flagged and all(line in plan for line in flagged)
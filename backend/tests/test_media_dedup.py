@@ -0,0 +1,92 @@
+import io
+
+from werkzeug.datastructures import FileStorage
+
+from app.api.v1 import admin
+from app.extensions import db, storage
+from app.models.media import Media
+from app.models.media_blob import MediaBlob
+from app.models.post import Post
+from app.models.timeline_entry import TimelineEntry
+from app.services.follow_service import follow_service
+from app.services.media_service import media_service
+from app.services.post_service import post_service
+
+
+def upload(user, data, filename="photo.png", post_id=None):
+    return media_service.upload_media(user.id, FileStorage(io.BytesIO(data), filename=filename), post_id=post_id)
+
+
+def stored_paths(media):
+    return [media["url"]] + [image["url"] for image in media["variants"]["images"]]
+
+
+def test_identical_uploads_share_one_blob(make_user, make_png):
+    alice, bob, data = make_user(), make_user(), make_png()
+
+    first = upload(alice, data)
+    second = upload(bob, data, filename="copy.png")
+    other = upload(bob, make_png(seed=1))
+
+    blob = MediaBlob.query.filter_by(sha256=first["sha256"]).one()
+    assert (first["deduplicated"], second["deduplicated"], other["deduplicated"]) == (False, True, False)
+    assert first["url"] == second["url"] != other["url"]
+    assert blob.ref_count == 2
+    # Processing results of the first upload are reused, not recomputed
+    assert second["variants"] == first["variants"] and second["width"] == 160
+
+
+def test_blob_files_are_deleted_when_the_last_reference_goes(make_user, make_png):
+    alice, bob, data = make_user(), make_user(), make_png()
+    first = upload(alice, data)
+    second = upload(bob, data)
+    first = media_service.get_media(first["id"])
+    paths = stored_paths(first)
+    assert len(paths) > 1 and all(storage.stat(path) for path in paths)
+
+    media_service.delete_media(first["id"], alice.id)
+    assert MediaBlob.query.filter_by(sha256=first["sha256"]).one().ref_count == 1
+    assert all(storage.stat(path) for path in paths)
+
+    media_service.delete_media(second["id"], bob.id)
+    assert MediaBlob.query.filter_by(sha256=first["sha256"]).first() is None
+    assert not any(storage.stat(path) for path in paths)
+
+
+def test_reupload_after_release_stores_the_content_again(make_user, make_png):
+    user, data = make_user(), make_png()
+    media_service.delete_media(upload(user, data)["id"], user.id)
+
+    again = upload(user, data)
+
+    assert again["deduplicated"] is False
+    assert storage.stat(again["url"])["size"] == len(data)
+
+
+def test_deleting_a_post_releases_its_media(make_user, make_post, make_png):
+    author = make_user()
+    post = make_post(author)
+    media = upload(author, make_png(), post_id=post.id)
+
+    post_service.delete_post(post.id, author.id)
+
+    assert db.session.get(Media, media["id"]) is None
+    assert MediaBlob.query.count() == 0
+    assert storage.stat(media["url"]) is None
+
+
+def test_admin_removal_cleans_up_like_an_author_delete(app, make_user, make_png):
+    author, follower = make_user(), make_user()
+    follow_service.follow(follower.id, [author.id])
+    post = post_service.create_post(author.id, "to be moderated")
+    post_id = post.id
+    media = upload(author, make_png(), post_id=post_id)
+    assert TimelineEntry.query.filter_by(post_id=post_id).count() == 2
+
+    with app.test_request_context():
+        _, status = admin.remove_post.__wrapped__(post_id)
+
+    assert status == 200
+    assert db.session.get(Post, post_id) is None
+    assert TimelineEntry.query.filter_by(post_id=post_id).count() == 0
+    assert storage.stat(media["url"]) is None
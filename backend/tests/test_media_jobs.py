@@ -0,0 +1,129 @@
+import io
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.extensions import db
+from app.models.media import Media
+from app.models.media_processing_job import MediaProcessingJob
+from app.services.media_service import media_service
+from app.utils.concurrency import FileSlotSemaphore, SlotUnavailable
+from app.workers.media_jobs import run_media_job
+from app.workers.video_processor import process_video
+
+KIND = MediaProcessingJob.KIND_IMAGE_VARIANTS
+
+
+class Retry(Exception):
+    pass
+
+
+class FakeTask:
+    """Stands in for a bound Celery task, recording the retry countdowns asked for."""
+    def __init__(self):
+        self.retries = []
+
+    def retry(self, exc=None, countdown=None, max_retries=None):
+        self.retries.append(countdown)
+        return Retry()
+
+
+@pytest.fixture
+def media_id(make_user):
+    media = Media(uploader_id=make_user().id, filename="clip.mp4", media_type="video", url="videos/clip.mp4")
+    db.session.add(media)
+    db.session.commit()
+    return media.id
+
+
+def test_finished_jobs_are_not_started_again(media_id):
+    job_id = media_service.start_job(media_id, KIND).id
+    media_service.finish_job(job_id)
+
+    assert media_service.start_job(media_id, KIND) is None
+    job = db.session.get(MediaProcessingJob, job_id)
+    assert (job.status, job.attempts, job.progress) == ("done", 1, 1.0)
+
+
+def test_failures_back_off_exponentially_until_attempts_run_out(app, media_id):
+    app.config.update(MEDIA_JOB_MAX_ATTEMPTS=3, MEDIA_JOB_RETRY_BACKOFF_SECONDS=10)
+
+    delays = []
+    for _ in range(3):
+        job_id = media_service.start_job(media_id, KIND).id
+        delays.append(media_service.fail_job(job_id, RuntimeError("encoder crashed")))
+
+    assert delays == [10, 20, None]
+    job = db.session.get(MediaProcessingJob, job_id)
+    assert (job.status, job.attempts, job.error) == ("failed", 3, "encoder crashed")
+
+
+def test_run_media_job_retries_transient_errors_only(media_id):
+    task = FakeTask()
+
+    def crash(job_id):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(Retry):
+        run_media_job(task, media_id, KIND, crash)
+    assert task.retries == [0]
+    assert media_service.get_processing_status(media_id)["status"] == "queued"
+
+    def bad_content(job_id):
+        raise ValueError("not an image")
+
+    assert run_media_job(task, media_id, KIND, bad_content) is None
+    assert task.retries == [0]
+    assert media_service.get_processing_status(media_id)["status"] == "failed"
+
+
+def test_run_media_job_records_progress_and_result(media_id):
+    def work(job_id):
+        media_service.update_job_progress(job_id, 0.5)
+        assert media_service.get_processing_status(media_id)["progress"] == 0.5
+        return "ok"
+
+    assert run_media_job(FakeTask(), media_id, KIND, work) == "ok"
+    status = media_service.get_processing_status(media_id)
+    assert (status["status"], status["progress"]) == ("done", 1.0)
+
+
+def test_status_reports_the_least_finished_job(media_id):
+    done = media_service.start_job(media_id, MediaProcessingJob.KIND_VIDEO_HLS)
+    media_service.finish_job(done.id)
+    media_service.start_job(media_id, KIND)
+
+    assert media_service.get_processing_status(media_id)["status"] == "running"
+
+
+def test_status_of_unprocessed_and_deduplicated_media(make_user, make_png, media_id):
+    assert media_service.get_processing_status(media_id)["status"] == "unprocessed"
+
+    data = make_png()
+    media_service.upload_media(make_user().id, FileStorage(io.BytesIO(data), filename="a.png"))
+    copy = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(data), filename="b.png"))
+    assert media_service.get_processing_status(copy["id"])["status"] == "done"
+
+
+def test_slots_bound_concurrent_holders(tmp_path):
+    slots = FileSlotSemaphore(str(tmp_path), 1, poll_interval=0.01)
+
+    with slots.acquire():
+        with pytest.raises(SlotUnavailable):
+            with slots.acquire(timeout=0.05):
+                pass
+    with slots.acquire(timeout=0):
+        pass
+
+
+def test_transcodes_are_requeued_while_every_slot_is_busy(app, monkeypatch, tmp_path, media_id):
+    app.config.update(VIDEO_SLOT_LOCK_DIR=str(tmp_path), VIDEO_MAX_CONCURRENT_TRANSCODES=1, VIDEO_SLOT_WAIT_SECONDS=0)
+    task = FakeTask()
+    monkeypatch.setattr(process_video, "retry", task.retry)
+
+    with FileSlotSemaphore(str(tmp_path), 1).acquire(), pytest.raises(Retry):
+        process_video(media_id)
+
+    assert task.retries == [0]
+    # Waiting for a slot is not an attempt
+    assert MediaProcessingJob.query.filter_by(media_id=media_id).count() == 0
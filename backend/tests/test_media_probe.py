@@ -0,0 +1,100 @@
+import io
+import os
+import subprocess
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from app.models.media import Media
+from app.models.media_blob import MediaBlob
+from app.services.media_service import media_service
+from app.utils import media_probe
+from app.utils.media_probe import probe_image, probe_video_file
+from app.workers.video_processor import process_video
+
+MP4_PROBE = {"width": 1080, "height": 1920, "duration": 12.5, "codec": "h264",
+             "format": "mov,mp4,m4a,3gp,3g2,mj2", "has_audio": True}
+
+
+@pytest.fixture
+def queued_videos(monkeypatch):
+    """Video ids handed to the transcoder, which is not run."""
+    queued = []
+    monkeypatch.setattr(process_video, "delay", queued.append)
+    return queued
+
+
+def partial_files(app):
+    return os.listdir(os.path.join(app.config["UPLOAD_FOLDER"], "partial"))
+
+
+def test_image_header_gives_dimensions_and_rewinds(make_png):
+    stream = io.BytesIO(make_png(160, 120))
+
+    assert probe_image(stream, "png") == {"width": 160, "height": 120, "duration": None, "codec": "png"}
+    assert stream.tell() == 0
+
+
+def test_exif_rotated_images_report_displayed_size():
+    exif = Image.Exif()
+    exif[0x0112] = 8
+    stream = io.BytesIO()
+    Image.new("RGB", (400, 300)).save(stream, "JPEG", exif=exif)
+
+    assert probe_image(stream, "jpg")["width"] == 300
+
+
+def test_images_must_match_their_extension(make_png):
+    with pytest.raises(ValueError, match="does not match"):
+        probe_image(io.BytesIO(make_png()), "jpg")
+    with pytest.raises(ValueError, match="not a valid image"):
+        probe_image(io.BytesIO(b"#!/bin/sh\nrm -rf /\n"), "png")
+
+
+def test_videos_must_match_their_container(monkeypatch):
+    monkeypatch.setattr(media_probe, "probe_video", lambda path: MP4_PROBE)
+
+    assert probe_video_file("clip.mp4", "mp4") == {"width": 1080, "height": 1920, "duration": 12.5, "codec": "h264"}
+    with pytest.raises(ValueError, match="does not match"):
+        probe_video_file("clip.mkv", "mkv")
+
+
+def test_unreadable_videos_are_rejected_and_missing_ffprobe_is_tolerated(monkeypatch):
+    def unreadable(path):
+        raise subprocess.CalledProcessError(1, ["ffprobe"])
+
+    def not_installed(path):
+        raise FileNotFoundError("ffprobe")
+
+    monkeypatch.setattr(media_probe, "probe_video", unreadable)
+    with pytest.raises(ValueError, match="not a valid video"):
+        probe_video_file("clip.mp4", "mp4")
+    monkeypatch.setattr(media_probe, "probe_video", not_installed)
+    assert probe_video_file("clip.mp4", "mp4") is None
+
+
+def test_upload_records_probed_metadata(make_user, make_png):
+    media = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(make_png(200, 100)), filename="a.png"))
+
+    assert (media["width"], media["height"]) == (200, 100)
+
+
+def test_mismatched_uploads_are_rejected_before_anything_is_stored(make_user, make_png):
+    with pytest.raises(ValueError):
+        media_service.upload_media(make_user().id, FileStorage(io.BytesIO(make_png()), filename="photo.jpg"))
+
+    assert Media.query.count() == 0 and MediaBlob.query.count() == 0
+
+
+def test_video_uploads_are_probed_from_scratch_disk(app, monkeypatch, make_user, queued_videos):
+    monkeypatch.setattr(media_probe, "probe_video", lambda path: MP4_PROBE)
+    user = make_user()
+
+    media = media_service.upload_media(user.id, FileStorage(io.BytesIO(b"\0" * 4096), filename="clip.mp4"))
+    assert (media["width"], media["height"], media["duration"]) == (1080, 1920, 12.5)
+    assert queued_videos == [media["id"]]
+
+    with pytest.raises(ValueError):
+        media_service.upload_media(user.id, FileStorage(io.BytesIO(b"\1" * 4096), filename="clip.mkv"))
+    assert Media.query.count() == 1 and partial_files(app) == []
@@ -0,0 +1,94 @@
+import io
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.services.media_service import media_service
+
+
+@pytest.fixture
+def image(make_user, make_png):
+    data = make_png()
+    media = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(data), filename="photo.png"))
+    return media, data
+
+
+def test_full_get_carries_validators_and_cache_headers(client, image):
+    media, data = image
+
+    response = client.get(f"/api/v1/media/{media['id']}/file")
+
+    assert response.status_code == 200
+    assert response.data == data
+    assert response.headers["ETag"] == f'"{media["sha256"]}"'
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["Last-Modified"]
+    assert response.cache_control.max_age == 3600 and not response.cache_control.immutable
+
+
+@pytest.mark.parametrize("header, start, stop", [("bytes=10-19", 10, 20), ("bytes=-5", None, None), ("bytes=100-", 100, None)])
+def test_single_range_is_partial_content(client, image, header, start, stop):
+    media, data = image
+    expected = data[-5:] if start is None else data[start:stop]
+    first = len(data) - 5 if start is None else start
+
+    response = client.get(f"/api/v1/media/{media['id']}/file", headers={"Range": header})
+
+    assert response.status_code == 206
+    assert response.data == expected
+    assert response.headers["Content-Range"] == f"bytes {first}-{first + len(expected) - 1}/{len(data)}"
+    assert response.content_length == len(expected)
+
+
+def test_unsatisfiable_range_is_416(client, image):
+    media, data = image
+
+    response = client.get(f"/api/v1/media/{media['id']}/file", headers={"Range": f"bytes={len(data)}-"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(data)}"
+
+
+def test_conditional_gets_are_304(client, image):
+    media, _ = image
+    url = f"/api/v1/media/{media['id']}/file"
+    first = client.get(url)
+
+    by_etag = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    by_date = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    changed = client.get(url, headers={"If-None-Match": '"something-else"'})
+
+    assert (by_etag.status_code, by_etag.data) == (304, b"")
+    assert by_date.status_code == 304
+    assert changed.status_code == 200
+
+
+def test_stale_if_range_gets_the_whole_file(client, image):
+    media, data = image
+
+    response = client.get(f"/api/v1/media/{media['id']}/file",
+                          headers={"Range": "bytes=0-9", "If-Range": '"old-version"'})
+
+    assert (response.status_code, response.data) == (200, data)
+
+
+def test_blob_paths_are_immutable_and_confined_to_blobs(client, image):
+    media, data = image
+
+    response = client.get(f"/api/v1/media/files/{media['url']}")
+
+    assert (response.status_code, response.data) == (200, data)
+    assert response.cache_control.immutable and response.cache_control.max_age == 365 * 24 * 3600
+    assert client.get("/api/v1/media/files/blobs/../partial/x.png").status_code == 404
+    assert client.get("/api/v1/media/files/partial/x.png").status_code == 404
+    assert client.get("/api/v1/media/files/blobs/00/00/missing.png").status_code == 404
+
+
+def test_x_accel_mode_hands_the_transfer_to_nginx(app, client, image):
+    media, _ = image
+    app.config["MEDIA_SERVE_MODE"] = "x-accel"
+
+    response = client.get(f"/api/v1/media/{media['id']}/file", headers={"Range": "bytes=0-9"})
+
+    assert response.headers["X-Accel-Redirect"] == f"/protected-media/{media['url']}"
+    assert response.data == b""
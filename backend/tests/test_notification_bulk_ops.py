@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.notification import Notification
+from app.services.notification_service import notification_service
+
+
+def add_notifications(recipient, sender, count, start=datetime(2025, 1, 1), notif_type="general"):
+    notifications = [
+        Notification(recipient_id=recipient.id, sender_id=sender.id, message=f"n{i}",
+                     notification_type=notif_type, is_read=False, created_at=start + timedelta(minutes=i))
+        for i in range(count)
+    ]
+    db.session.add_all(notifications)
+    db.session.commit()
+    return notifications
+
+
+def unread_ids(user):
+    return sorted(n.id for n in Notification.query.filter_by(recipient_id=user.id, is_read=False))
+
+
+def test_mark_all_as_read_is_a_single_update(make_user, count_queries):
+    reader, other, sender = make_user(), make_user(), make_user()
+    add_notifications(reader, sender, 4)
+    add_notifications(other, sender, 2)
+
+    with count_queries() as statements:
+        updated = notification_service.mark_all_as_read(reader.id)
+
+    assert updated == 4
+    assert sum(statement.startswith("UPDATE notifications") for statement in statements) == 1
+    assert unread_ids(reader) == []
+    assert len(unread_ids(other)) == 2
+
+
+def test_mark_all_as_read_stops_at_up_to_id(make_user):
+    reader, sender = make_user(), make_user()
+    notifications = add_notifications(reader, sender, 4)
+
+    assert notification_service.mark_all_as_read(reader.id, up_to_id=notifications[1].id) == 2
+    assert unread_ids(reader) == [n.id for n in notifications[2:]]
+
+
+def test_mark_all_as_read_stops_at_a_list_cursor(make_user):
+    reader, sender = make_user(), make_user()
+    notifications = add_notifications(reader, sender, 5)
+
+    # The client has seen the first page (the three newest) and marks those read
+    page = notification_service.get_user_notifications(reader.id, limit=3, cursor="")
+    last_seen = page["items"][-1]
+    cursor = page["pagination"]["next_cursor"]
+    updated = notification_service.mark_all_as_read(reader.id, cursor=cursor)
+
+    assert last_seen.id == notifications[2].id
+    assert updated == 3
+    assert unread_ids(reader) == [n.id for n in notifications[3:]]
+
+
+def test_bulk_delete_filters_by_age_and_type_in_batches(make_user):
+    user, other, sender = make_user(), make_user(), make_user()
+    old_ids = [n.id for n in add_notifications(user, sender, 5, start=datetime(2024, 1, 1))]
+    add_notifications(user, sender, 2, start=datetime(2024, 1, 1), notif_type="like")
+    recent_ids = [n.id for n in add_notifications(user, sender, 2, start=datetime.utcnow())]
+    add_notifications(other, sender, 3, start=datetime(2024, 1, 1))
+
+    deleted = notification_service.delete_notifications_bulk(
+        user_id=user.id, older_than=datetime(2025, 1, 1), notif_type="general", batch_size=2
+    )
+
+    assert deleted == 5
+    remaining = Notification.query.filter_by(recipient_id=user.id).all()
+    assert sorted(n.notification_type for n in remaining) == ["general", "general", "like", "like"]
+    assert set(recent_ids) <= {n.id for n in remaining}
+    assert set(old_ids).isdisjoint(n.id for n in remaining)
+    assert Notification.query.filter_by(recipient_id=other.id).count() == 3
+
+
+def test_bulk_delete_without_user_cleans_up_every_user(make_user):
+    a, b, sender = make_user(), make_user(), make_user()
+    add_notifications(a, sender, 2, start=datetime(2024, 1, 1))
+    add_notifications(b, sender, 3, start=datetime(2024, 1, 1))
+
+    assert notification_service.delete_notifications_bulk(older_than=datetime(2025, 1, 1)) == 5
+    assert Notification.query.count() == 0
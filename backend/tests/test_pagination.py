@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.post import Post
+from app.services.post_service import post_service
+from app.utils.pagination import decode_cursor, encode_cursor, paginate_query
+
+
+def test_cursor_round_trip():
+    position = (datetime(2025, 3, 1, 12, 30, 15, 250000), 42)
+
+    cursor = encode_cursor(*position)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", ["", None])
+def test_empty_cursor_is_the_first_page(cursor):
+    assert decode_cursor(cursor) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("yesterday", 1)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_cursor_pages_visit_every_row_once_in_keyset_order(make_user, make_post, descending):
+    author = make_user()
+    base = datetime(2025, 1, 1)
+    # Pairs of posts share a timestamp, so ordering must fall back to the id
+    for i in range(7):
+        make_post(author, f"post {i}", created_at=base + timedelta(minutes=i // 2))
+    expected = sorted(Post.query.all(), key=lambda p: (p.created_at, p.id), reverse=descending)
+
+    seen, cursor, pages = [], "", 0
+    while cursor is not None:
+        result = paginate_query(Post.query, per_page=3, cursor=cursor,
+                                keyset=(Post.created_at, Post.id), descending=descending)
+        seen += [item["id"] for item in result["items"]]
+        cursor = result["pagination"]["next_cursor"]
+        assert result["pagination"]["has_next"] is (cursor is not None)
+        pages += 1
+
+    assert seen == [post.id for post in expected]
+    assert pages == 3
+
+
+def test_get_posts_cursor_mode_skips_the_total(make_user, make_post):
+    author = make_user()
+    for i in range(3):
+        make_post(author, f"post {i}", created_at=datetime(2025, 1, 1) + timedelta(hours=i))
+
+    first = post_service.get_posts(per_page=2, cursor="")
+    second = post_service.get_posts(per_page=2, cursor=first["pagination"]["next_cursor"])
+
+    assert "total" not in first["pagination"]
+    assert [item["content"] for item in first["items"] + second["items"]] == ["post 2", "post 1", "post 0"]
+    assert second["pagination"] == {"per_page": 2, "has_next": False, "next_cursor": None}
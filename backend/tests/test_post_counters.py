@@ -0,0 +1,62 @@
+from app.extensions import db
+from app.models.post import Post
+from app.services import like_service
+from app.services.comment_service import CommentService
+from app.services.post_service import adjust_post_counter, post_service
+
+
+def counters(post_id):
+    db.session.expire_all()
+    post = db.session.get(Post, post_id)
+    return post.likes_count, post.comments_count
+
+
+def test_likes_and_comments_maintain_counters(make_user, make_post):
+    author, fan = make_user(), make_user()
+    post_id = make_post(author).id
+
+    assert like_service.like_post(post_id, fan.id) is True
+    assert like_service.like_post(post_id, fan.id) is False
+    post_service.like_post(author.id, post_id)
+    comment = CommentService.create_comment(fan.id, post_id, "nice")
+    assert counters(post_id) == (2, 1)
+
+    assert like_service.unlike_post(post_id, fan.id) is True
+    assert like_service.unlike_post(post_id, fan.id) is False
+    CommentService.delete_comment(comment.id, fan.id)
+    assert counters(post_id) == (1, 0)
+
+
+def test_adjust_post_counter_never_goes_below_zero(make_user, make_post):
+    post_id = make_post(make_user()).id
+
+    adjust_post_counter(post_id, "likes_count", -3)
+    db.session.commit()
+
+    assert counters(post_id) == (0, 0)
+
+
+def test_counter_updates_leave_updated_at_alone(make_user, make_post):
+    post = make_post(make_user())
+    updated_at = post.updated_at
+
+    adjust_post_counter(post.id, "comments_count", 1)
+    db.session.commit()
+    db.session.expire_all()
+
+    assert db.session.get(Post, post.id).updated_at == updated_at
+
+
+def test_reconcile_counters_rewrites_only_drifted_posts(make_user, make_post):
+    author, fan = make_user(), make_user()
+    drifted, in_sync, liked = (make_post(author).id for _ in range(3))
+    like_service.like_post(liked, fan.id)
+    adjust_post_counter(drifted, "likes_count", 5)
+    adjust_post_counter(drifted, "comments_count", 2)
+    db.session.commit()
+
+    assert post_service.reconcile_counters(batch_size=1) == 1
+    assert counters(drifted) == (0, 0)
+    assert counters(in_sync) == (0, 0)
+    assert counters(liked) == (1, 0)
+    assert post_service.reconcile_counters() == 0
@@ -0,0 +1,77 @@
+import pytest
+
+from app.extensions import db
+from app.models.comment import Comment
+from app.models.like import Like
+from app.services.follow_service import follow_service
+from app.services.like_service import get_liked_post_ids
+from app.services.post_service import MAX_RELATIONSHIP_IDS, post_service
+
+
+@pytest.fixture
+def feed(make_user, make_post):
+    """A viewer and three posts: liked by them, commented on by them, and by someone they follow."""
+    viewer, stranger, friend = make_user(), make_user(), make_user()
+    liked, commented, followed = make_post(stranger), make_post(stranger), make_post(friend)
+    db.session.add_all([
+        Like(user_id=viewer.id, post_id=liked.id),
+        Like(user_id=stranger.id, post_id=followed.id),
+        Comment(user_id=viewer.id, post_id=commented.id, content="first"),
+        Comment(user_id=viewer.id, post_id=commented.id, content="second"),
+    ])
+    db.session.commit()
+    follow_service.follow(viewer.id, [friend.id])
+    return viewer, liked.id, commented.id, followed.id
+
+
+def test_relationships_for_a_page(feed):
+    viewer, liked, commented, followed = feed
+
+    assert post_service.get_relationships(viewer.id, [liked, commented, followed, 9999, liked]) == {
+        liked: {"liked": True, "commented": False, "author_followed": False},
+        commented: {"liked": False, "commented": True, "author_followed": False},
+        followed: {"liked": False, "commented": False, "author_followed": True},
+    }
+    assert post_service.get_relationships(viewer.id, []) == {}
+
+
+def test_subset_lookups(feed):
+    viewer, liked, commented, followed = feed
+    page = [liked, commented, followed]
+
+    assert get_liked_post_ids(page, viewer.id) == {liked}
+    assert post_service.get_commented_post_ids(viewer.id, page) == {commented}
+    assert get_liked_post_ids([], viewer.id) == set()
+
+
+def test_query_count_does_not_grow_with_the_page(feed, make_post, count_queries):
+    viewer = feed[0]
+    small = list(feed[1:])
+    large = small + [make_post(viewer).id for _ in range(20)]
+    post_service.get_relationships(viewer.id, small)
+
+    with count_queries() as small_statements:
+        post_service.get_relationships(viewer.id, small)
+    with count_queries() as large_statements:
+        post_service.get_relationships(viewer.id, large)
+
+    # Authors, likes and comments; follows come from the cached following set
+    assert len(small_statements) == len(large_statements) == 3
+
+
+def test_too_many_ids_are_rejected(feed):
+    with pytest.raises(ValueError):
+        post_service.get_relationships(feed[0].id, list(range(1, MAX_RELATIONSHIP_IDS + 2)))
+
+
+def test_relationships_endpoint(client, auth_headers, feed):
+    viewer, liked, commented, followed = feed
+
+    response = client.get(f"/api/v1/posts/relationships?ids={liked},{followed}", headers=auth_headers(viewer))
+    assert response.status_code == 200
+    assert response.json["data"] == {
+        str(liked): {"liked": True, "commented": False, "author_followed": False},
+        str(followed): {"liked": False, "commented": False, "author_followed": True},
+    }
+    response = client.get("/api/v1/posts/relationships?ids=1,x", headers=auth_headers(viewer))
+    assert response.status_code == 400
@@ -0,0 +1,48 @@
+from app.extensions import db
+from app.models.media import Media
+from app.models.post import Post
+from app.services.post_service import post_service
+
+
+def add_media(post, filename):
+    media = Media(filename=filename, url=f"/media/{filename}", media_type="image",
+                  uploader_id=post.user_id, post_id=post.id)
+    db.session.add(media)
+    db.session.commit()
+    return media
+
+
+def test_serialize_posts_loads_media_for_the_page_in_one_query(make_user, make_post, count_queries):
+    author = make_user()
+    posts = [make_post(author, f"post {i}") for i in range(5)]
+    add_media(posts[0], "a.jpg")
+    add_media(posts[0], "b.jpg")
+    add_media(posts[3], "c.jpg")
+    posts = Post.query.order_by(Post.id).all()
+
+    with count_queries() as statements:
+        items = post_service.serialize_posts(posts)
+
+    assert len(statements) == 1
+    assert [m["filename"] for m in items[0]["media"]] == ["a.jpg", "b.jpg"]
+    assert [m["filename"] for m in items[3]["media"]] == ["c.jpg"]
+    assert items[1]["media"] == []
+
+
+def test_serialize_posts_of_empty_page_runs_no_query(count_queries):
+    with count_queries() as statements:
+        assert post_service.serialize_posts([]) == []
+    assert statements == []
+
+
+def test_get_posts_returns_batch_serialized_items(make_user, make_post):
+    author, other = make_user(), make_user()
+    post = make_post(author, "mine")
+    make_post(other, "theirs")
+    add_media(post, "a.jpg")
+
+    result = post_service.get_posts(author_id=author.id)
+
+    assert [item["content"] for item in result["items"]] == ["mine"]
+    assert result["items"][0]["media"][0]["filename"] == "a.jpg"
+    assert result["items"][0]["likes_count"] == 0
@@ -0,0 +1,103 @@
+import logging
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from app.extensions import cache, db
+from app.middleware import register_middlewares
+from app.middleware.query_metrics import register_query_metrics
+from app.models.post import Post
+
+
+def bare_app(mode):
+    """An app with nothing but query metrics and one route running two queries on its own engine."""
+    app = Flask(__name__)
+    app.config["QUERY_METRICS"] = mode
+    engine = create_engine("sqlite://")
+
+    @app.route("/two-queries")
+    def two_queries():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return "ok"
+
+    register_query_metrics(app)
+    return app
+
+
+def test_headers_report_the_requests_queries(app, client, auth_headers, make_user, make_post, count_queries):
+    user = make_user()
+    url, headers = f"/api/v1/posts/{make_post(user).id}", auth_headers(user)
+
+    with count_queries() as statements:
+        response = client.get(url, headers=headers)
+
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) == len(statements) > 0
+    assert float(response.headers["X-Query-Time-Ms"]) >= 0
+    assert len(response.headers.getlist("Server-Timing")) == 1
+
+
+def test_registering_twice_counts_queries_once():
+    app = bare_app("headers")
+    register_query_metrics(app)
+
+    response = app.test_client().get("/two-queries")
+
+    assert response.headers["X-Query-Count"] == "2"
+    assert response.headers.getlist("Server-Timing")[0].endswith('desc="2 queries"')
+
+
+def test_middlewares_can_register_metrics_again(app, client):
+    # create_app has already registered query metrics
+    register_middlewares(app)
+
+    assert len(client.get("/").headers.getlist("Server-Timing")) == 1
+
+
+def test_exceeding_the_budget_logs_a_warning(app, client, auth_headers, make_user, make_post, caplog):
+    user = make_user()
+    post = make_post(user)
+    app.config["QUERY_BUDGETS"] = {"posts.get_post": 0}
+
+    with caplog.at_level(logging.WARNING, logger="app.middleware.query_metrics"):
+        client.get(f"/api/v1/posts/{post.id}", headers=auth_headers(user))
+
+    assert [r.getMessage().split(" ran")[0] for r in caplog.records] == \
+        ["Query budget exceeded: GET posts.get_post"]
+
+
+def test_log_mode_records_stats_without_headers(caplog):
+    app = bare_app("log")
+
+    with caplog.at_level(logging.INFO, logger="app.middleware.query_metrics"):
+        response = app.test_client().get("/two-queries")
+
+    assert "X-Query-Count" not in response.headers
+    (record,) = caplog.records
+    assert (record.endpoint, record.queries) == ("two_queries", 2)
+
+
+def test_off_and_unknown_modes():
+    assert "X-Query-Count" not in bare_app("off").test_client().get("/two-queries").headers
+    with pytest.raises(ValueError):
+        bare_app("verbose")
+
+
+def test_request_identity_map_skips_the_shared_cache(app, make_user, make_post, monkeypatch):
+    post_id = make_post(make_user()).id
+    reads = []
+    shared_get = cache.get
+    monkeypatch.setattr(cache, "get", lambda key: reads.append(key) or shared_get(key))
+
+    with app.test_request_context():
+        first = cache.get_entity(Post, post_id)
+        assert cache.get_entity(Post, post_id) is first
+        assert len(reads) == 1
+
+        # A commit expires the instance; the next lookup reloads it
+        db.session.commit()
+        cache.get_entity(Post, post_id)
+        assert len(reads) == 2
@@ -0,0 +1,98 @@
+import pytest
+
+from app.extensions import db
+from app.services.post_service import post_service
+from app.services.search_service import search_service
+from app.utils.search import MAX_QUERY_TERMS, query_terms
+
+
+@pytest.fixture
+def indexed_user(make_user):
+    def indexed_user(username=None, **fields):
+        user = make_user(username, **fields)
+        search_service.index(user)
+        db.session.commit()
+        return user
+    return indexed_user
+
+
+def hits(query, **kwargs):
+    return [(doc_type, entity.id) for doc_type, entity in search_service.search_entities(query, **kwargs)]
+
+
+def test_query_terms_drop_operators():
+    assert query_terms('"chess" OR title:NEAR(club)*') == ["chess", "or", "title", "near", "club"]
+    assert len(query_terms("word " * 20)) == MAX_QUERY_TERMS
+
+
+def test_query_syntax_is_matched_literally(indexed_user):
+    user = indexed_user("nearby")
+
+    assert hits('") OR *') == [] and hits("") == []
+    assert hits('NEARBY*"') == [("user", user.id)]
+
+
+def test_posts_are_indexed_with_their_writes(make_user):
+    author = make_user()
+    post = post_service.create_post(author.id, "Weekend hiking trip to the falls")
+    assert hits("hiking falls") == [("post", post.id)]
+
+    post_service.update_post(post.id, author.id, new_content="Weekend cycling trip")
+    assert hits("hiking") == [] and hits("cycling") == [("post", post.id)]
+
+    post_service.delete_post(post.id, author.id)
+    assert hits("cycling") == []
+
+
+def test_title_matches_rank_above_body_matches(indexed_user):
+    fan = indexed_user("anna", bio="I love chess and tea")
+    master = indexed_user("chessmaster", full_name="Chess Master")
+
+    assert hits("chess") == [("user", master.id), ("user", fan.id)]
+
+
+def test_prefix_matching_is_opt_in(indexed_user):
+    john = indexed_user("johnny")
+
+    assert hits("joh") == []
+    assert hits("joh", prefix=True) == [("user", john.id)]
+
+
+def test_type_filter(indexed_user, make_user):
+    user = indexed_user("gardener")
+    post_service.create_post(make_user().id, "gardener wanted")
+
+    assert hits("gardener", types=["user"]) == [("user", user.id)]
+    assert len(hits("gardener")) == 2
+    with pytest.raises(ValueError):
+        hits("gardener", types=["planet"])
+
+
+def test_entries_for_deleted_rows_are_skipped(indexed_user):
+    user = indexed_user("ghost")
+    db.session.delete(user)
+    db.session.commit()
+
+    assert hits("ghost") == []
+
+
+def test_reindex_command_rebuilds_the_index(app, make_user):
+    user = make_user("unindexed")
+    assert hits("unindexed") == []
+
+    result = app.test_cli_runner().invoke(args=["reindex-search", "--type", "user", "--batch-size", "1"])
+
+    assert result.exit_code == 0, result.output
+    assert "user: 1 documents" in result.output
+    assert hits("unindexed") == [("user", user.id)]
+
+
+def test_search_endpoint(client, auth_headers, indexed_user):
+    user = indexed_user("librarian")
+
+    response = client.get("/api/v1/search/?q=librarian&type=user", headers=auth_headers(user))
+    assert response.status_code == 200
+    assert [(r["type"], r["id"]) for r in response.json["data"]] == [("user", user.id)]
+
+    response = client.get("/api/v1/search/?q=librarian&type=planet", headers=auth_headers(user))
+    assert response.status_code == 400
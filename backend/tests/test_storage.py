@@ -0,0 +1,105 @@
+import io
+import os
+
+import pytest
+
+from app.utils.storage import LocalStorageBackend, S3StorageBackend, Storage
+
+
+@pytest.fixture
+def local(tmp_path):
+    return LocalStorageBackend(str(tmp_path))
+
+
+def test_local_save_open_stat_and_delete(local):
+    assert local.save("blobs/ab/file.bin", io.BytesIO(b"0123456789")) == "blobs/ab/file.bin"
+
+    with local.open("blobs/ab/file.bin") as whole, local.open("blobs/ab/file.bin", start=3, length=4) as part:
+        assert (whole.read(), part.read()) == (b"0123456789", b"3456")
+    assert local.stat("blobs/ab/file.bin")["size"] == 10
+    assert local.delete("blobs/ab/file.bin") is True
+    assert local.delete("blobs/ab/file.bin") is False
+    assert local.stat("blobs/ab/file.bin") is None
+
+
+def test_local_save_leaves_no_temp_files(local, tmp_path):
+    local.save("a/b.bin", io.BytesIO(b"x" * 200_000))
+
+    assert os.listdir(tmp_path / "a") == ["b.bin"]
+
+
+def test_stored_file_iterates_only_its_range(local):
+    local.save("big.bin", io.BytesIO(bytes(range(256)) * 1024))
+
+    with local.open("big.bin", start=1000, length=100_000) as part:
+        data = b"".join(part)
+
+    assert len(data) == 100_000 and data[:2] == bytes([1000 % 256, 1001 % 256])
+
+
+def test_local_save_file_can_move(local, tmp_path):
+    source = tmp_path / "scratch.bin"
+    source.write_bytes(b"data")
+
+    local.save_file("moved/file.bin", str(source), move=True)
+
+    assert not source.exists()
+    with local.local_copy("moved/file.bin") as path:
+        assert open(path, "rb").read() == b"data"
+
+
+def test_local_delete_prefix_removes_a_directory_tree(local):
+    for name in ("v_hls/master.m3u8", "v_hls/144p/index.m3u8", "v_hls/144p/seg0.ts", "v.mp4"):
+        local.save(name, io.BytesIO(b"x"))
+
+    assert local.delete_prefix("v_hls/") == 3
+    assert local.stat("v.mp4") is not None
+    assert local.delete_prefix("v_hls/") == 0
+
+
+def test_storage_extension_selects_the_configured_backend(app):
+    assert isinstance(app.extensions["storage"], LocalStorageBackend)
+    assert app.extensions["storage"].root == app.config["UPLOAD_FOLDER"]
+
+    app.config["STORAGE_BACKEND"] = "s3"
+    with pytest.raises(ValueError, match="STORAGE_S3_BUCKET"):
+        Storage(app)
+    app.config["STORAGE_BACKEND"] = "ftp"
+    with pytest.raises(ValueError):
+        Storage(app)
+
+
+def test_s3_ranges_and_missing_objects():
+    pytest.importorskip("boto3")
+    from botocore.response import StreamingBody
+    from botocore.stub import Stubber
+
+    s3 = S3StorageBackend("media", region="us-east-1", access_key="key", secret_key="secret", prefix="app/")
+    with Stubber(s3._client) as stubber:
+        stubber.add_response("get_object", {"Body": StreamingBody(io.BytesIO(b"2345"), 4)},
+                             {"Bucket": "media", "Key": "app/blobs/f.bin", "Range": "bytes=2-5"})
+        stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+
+        assert s3.open("blobs/f.bin", start=2, length=4).read() == b"2345"
+        assert s3.stat("blobs/missing.bin") is None
+
+
+def test_s3_delete_prefix_pages_through_the_listing():
+    pytest.importorskip("boto3")
+    from botocore.stub import Stubber
+
+    s3 = S3StorageBackend("media", region="us-east-1", access_key="key", secret_key="secret", prefix="app/")
+    with Stubber(s3._client) as stubber:
+        stubber.add_response("list_objects_v2", {
+            "IsTruncated": True, "NextContinuationToken": "page2",
+            "Contents": [{"Key": "app/v_hls/a.ts"}, {"Key": "app/v_hls/b.ts"}],
+        }, {"Bucket": "media", "Prefix": "app/v_hls/"})
+        stubber.add_response("delete_objects", {}, {"Bucket": "media", "Delete": {
+            "Objects": [{"Key": "app/v_hls/a.ts"}, {"Key": "app/v_hls/b.ts"}], "Quiet": True}})
+        stubber.add_response("list_objects_v2", {"IsTruncated": False, "Contents": [{"Key": "app/v_hls/c.ts"}]},
+                             {"Bucket": "media", "Prefix": "app/v_hls/", "ContinuationToken": "page2"})
+        stubber.add_response("delete_objects", {}, {"Bucket": "media", "Delete": {
+            "Objects": [{"Key": "app/v_hls/c.ts"}], "Quiet": True}})
+
+        assert s3.delete_prefix("v_hls/") == 3
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.timeline_entry import TimelineEntry
+from app.models.user import User
+from app.services.follow_service import follow_service
+from app.services.post_service import post_service
+from app.services.timeline_service import timeline_service
+
+
+def feed_contents(user_id, **kwargs):
+    return [item["content"] for item in timeline_service.get_home_feed(user_id, **kwargs)["items"]]
+
+
+def test_new_post_is_fanned_out_to_author_and_followers(make_user):
+    author, follower, stranger = make_user(), make_user(), make_user()
+    follow_service.follow(follower.id, [author.id])
+
+    post = post_service.create_post(author.id, "hello followers")
+
+    assert feed_contents(follower.id) == ["hello followers"]
+    assert feed_contents(author.id) == ["hello followers"]
+    assert feed_contents(stranger.id) == []
+    # Retried fan-out skips the existing entries
+    timeline_service.fan_out_post(post.id)
+    assert TimelineEntry.query.filter_by(post_id=post.id).count() == 2
+
+
+def test_follow_backfills_and_unfollow_removes_recent_posts(make_user, make_post, app):
+    author, reader = make_user(), make_user()
+    for i in range(app.config["FEED_FOLLOW_BACKFILL_POSTS"] + 2):
+        make_post(author, f"post {i}", created_at=datetime(2025, 1, 1) + timedelta(minutes=i))
+
+    follow_service.follow(reader.id, [author.id])
+    assert len(feed_contents(reader.id, per_page=50)) == app.config["FEED_FOLLOW_BACKFILL_POSTS"]
+    assert feed_contents(reader.id, per_page=1) == [f"post {app.config['FEED_FOLLOW_BACKFILL_POSTS'] + 1}"]
+
+    follow_service.unfollow(reader.id, [author.id])
+    assert feed_contents(reader.id) == []
+
+
+def test_high_follower_authors_are_pulled_and_merged_at_read_time(make_user, make_post, app):
+    celebrity, friend, reader = make_user(), make_user(), make_user()
+    follow_service.follow(reader.id, [celebrity.id, friend.id])
+    User.query.filter_by(id=celebrity.id).update({"followers_count": app.config["FEED_FANOUT_MAX_FOLLOWERS"] + 1})
+    db.session.commit()
+
+    base = datetime(2025, 1, 1)
+    for i, author in enumerate([friend, celebrity, friend, celebrity]):
+        post = make_post(author, f"post {i}", created_at=base + timedelta(minutes=i))
+        timeline_service.fan_out_post(post.id)
+
+    assert TimelineEntry.query.filter_by(user_id=reader.id).count() == 2
+    first = timeline_service.get_home_feed(reader.id, per_page=3)
+    second = timeline_service.get_home_feed(reader.id, per_page=3, cursor=first["pagination"]["next_cursor"])
+    assert [item["content"] for item in first["items"]] == ["post 3", "post 2", "post 1"]
+    assert [item["content"] for item in second["items"]] == ["post 0"]
+    assert second["pagination"]["has_next"] is False
@@ -0,0 +1,90 @@
+from app.extensions import db
+from app.models.campus import Campus
+from app.services.follow_service import follow_service
+from app.services.typeahead_service import typeahead_service
+from app.services.user_service import UserService, delete_user
+from app.utils.typeahead import TypeaheadIndex
+
+
+def usernames(results):
+    return [user["username"] for user in results]
+
+
+def test_index_prefix_lookup():
+    index = TypeaheadIndex()
+    index.load([(1, {"alice", "alice smith", "smith"}, "alice"), (2, {"alfred"}, "alfred"), (3, {"bob"}, "bob")])
+
+    assert index.search("al") == ["alfred", "alice"]
+    assert index.search("smi") == ["alice"]
+    assert index.search("al", max_candidates=1) == ["alfred"]
+    assert index.search_among([1, 3], "ali") == ["alice"]
+
+
+def test_index_upsert_replaces_terms():
+    index = TypeaheadIndex()
+    index.upsert(1, {"alice"}, "alice")
+    index.upsert(1, {"alicia"}, "alicia")
+    index.upsert(2, {"bob"}, "bob")
+    index.remove(2)
+
+    assert index.search("alice") == [] and index.search("alic") == ["alicia"]
+    assert index.search("b") == [] and len(index) == 1
+
+
+def test_suggestions_match_names_and_ignore_the_at_sign(make_user):
+    make_user("jdoe", full_name="Jane Doe")
+    make_user("doeling", followers_count=5)
+    make_user("zed")
+
+    assert usernames(typeahead_service.suggest("@doe")) == ["doeling", "jdoe"]
+    assert usernames(typeahead_service.suggest("jane d")) == ["jdoe"]
+    assert typeahead_service.suggest("  ") == []
+
+
+def test_ranking_prefers_exact_then_followed_then_campus_then_popular(make_user):
+    campus = Campus(name="Main", university="State")
+    db.session.add(campus)
+    db.session.commit()
+    viewer = make_user("viewer", campus_id=campus.id)
+    make_user("sam")
+    make_user("samantha", followers_count=900)
+    make_user("samuel", campus_id=campus.id)
+    friend = make_user("sammy")
+    follow_service.follow(viewer.id, [friend.id])
+
+    assert usernames(typeahead_service.suggest("sam", viewer_id=viewer.id)) == \
+        ["sam", "sammy", "samuel", "samantha"]
+
+
+def test_followed_users_survive_the_candidate_cap(app, make_user):
+    app.config["TYPEAHEAD_MAX_CANDIDATES"] = 2
+    viewer = make_user("viewer")
+    for i in range(5):
+        make_user(f"kim{i}")
+    friend = make_user("kimzzz")
+    follow_service.follow(viewer.id, [friend.id])
+
+    assert "kimzzz" in usernames(typeahead_service.suggest("kim", viewer_id=viewer.id))
+    assert "kimzzz" not in usernames(typeahead_service.suggest("kim"))
+
+
+def test_user_writes_update_the_loaded_index(make_user):
+    typeahead_service.suggest("x")
+    user = UserService.create_user("quinn", "quinn@example.com", "secret")
+    assert usernames(typeahead_service.suggest("qui")) == ["quinn"]
+
+    UserService.update_user_profile(user.id, username="quentin")
+    assert typeahead_service.suggest("qui") == [] and usernames(typeahead_service.suggest("que")) == ["quentin"]
+
+    delete_user(user.id)
+    assert typeahead_service.suggest("que") == []
+
+
+def test_suggest_endpoint_excludes_the_viewer(client, auth_headers, make_user):
+    viewer = make_user("robin")
+    make_user("robert")
+
+    response = client.get("/api/v1/users/suggest?q=rob", headers=auth_headers(viewer))
+    assert response.status_code == 200
+    assert usernames(response.json["data"]) == ["robert"]
+    assert len(client.get("/api/v1/users/suggest?q=rob").json["data"]) == 2
@@ -0,0 +1,89 @@
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+from app.services.notification_service import adjust_unread_count, notification_service
+
+
+def notify(recipient, sender, notif_type=None):
+    return notification_service.create_notification(recipient.id, sender.id, "hi", notif_type=notif_type)
+
+
+def test_counter_follows_create_read_and_delete(make_user):
+    reader, sender = make_user(), make_user()
+    first, second, third = (notify(reader, sender).id for _ in range(3))
+    assert notification_service.get_unread_count(reader.id) == 3
+
+    notification_service.mark_as_read(first, reader.id)
+    notification_service.mark_as_read(first, reader.id)
+    assert notification_service.get_unread_count(reader.id) == 2
+
+    notification_service.delete_notification(first, reader.id)
+    notification_service.delete_notification(second, reader.id)
+    assert notification_service.get_unread_count(reader.id) == 1
+
+    notification_service.mark_all_as_read(reader.id)
+    assert notification_service.get_unread_count(reader.id) == 0
+    assert notification_service.get_unread_count(sender.id) == 0
+    assert db.session.get(Notification, third).is_read
+
+
+def test_counter_never_goes_below_zero(make_user):
+    user = make_user()
+    adjust_unread_count([user.id], 2)
+    adjust_unread_count([user.id], -5)
+    db.session.commit()
+
+    assert notification_service.get_unread_count(user.id) == 0
+
+
+def test_bulk_delete_counts_only_rows_unread_when_deleted(make_user):
+    reader, sender = make_user(), make_user()
+    doomed = [notify(reader, sender, "digest").id for _ in range(2)]
+    notify(reader, sender, "mention")
+
+    # A concurrent request marks one doomed notification read between the
+    # bulk delete's SELECT and its DELETE
+    raced = []
+
+    def read_concurrently(conn, cursor, statement, *args):
+        if statement.startswith("DELETE FROM notifications") and not raced:
+            raced.append(doomed[0])
+            cursor.execute("UPDATE notifications SET is_read = 1 WHERE id = ?", (doomed[0],))
+            cursor.execute("UPDATE notification_counters SET unread_count = unread_count - 1 WHERE user_id = ?",
+                           (reader_id,))
+
+    reader_id = reader.id
+    event.listen(db.engine, "before_cursor_execute", read_concurrently)
+    try:
+        deleted = notification_service.delete_notifications_bulk(user_id=reader_id, notif_type="digest")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", read_concurrently)
+
+    assert raced and deleted == 2
+    assert notification_service.get_unread_count(reader_id) == 1
+
+
+def test_reconcile_creates_missing_counters_and_fixes_drift(make_user):
+    drifted, missing, in_sync, sender = make_user(), make_user(), make_user(), make_user()
+    for user in (drifted, in_sync):
+        notify(user, sender)
+    db.session.add(Notification(recipient_id=missing.id, sender_id=sender.id, message="raw",
+                                notification_type="general", is_read=False))
+    NotificationCounter.query.filter_by(user_id=drifted.id).update({"unread_count": 7})
+    db.session.commit()
+
+    assert notification_service.reconcile_unread_counts(batch_size=2) == 2
+    assert [notification_service.get_unread_count(u.id) for u in (drifted, missing, in_sync)] == [1, 1, 1]
+    assert notification_service.reconcile_unread_counts() == 0
+
+
+def test_unread_count_endpoint(client, make_user, auth_headers):
+    reader, sender = make_user(), make_user()
+    notify(reader, sender)
+
+    response = client.get("/api/v1/notifications/unread-count", headers=auth_headers(reader))
+
+    assert response.status_code == 200
+    assert response.get_json() == {"unread_count": 1}
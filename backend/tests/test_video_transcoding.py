@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.extensions import db, storage
+from app.models.media import Media
+from app.models.media_blob import MediaBlob
+from app.services import media_service as media_service_module
+from app.services.media_service import media_service
+from app.utils import video_optimizer
+from app.utils.video_optimizer import DEFAULT_HLS_LADDER, build_hls_command, select_ladder
+
+requires_ffmpeg = pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg is not installed")
+
+
+def stored_video(user, path="videos/clip.mp4", blob=None):
+    storage.save(path, io.BytesIO(b"not really a video"))
+    media = Media(uploader_id=user.id, filename="clip.mp4", media_type="video", url=path,
+                  blob_id=blob.id if blob else None)
+    db.session.add(media)
+    db.session.commit()
+    return media
+
+
+def fake_transcode(source, work_dir, ladder, **kwargs):
+    """Writes what ffmpeg would for a one-rung ladder."""
+    for name in ("master.m3u8", "144p.m3u8", "144p_000.ts", "poster.jpg"):
+        with open(os.path.join(work_dir, name), "w") as f:
+            f.write(name)
+    return {"width": 256, "height": 144, "duration": 2.0, "codec": "h264", "master": "master.m3u8",
+            "poster": "poster.jpg",
+            "renditions": [{"name": "144p", "width": 256, "height": 144, "bandwidth": 248000,
+                            "playlist": "144p.m3u8"}]}
+
+
+def test_ladder_never_upscales():
+    assert [rung["name"] for rung in select_ladder(DEFAULT_HLS_LADDER, 720)] == ["240p", "480p", "720p"]
+    assert [rung["name"] for rung in select_ladder(DEFAULT_HLS_LADDER, 500)] == ["240p", "480p"]
+    # Shorter than every rung: one rung at the source's (even) height
+    assert [(rung["name"], rung["height"]) for rung in select_ladder(DEFAULT_HLS_LADDER, 181)] == [("180p", 180)]
+
+
+def test_hls_command_decodes_once_for_every_rung(tmp_path):
+    rungs = select_ladder(DEFAULT_HLS_LADDER, 720)
+
+    command = build_hls_command("in.mp4", str(tmp_path), rungs, has_audio=True)
+    silent = build_hls_command("in.mp4", str(tmp_path), rungs, has_audio=False)
+
+    assert command.count("-i") == 1
+    assert command[command.index("-filter_complex") + 1].startswith("[0:v]split=3[v0][v1][v2]")
+    assert command[command.index("-var_stream_map") + 1] == \
+        "v:0,a:0,name:240p v:1,a:1,name:480p v:2,a:2,name:720p"
+    assert "0:a:0" not in silent
+    assert silent[silent.index("-var_stream_map") + 1] == "v:0,name:240p v:1,name:480p v:2,name:720p"
+
+
+def test_probe_applies_rotation(monkeypatch):
+    output = {
+        "streams": [{"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+                     "side_data_list": [{"rotation": -90}]}],
+        "format": {"duration": "12.5", "format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+    }
+    monkeypatch.setattr(video_optimizer.subprocess, "run",
+                        lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, json.dumps(output)))
+
+    probe = video_optimizer.probe_video("clip.mp4")
+
+    assert (probe["width"], probe["height"], probe["duration"]) == (1080, 1920, 12.5)
+    assert probe["has_audio"] is False
+
+
+def test_renditions_are_stored_under_the_hls_prefix(monkeypatch, make_user):
+    monkeypatch.setattr(media_service_module, "transcode_video_hls", fake_transcode)
+    blob = MediaBlob(sha256="a" * 64, path="videos/clip.mp4", size=18, ref_count=2)
+    db.session.add(blob)
+    db.session.commit()
+    first, second = stored_video(make_user(), blob=blob), stored_video(make_user(), blob=blob)
+
+    renditions = media_service.transcode_video(first.id)
+
+    assert renditions["master"] == "videos/clip_hls/master.m3u8"
+    assert renditions["renditions"][0]["playlist"] == "videos/clip_hls/144p.m3u8"
+    assert all(storage.stat(f"videos/clip_hls/{name}") for name in ("144p_000.ts", "poster.jpg"))
+    db.session.expire_all()
+    assert db.session.get(Media, second.id).renditions == renditions
+
+
+def test_transcoding_is_skipped_once_done_unless_forced(monkeypatch, make_user):
+    calls = []
+    monkeypatch.setattr(media_service_module, "transcode_video_hls",
+                        lambda *args, **kwargs: calls.append(1) or fake_transcode(*args, **kwargs))
+    media_id = stored_video(make_user()).id
+
+    media_service.transcode_video(media_id)
+    media_service.transcode_video(media_id)
+    media_service.transcode_video(media_id, force=True)
+
+    assert len(calls) == 2
+
+
+def test_deleting_a_video_removes_its_renditions(monkeypatch, make_user):
+    monkeypatch.setattr(media_service_module, "transcode_video_hls", fake_transcode)
+    user = make_user()
+    media_id = stored_video(user).id
+    media_service.transcode_video(media_id)
+
+    media_service.delete_media(media_id, user.id)
+
+    assert all(storage.stat(path) is None for path in (
+        "videos/clip.mp4", "videos/clip_hls/master.m3u8", "videos/clip_hls/144p_000.ts", "videos/clip_hls/poster.jpg"
+    ))
+
+
+def test_only_videos_are_transcoded(make_user, make_png):
+    image = media_service.upload_media(make_user().id, FileStorage(io.BytesIO(make_png()), filename="photo.png"))
+
+    with pytest.raises(ValueError):
+        media_service.transcode_video(image["id"])
+
+
+@requires_ffmpeg
+def test_real_transcode_produces_a_playable_ladder(tmp_path):
+    source = str(tmp_path / "source.mp4")
+    subprocess.run(["ffmpeg", "-y", "-f", "lavfi", "-i", "testsrc=duration=3:size=320x240:rate=25",
+                    "-pix_fmt", "yuv420p", source], check=True, capture_output=True)
+    out_dir = tmp_path / "hls"
+    out_dir.mkdir()
+    progress = []
+
+    result = video_optimizer.transcode_video_hls(
+        source, str(out_dir), ladder=DEFAULT_HLS_LADDER[:1], segment_seconds=1, preset="ultrafast",
+        on_progress=progress.append
+    )
+
+    assert (result["width"], result["height"]) == (320, 240)
+    assert [r["name"] for r in result["renditions"]] == ["240p"]
+    assert {"master.m3u8", "240p.m3u8", "poster.jpg"} <= set(os.listdir(out_dir))
+    assert progress[-1] == 1.0